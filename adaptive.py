@@ -0,0 +1,252 @@
+"""
+Seleção adaptativa de perguntas a partir de índices de dificuldade.
+
+A dificuldade de cada pergunta vem das estatísticas do histórico
+(analytics.py): o p-value é convertido para a escala logística do modelo
+de Rasch, b = ln((1 - p) / p). As perguntas são agrupadas uma única vez
+por versão do banco em faixas de dificuldade com a mesma quantidade de
+perguntas (DifficultyIndex), refeitas quando o banco muda ou quando o
+analytics.py regrava as estatísticas. Durante a tentativa, a habilidade estimada
+do usuário é atualizada a cada resposta (atualização do tipo Elo) e a
+próxima pergunta é sorteada na faixa mais próxima dessa habilidade: uma
+busca binária entre as faixas e um sorteio O(1) dentro da faixa.
+"""
+
+import math
+import os
+import random
+import threading
+import weakref
+from array import array
+from bisect import bisect_left
+
+from docs_parser import question_key
+
+# Quantidade de faixas de dificuldade
+BUCKETS = 7
+
+# p-value assumido para perguntas com poucas respostas no histórico
+DEFAULT_P_VALUE = 0.6
+
+# Respostas mínimas no histórico para usar o p-value da pergunta
+MIN_ANSWERS = 20
+
+# Passo da atualização da habilidade a cada resposta
+LEARNING_RATE = 0.4
+
+# Sorteios aleatórios dentro de uma faixa antes de procurar sequencialmente
+RANDOM_TRIES = 8
+
+
+def p_value_to_difficulty(p_value: float) -> float:
+    """
+    Converte a fração de acertos em dificuldade na escala logística.
+
+    Args:
+        p_value (float): A fração de acertos da pergunta (0 a 1).
+
+    Returns:
+        float: A dificuldade (0 = metade acerta; positiva = difícil).
+    """
+    p_value = min(max(p_value, 0.02), 0.98)
+    return math.log((1 - p_value) / p_value)
+
+
+class DifficultyIndex:
+    """
+    Faixas de dificuldade de uma versão do banco, ordenadas da mais fácil
+    para a mais difícil.
+    """
+
+    __slots__ = ("rows", "difficulties", "buckets", "centers")
+
+    def __init__(self, rows, p_values: dict):
+        """
+        Constrói as faixas (O(n log n), uma vez por versão do banco).
+
+        Args:
+            rows: As linhas do banco (QuestionStore, BinaryBank...).
+            p_values (dict): O p-value de cada question_key com dados suficientes.
+        """
+        self.rows = rows
+        self.difficulties = array(
+            "f",
+            (
+                p_value_to_difficulty(p_values.get(question_key(row[0]), DEFAULT_P_VALUE))
+                for row in rows
+            ),
+        )
+        order = sorted(range(len(rows)), key=self.difficulties.__getitem__)
+        size = max(1, math.ceil(len(order) / BUCKETS))
+        self.buckets = []
+        self.centers = []
+        for start in range(0, len(order), size):
+            chunk = order[start : start + size]
+            center = self.difficulties[chunk[len(chunk) // 2]]
+            # Faixas vizinhas com a mesma dificuldade (ex.: sem histórico) viram uma só
+            if self.centers and self.centers[-1] == center:
+                self.buckets[-1].extend(chunk)
+            else:
+                self.buckets.append(array("I", chunk))
+                self.centers.append(center)
+
+    def nearest_bucket(self, ability: float) -> int:
+        """
+        Retorna a faixa com a dificuldade mais próxima da habilidade.
+
+        Args:
+            ability (float): A habilidade estimada (mesma escala da dificuldade).
+
+        Returns:
+            int: O índice da faixa.
+        """
+        position = bisect_left(self.centers, ability)
+        if position == len(self.centers):
+            return position - 1
+        if position > 0 and ability - self.centers[position - 1] < self.centers[position] - ability:
+            return position - 1
+        return position
+
+    def pick(self, ability: float, used: set) -> int:
+        """
+        Sorteia uma pergunta ainda não usada, começando pela faixa mais
+        próxima da habilidade e passando às vizinhas se ela se esgotar.
+
+        Args:
+            ability (float): A habilidade estimada.
+            used (set): Os índices já usados na tentativa.
+
+        Returns:
+            int: O índice da pergunta no banco, ou None se todas foram usadas.
+        """
+        nearest = self.nearest_bucket(ability)
+        for distance in range(len(self.buckets)):
+            for bucket in (nearest - distance, nearest + distance)[: 1 if distance == 0 else 2]:
+                if not 0 <= bucket < len(self.buckets):
+                    continue
+                questions = self.buckets[bucket]
+                # Com poucas usadas na faixa, alguns sorteios bastam (O(1) esperado)
+                for _ in range(RANDOM_TRIES):
+                    index = questions[random.randrange(len(questions))]
+                    if index not in used:
+                        return index
+                for index in questions:
+                    if index not in used:
+                        return index
+        return None
+
+
+class AdaptiveSelector:
+    """Estado adaptativo de uma tentativa: habilidade estimada e perguntas usadas."""
+
+    __slots__ = ("index", "ability", "used", "last")
+
+    def __init__(self, index: DifficultyIndex, ability: float = 0.0):
+        """
+        Inicializa a tentativa adaptativa.
+
+        Args:
+            index (DifficultyIndex): As faixas do banco vigente.
+            ability (float): A habilidade inicial (0 = mediana).
+        """
+        self.index = index
+        self.ability = ability
+        self.used = set()
+        self.last = None  # Última pergunta sorteada (a que será respondida)
+
+    def next_index(self) -> int:
+        """
+        Sorteia a próxima pergunta para a habilidade atual.
+
+        Returns:
+            int: O índice da pergunta no banco, ou None se o banco se esgotou.
+        """
+        index = self.index.pick(self.ability, self.used)
+        if index is not None:
+            self.used.add(index)
+            self.last = index
+        return index
+
+    def record(self, correct: bool):
+        """
+        Atualiza a habilidade com o resultado da última pergunta sorteada.
+
+        Args:
+            correct (bool): Se a resposta estava correta.
+        """
+        if self.last is None:
+            return
+        difficulty = self.index.difficulties[self.last]
+        expected = 1 / (1 + math.exp(difficulty - self.ability))
+        self.ability += LEARNING_RATE * (float(correct) - expected)
+        self.last = None
+
+
+def load_p_values(state_file: str = None) -> dict:
+    """
+    Lê os p-values das perguntas com respostas suficientes no histórico.
+
+    Args:
+        state_file (str): O arquivo de somas do analytics.py (padrão: STATE_FILE).
+
+    Returns:
+        dict: question_key -> p-value (vazio sem estatísticas).
+    """
+    try:
+        import analytics  # Importado sob demanda: depende do NumPy
+    except ImportError:
+        return {}
+    stats = analytics.ItemStatistics.load(state_file or analytics.STATE_FILE)
+    return {
+        key: item["p_value"]
+        for key, item in stats.statistics().items()
+        if item["answers"] >= MIN_ANSWERS and item["p_value"] is not None
+    }
+
+
+def p_values_stamp(state_file: str = None):
+    """
+    Retorna a marca da última gravação das estatísticas (mtime do arquivo
+    de somas), para saber se os p-values mudaram sem lê-los.
+
+    Args:
+        state_file (str): O arquivo de somas do analytics.py (padrão: STATE_FILE).
+
+    Returns:
+        int: O mtime em nanossegundos (None sem o arquivo ou sem o NumPy).
+    """
+    try:
+        import analytics  # Já importado na construção do primeiro índice
+    except ImportError:
+        return None
+    try:
+        return os.stat(state_file or analytics.STATE_FILE).st_mtime_ns
+    except OSError:
+        return None
+
+
+_indexes = weakref.WeakKeyDictionary()  # Banco -> (índice, marca das estatísticas usadas)
+_index_lock = threading.Lock()
+
+
+def get_difficulty_index(bank) -> DifficultyIndex:
+    """
+    Retorna o índice de dificuldade da versão vigente de um banco,
+    reconstruindo-o apenas quando as linhas do banco são trocadas ou
+    quando as estatísticas são regravadas pelo analytics.py (as
+    tentativas em andamento continuam com o índice com que começaram).
+
+    Args:
+        bank (QuestionBank): O banco de perguntas.
+
+    Returns:
+        DifficultyIndex: As faixas de dificuldade do banco vigente.
+    """
+    stamp = p_values_stamp()
+    with _index_lock:
+        rows = bank.rows
+        index, index_stamp = _indexes.get(bank, (None, None))
+        if index is None or index.rows is not rows or index_stamp != stamp:
+            index = DifficultyIndex(rows, load_p_values())
+            _indexes[bank] = (index, stamp)
+        return index
@@ -0,0 +1,306 @@
+"""
+Estatísticas por pergunta a partir do histórico de tentativas (attempt_store).
+
+Para cada pergunta do banco calcula:
+    - dificuldade (p-value): fração de acertos;
+    - discriminação: correlação ponto-bisserial entre acertar a pergunta e
+      a nota no restante da prova (sem a própria pergunta);
+    - taxa de escolha de cada opção (distratores) e de respostas em branco;
+    - mediana do tempo gasto na pergunta.
+
+As respostas são lidas em colunas e agregadas em lote com NumPy (bincount
+por pergunta). Todas as estatísticas são derivadas de somas acumuláveis
+(contagens, somas de produtos, histograma logarítmico de tempo), guardadas
+em um arquivo .npz junto com uma marca d'água: cada execução processa
+apenas as tentativas finalizadas depois da anterior, sem reler o histórico
+completo. Tentativas abandonadas (sem nota final) não entram nas contas.
+
+Uso:
+    python analytics.py [--db quiz_attempts.db] [--state quiz_analytics.npz]
+                        [--cache quiz_cache.json] [--full] [--json saida.json]
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import time
+
+import numpy as np
+
+from attempt_store import ATTEMPTS_DB
+from docs_parser import question_key
+from question_cache import read_cache
+
+# Arquivo com as somas acumuladas e a marca d'água
+STATE_FILE = "quiz_analytics.npz"
+
+# Tentativas finalizadas há menos tempo que isso ficam para a próxima execução
+# (garante que o escritor em lotes já gravou todas as suas respostas)
+WATERMARK_LAG = 60
+
+# Colunas das opções: em branco (-1) e as opções "a" a "d" na ordem do banco
+OPTION_COLUMNS = 5
+
+# Limites (em segundos) do histograma logarítmico de tempo por pergunta
+TIME_EDGES = np.geomspace(0.5, 3600, 64)
+
+# Quantidade de linhas lidas do SQLite por lote
+CHUNK_SIZE = 200_000
+
+# Somas acumuladas por pergunta (uma linha por pergunta em cada array)
+_SUMS = ("n", "sum_x", "sum_s", "sum_ss", "sum_xs")
+
+
+class ItemStatistics:
+    """
+    Somas acumuladas das respostas, por pergunta, e as estatísticas
+    derivadas delas.
+    """
+
+    def __init__(self):
+        """Inicializa as somas vazias (nenhuma resposta processada)."""
+        self.keys = []  # Chave (question_key) de cada linha dos arrays
+        self.index = {}  # Chave -> linha
+        self.watermark = 0.0  # finished_at da última tentativa processada
+        self.sums = {name: np.zeros(0) for name in _SUMS}
+        self.options = np.zeros((0, OPTION_COLUMNS), dtype=np.int64)
+        self.times = np.zeros((0, len(TIME_EDGES) + 1), dtype=np.int64)
+
+    def _grow(self):
+        """Acrescenta linhas zeradas para as chaves novas."""
+        rows = len(self.keys)
+        extra = rows - len(self.options)
+        if extra <= 0:
+            return
+        for name in _SUMS:
+            self.sums[name] = np.concatenate([self.sums[name], np.zeros(extra)])
+        self.options = np.vstack([self.options, np.zeros((extra, OPTION_COLUMNS), dtype=np.int64)])
+        self.times = np.vstack([self.times, np.zeros((extra, self.times.shape[1]), dtype=np.int64)])
+
+    def add(self, keys, chosen, correct, elapsed, scores):
+        """
+        Acumula um lote de respostas (colunas de mesmo tamanho).
+
+        Args:
+            keys: A chave da pergunta de cada resposta.
+            chosen: A opção escolhida (ordem do banco; -1 em branco).
+            correct: 1 se a resposta está correta, 0 caso contrário.
+            elapsed: O tempo gasto na pergunta, em segundos.
+            scores: A nota da tentativa sem a própria pergunta (fração de
+                acertos nas demais, 0 a 1).
+        """
+        index = self.index
+        for key in set(keys) - index.keys():
+            index[key] = len(self.keys)
+            self.keys.append(key)
+        self._grow()
+
+        rows = len(self.keys)
+        q = np.fromiter((index[key] for key in keys), dtype=np.int64, count=len(keys))
+        x = np.asarray(correct, dtype=np.float64)
+        s = np.asarray(scores, dtype=np.float64)
+        for name, weights in (
+            ("n", None),
+            ("sum_x", x),
+            ("sum_s", s),
+            ("sum_ss", s * s),
+            ("sum_xs", x * s),
+        ):
+            self.sums[name] += np.bincount(q, weights=weights, minlength=rows)
+
+        option = np.clip(np.asarray(chosen, dtype=np.int64) + 1, 0, OPTION_COLUMNS - 1)
+        self.options += np.bincount(
+            q * OPTION_COLUMNS + option, minlength=rows * OPTION_COLUMNS
+        ).reshape(rows, OPTION_COLUMNS)
+
+        bins = np.searchsorted(TIME_EDGES, np.asarray(elapsed, dtype=np.float64))
+        width = self.times.shape[1]
+        self.times += np.bincount(q * width + bins, minlength=rows * width).reshape(rows, width)
+
+    def statistics(self) -> dict:
+        """
+        Calcula as estatísticas de todas as perguntas a partir das somas.
+
+        Returns:
+            dict: Para cada chave, {"answers", "p_value", "discrimination",
+                  "option_rates", "blank_rate", "median_time"}.
+        """
+        n = self.sums["n"]
+        sx, ss, sss, sxs = (self.sums[name] for name in _SUMS[1:])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            p_value = sx / n
+            covariance = n * sxs - sx * ss
+            variance = (n * sx - sx * sx) * (n * sss - ss * ss)
+            discrimination = covariance / np.sqrt(variance)
+            rates = self.options / n[:, None]
+        medians = _histogram_medians(self.times)
+
+        result = {}
+        for row, key in enumerate(self.keys):
+            result[key] = {
+                "answers": int(n[row]),
+                "p_value": _number(p_value[row]),
+                "discrimination": _number(discrimination[row]),
+                "option_rates": [_number(rate) for rate in rates[row, 1:]],
+                "blank_rate": _number(rates[row, 0]),
+                "median_time": _number(medians[row]),
+            }
+        return result
+
+    def save(self, path: str):
+        """
+        Grava as somas e a marca d'água (atomicamente).
+
+        Args:
+            path (str): O caminho do arquivo .npz.
+        """
+        temporary = path + ".tmp.npz"
+        np.savez(
+            temporary,
+            keys=np.array(self.keys, dtype="U40"),
+            watermark=np.array(self.watermark),
+            options=self.options,
+            times=self.times,
+            **self.sums,
+        )
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(cls, path: str) -> "ItemStatistics":
+        """
+        Carrega as somas gravadas por save() (ou somas vazias, sem o arquivo).
+
+        Args:
+            path (str): O caminho do arquivo .npz.
+
+        Returns:
+            ItemStatistics: As somas carregadas.
+        """
+        stats = cls()
+        if not os.path.exists(path):
+            return stats
+        with np.load(path) as data:
+            if data["times"].shape[1] != len(TIME_EDGES) + 1:
+                return stats  # Histograma em outro formato: recomeça do zero
+            stats.keys = data["keys"].tolist()
+            stats.index = {key: row for row, key in enumerate(stats.keys)}
+            stats.watermark = float(data["watermark"])
+            stats.options = data["options"]
+            stats.times = data["times"]
+            stats.sums = {name: data[name] for name in _SUMS}
+        return stats
+
+
+def _number(value) -> float:
+    """Converte para float arredondado (None para NaN, sem dados)."""
+    value = float(value)
+    return None if np.isnan(value) else round(value, 4)
+
+
+def _histogram_medians(histograms: np.ndarray) -> np.ndarray:
+    """
+    Estima a mediana de cada linha de um histograma logarítmico de tempo,
+    interpolando dentro do intervalo que contém a metade das respostas.
+    """
+    totals = histograms.sum(axis=1)
+    cumulative = histograms.cumsum(axis=1)
+    medians = np.full(len(histograms), np.nan)
+    edges = np.concatenate([[0.0], TIME_EDGES, [TIME_EDGES[-1]]])
+    for row in np.flatnonzero(totals):
+        half = totals[row] / 2
+        column = int(np.searchsorted(cumulative[row], half))
+        before = cumulative[row, column - 1] if column else 0
+        fraction = (half - before) / histograms[row, column]
+        low, high = edges[column], edges[column + 1]
+        medians[row] = low + (high - low) * fraction
+    return medians
+
+
+def update(stats: ItemStatistics, connection: sqlite3.Connection, now: float = None) -> int:
+    """
+    Acumula as respostas das tentativas finalizadas desde a marca d'água.
+
+    Args:
+        stats (ItemStatistics): As somas a atualizar.
+        connection (sqlite3.Connection): Conexão com o histórico.
+        now (float): O instante atual (time.time() por padrão).
+
+    Returns:
+        int: Quantidade de respostas processadas.
+    """
+    cutoff = (time.time() if now is None else now) - WATERMARK_LAG
+    if cutoff <= stats.watermark:
+        return 0
+    cursor = connection.execute(
+        "SELECT a.question_key, a.chosen, a.is_correct, a.elapsed, "
+        # Nota no restante da prova, sem a própria pergunta
+        "CAST(t.score - a.is_correct AS REAL) / (t.total - 1) "
+        "FROM answers a JOIN attempts t ON t.id = a.attempt_id "
+        "WHERE t.finished_at > ? AND t.finished_at <= ? AND t.total > 1",
+        (stats.watermark, cutoff),
+    )
+    processed = 0
+    while True:
+        rows = cursor.fetchmany(CHUNK_SIZE)
+        if not rows:
+            break
+        stats.add(*zip(*rows))
+        processed += len(rows)
+    stats.watermark = cutoff
+    return processed
+
+
+def bank_report(stats: ItemStatistics, questions: list) -> list:
+    """
+    Associa as estatísticas às perguntas do banco, na ordem do banco.
+
+    Args:
+        stats (ItemStatistics): As somas acumuladas.
+        questions (list): As linhas do banco (ex.: de quiz_cache.json).
+
+    Returns:
+        list: Um dicionário por pergunta, com o enunciado e as estatísticas
+              (vazias para perguntas ainda não respondidas).
+    """
+    computed = stats.statistics()
+    return [
+        {"question": row[0], **computed.get(question_key(row[0]), {"answers": 0})}
+        for row in questions
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--db", default=ATTEMPTS_DB)
+    parser.add_argument("--state", default=STATE_FILE)
+    parser.add_argument("--cache", default="quiz_cache.json")
+    parser.add_argument("--full", action="store_true", help="descarta as somas e relê todo o histórico")
+    parser.add_argument("--json", help="grava o relatório neste arquivo")
+    args = parser.parse_args()
+
+    stats = ItemStatistics() if args.full else ItemStatistics.load(args.state)
+    inicio = time.perf_counter()
+    with sqlite3.connect(args.db) as connection:
+        processed = update(stats, connection)
+    stats.save(args.state)
+    print(f"{processed} respostas processadas em {time.perf_counter() - inicio:.2f} s")
+
+    try:
+        questions = read_cache(args.cache)["questions"]
+    except (FileNotFoundError, json.JSONDecodeError):
+        questions = []  # Sem o banco: relatório vazio, mas as somas foram atualizadas
+    report = bank_report(stats, questions)
+    if args.json:
+        with open(args.json, "w", encoding="utf8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    for item in sorted(report, key=lambda item: item.get("p_value") or 0)[:20]:
+        if item["answers"]:
+            print(
+                f"p={item['p_value']:.2f} disc={item['discrimination'] or 0:+.2f} "
+                f"t={item['median_time'] or 0:5.1f}s n={item['answers']:6d} | {item['question'][:60]}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+import os  # Importa a biblioteca os para interagir com o sistema de arquivos
+import random  # Importa a biblioteca random para escolher áudios aleatórios
+import threading  # Importa a biblioteca threading para proteger o índice compartilhado
+
+import flet as ft  # Importa a biblioteca Flet para os controles de áudio
+
+# Diretório raiz dos áudios (uma subpasta por evento do quiz: "inicio", "certo"...),
+# servido pelo Flet como assets_dir (ver main.py): só ele fica acessível por
+# HTTP, não a raiz do projeto, onde ficam as credenciais do Google
+DIRETORIO_AUDIO = os.path.join(
+    os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir)), "audio"
+)
+
+# Extensões de arquivo de áudio reconhecidas
+EXTENSOES_AUDIO = (".mp3", ".wav")
+
+_indice = None  # Índice dos áudios, montado uma única vez por processo
+_indice_lock = threading.Lock()
+
+
+def carregar_indice(diretorio: str = DIRETORIO_AUDIO) -> dict:
+    """
+    Indexa todas as pastas de áudio. É executado uma única vez por processo;
+    os arquivos não são lidos: o cliente os baixa (e guarda em cache) do
+    diretório de assets.
+
+    Args:
+        diretorio (str): O diretório raiz dos áudios.
+
+    Returns:
+        dict: Para cada pasta, a lista dos endereços dos clipes, relativos
+              ao diretório de assets (ex.: "/certo/certo3.mp3").
+    """
+    global _indice
+    with _indice_lock:
+        if _indice is None:
+            indice = {}
+            for pasta in sorted(os.listdir(diretorio)):
+                caminho_pasta = os.path.join(diretorio, pasta)
+                if not os.path.isdir(caminho_pasta):
+                    continue
+                clipes = [
+                    f"/{pasta}/{arquivo}"
+                    for arquivo in sorted(os.listdir(caminho_pasta))
+                    if arquivo.endswith(EXTENSOES_AUDIO)
+                ]
+                if clipes:
+                    indice[pasta] = clipes
+            _indice = indice
+    return _indice
+
+
+class PlayerAudio:
+    """
+    Reprodutor de áudio de uma sessão: um controle ft.Audio por clipe,
+    adicionados de uma vez ao overlay da página. Cada controle leva apenas o
+    endereço do clipe; o cliente o baixa do servidor uma vez e o reaproveita
+    do cache do navegador nas sessões seguintes.
+    """
+
+    def __init__(self, page: ft.Page):
+        """
+        Inicializa o reprodutor (os controles são criados em preparar()).
+
+        Args:
+            page (ft.Page): A página Flet da sessão.
+        """
+        self.page = page  # Armazena a página Flet
+        self.controles = {}  # Para cada pasta, a lista de controles ft.Audio
+
+    def preparar(self):
+        """Cria os controles de áudio da sessão e os adiciona ao overlay."""
+        if self.controles:
+            return
+        for pasta, clipes in carregar_indice().items():
+            self.controles[pasta] = [ft.Audio(src=endereco, autoplay=False) for endereco in clipes]
+        for controles in self.controles.values():
+            self.page.overlay.extend(controles)
+        self.page.update()
+
+    def reproduzir(self, pasta: str):
+        """
+        Reproduz, sem bloquear, um clipe aleatório da pasta especificada.
+
+        Args:
+            pasta (str): O nome da pasta dentro do diretório "audio".
+        """
+        controles = self.controles.get(pasta)
+        if controles:
+            # Apenas envia o comando ao cliente; não aguarda a reprodução
+            random.choice(controles).play()
+
+    def liberar(self):
+        """Remove os controles de áudio do overlay da página."""
+        for controles in self.controles.values():
+            for controle in controles:
+                if controle in self.page.overlay:
+                    self.page.overlay.remove(controle)
+        self.controles = {}
@@ -1,11 +1,31 @@
 import flet as ft  # Importa a biblioteca Flet para a interface gráfica
 import threading  # Importa a biblioteca threading para usar threads
 import time  # Importa a biblioteca time para usar funções relacionadas a tempo
+import uuid  # Importa a biblioteca uuid para gerar o identificador do aprendiz
+
+import metrics  # Importa a instrumentação dos trechos críticos
+from adaptive import DifficultyIndex  # Importa o índice de dificuldade (compartilhado entre sessões)
+from attempt_store import get_attempt_store  # Importa o histórico de tentativas
+from bank_format import BinaryBank  # Importa o banco binário (compartilhado entre sessões)
+from bank_registry import get_bank_registry  # Importa o registro de bancos de perguntas
+from checkpoint import AttemptCheckpoint, checkpoint_path  # Importa os pontos de retomada
+from docs_parser import question_key  # Importa a chave estável de cada pergunta
+from review import (  # Importa a revisão espaçada das perguntas erradas
+    LEARNER_ID_PATTERN,
+    REVIEW_SIZE,
+    get_review_deck,
+)
+
+from .audio import PlayerAudio  # Importa o reprodutor de áudio da sessão
+from .scheduler import obter_agendador  # Importa o agendador de ticks compartilhado
+from .sessions import SUBSTITUIDA, obter_registro_sessoes  # Importa o registro de sessões do processo
 
 from .models import (
+    TEMPO_LIMITE,
     Pergunta,
     EstadoQuiz,
-)  # Importa as classes Pergunta e EstadoQuiz
+)  # Importa as classes Pergunta e EstadoQuiz e a duração de uma tentativa
+from question_bank import QuestionStore  # Importa o banco em memória (compartilhado entre sessões)
 from quiz_logic import (
     QuizLogic,
 )  # Importa a classe QuizLogic (provavelmente de um arquivo quiz_logic.py)
@@ -13,11 +33,33 @@ from .views import (  # Importa funções para exibir diferentes telas do aplica
     exibir_tela_inicial,
     exibir_pergunta,
     exibir_resultados,
-    #reproduzir_audio,
+    exibir_sessao_encerrada,
+    formatar_tempo,
     #piscar_verde,
     #piscar_vermelho,
 )
 
+# Atraso intencional (em segundos) entre o clique e a próxima pergunta,
+# para o usuário perceber o feedback da resposta
+ATRASO_FEEDBACK = 0.5
+
+# Chave do identificador do aprendiz no armazenamento local do navegador
+CHAVE_APRENDIZ = "quiz_sfpc.aprendiz"
+
+# Tempo máximo (em segundos) que a gravação da revisão, em segundo plano,
+# aguarda o baralho do aprendiz
+ESPERA_REVISAO = 10
+
+# Medidores avaliados apenas quando as métricas são lidas (ver metrics.py)
+metrics.register_gauge("sessions_active", lambda: obter_registro_sessoes().total)
+metrics.register_gauge("sessions_disconnected", lambda: obter_registro_sessoes().desconectadas)
+metrics.register_gauge("sessions_evicted", lambda: sum(obter_registro_sessoes().encerradas.values()))
+metrics.register_gauge("session_bytes", lambda: obter_registro_sessoes().bytes_retidos)
+metrics.register_gauge("timer_subscriptions", lambda: obter_agendador().total_inscritos)
+metrics.register_gauge("timer_ticks_skipped", lambda: obter_agendador().ticks_descartados)
+metrics.register_gauge("threads_alive", threading.active_count)
+
+
 # Define a classe QuizController
 class QuizController:
     """
@@ -35,30 +77,285 @@ class QuizController:
             som_ativado (bool): Indica se o som está ativado inicialmente.
         """
         self.page = page  # Armazena a página Flet
+        self.ultima_atividade = time.monotonic()  # Instante da última interação do usuário
+        self.desconectada_em = None  # Instante da desconexão do cliente (None = conectado)
+        self.bytes_retidos = 0  # Memória retida pela sessão (medida pelo registro de sessões)
+        self.encerrada = False  # Indica se a sessão já foi encerrada pelo registro
         self.switch_tema = switch_tema  # Armazena o controle do switch de tema
         self.som_ativado = som_ativado  # Armazena o estado do som
         self.estado_quiz = EstadoQuiz()  # Cria uma instância da classe EstadoQuiz
+        self.audio = PlayerAudio(page)  # Reprodutor de áudio da sessão
+        self.audio.preparar()  # Carrega os clipes no cliente antes do primeiro som
+        self.registro = get_bank_registry()  # Bancos de perguntas (um por certificação)
+        self.banco_escolhido = self.registro.choices()[0][0]  # Banco da próxima tentativa
         self.quiz_logic = (
-            QuizLogic()
+            QuizLogic(self.registro.get(self.banco_escolhido))
         )  # Cria uma instância da classe QuizLogic
-        self.timer = None  # Inicializa o timer como None
+        self.modo_adaptativo = False  # Modo da próxima tentativa (alterado na tela inicial)
+        self.historico = get_attempt_store()  # Histórico de tentativas (gravação assíncrona)
+        self.tentativa_id = None  # Identificador da tentativa em andamento no histórico
+        self.aprendiz = None  # Identificador do aprendiz (lido do navegador em segundo plano)
+        self.checkpoint = None  # Ponto de retomada da tentativa (ver checkpoint.py)
+        self.revisao = None  # Baralho de revisão do aprendiz (carregado em segundo plano)
+        self.revisao_carregada = threading.Event()  # Sinaliza que self.revisao está pronto
+        self.em_revisao = False  # Indica se a tentativa atual é uma revisão
+        self.erros_tentativa = []  # Enunciados errados, agendados para revisão no fim
+        self.lock_erros = threading.Lock()  # Protege a passagem dos erros para o baralho
+        self.lock_estado = threading.RLock()  # Serializa o início, a retomada e o avanço das tentativas
+        self.aviso = None  # SnackBar de avisos, criado no primeiro aviso
+        self.agendador = obter_agendador()  # Agendador de ticks e do avanço após o feedback
+        self.timer_ativo = False  # Indica se a sessão está inscrita no agendador
         self.texto_tempo = (
             None  # Inicializa o texto do tempo como None
         )
+        self.tela_pergunta = None  # Tela de pergunta, criada na primeira pergunta
+        self.botao_iniciar = None  # Botão "Iniciar Quiz", habilitado após carregar_revisao()
+        self.pergunta_exibida = None  # Pergunta na tela, aguardando resposta
+        self.instante_clique = None  # Instante (perf_counter) do último clique
+        self.instante_exibicao = None  # Instante (monotônico) em que a pergunta apareceu
+        self.latencias_clique = []  # Latências clique -> próxima pergunta (segundos)
         self.modal_aberto = (
             False  # Inicializa o estado do modal como fechado
         )
         self.exibir_tela_inicial()  # Exibe a tela inicial ao iniciar
+        # Registra a sessão: ociosa ou desconectada por muito tempo, ela é encerrada
+        page.on_disconnect = self.ao_desconectar
+        page.on_connect = self.ao_reconectar
+        self.sessoes = obter_registro_sessoes()
+        self.sessoes.registrar(self)
+        # Identifica o aprendiz sem bloquear a sessão (o navegador precisa responder)
+        threading.Thread(target=self.carregar_revisao, daemon=True).start()
+
+    def ao_desconectar(self, e):
+        """Marca o instante da desconexão (o cliente pode reconectar em seguida)."""
+        self.desconectada_em = time.monotonic()
+
+    def ao_reconectar(self, e):
+        """Desfaz a marca de desconexão quando o cliente volta."""
+        self.desconectada_em = None
+        self.ultima_atividade = time.monotonic()
+
+    def encerrar(self, motivo: str):
+        """
+        Encerra a sessão: cancela o timer, grava os erros pendentes para
+        revisão e libera a tela, os diálogos, os áudios e a tentativa.
+        Chamado pelo registro de sessões (ver sessions.py).
+
+        Args:
+            motivo (str): O motivo do encerramento ("ociosa", "desconectada"...).
+        """
+        self.encerrada = True
+        self.parar_timer()
+        # Uma tentativa em andamento continua no ponto de retomada do aprendiz
+        # (inclusive os erros, agendados para revisão quando ela terminar)
+        retomavel = self.estado_quiz.quiz_iniciado and self.checkpoint is not None
+        if self.checkpoint is not None:
+            self.checkpoint.close()
+        self.estado_quiz.quiz_iniciado = False  # Avanços agendados pendentes são ignorados
+        self.pergunta_exibida = None
+        self.tentativa_id = None  # Sem retomada, a tentativa fica sem fim no histórico
+        if self.erros_tentativa and not retomavel:
+            threading.Thread(target=self.salvar_revisao, daemon=True).start()
+        self.quiz_logic.clear()
+        self.tela_pergunta = None
+        self.texto_tempo = None
+        self.aviso = None
+        self.latencias_clique = []
+        self.audio.liberar()
+        self.page.overlay.clear()
+        self.page.appbar = None
+        self.page.on_disconnect = None
+        self.page.on_connect = None
+        try:
+            exibir_sessao_encerrada(self.page, motivo)
+        except Exception as erro:  # Cliente desconectado: a página é descartada pelo Flet
+            print(f"Sessão {self.page.session_id} encerrada ({motivo}): {erro}")
+
+    def liberar_memoria(self):
+        """Descarta o que pode ser recriado: diálogos fechados e, fora de uma tentativa, as perguntas."""
+        self.descartar_dialogos()
+        if not self.estado_quiz.quiz_iniciado:
+            self.quiz_logic.clear()
+            self.tela_pergunta = None
+
+    def descartar_dialogos(self):
+        """Remove do overlay os diálogos já fechados (cada resultado cria um novo)."""
+        self.page.overlay[:] = [
+            controle
+            for controle in self.page.overlay
+            if not (isinstance(controle, ft.AlertDialog) and not controle.open)
+        ]
+
+    def objetos_proprios(self) -> list:
+        """
+        Returns:
+            list: As raízes da memória retida pela sessão (ver sessions.py).
+        """
+        return [vars(self), self.page.controls, self.page.overlay, self.page.appbar]
+
+    def objetos_compartilhados(self) -> list:
+        """
+        Returns:
+            list: Objetos alcançáveis pela sessão, mas compartilhados com as
+                demais (não contam na memória da sessão).
+        """
+        compartilhados = [
+            self,
+            self.registro,
+            self.historico,
+            self.agendador,
+            self.sessoes,
+            self.revisao,  # O baralho é do aprendiz, não da sessão
+        ]
+        for banco in self.registro.banks.values():
+            compartilhados += [banco, banco.rows]
+        # Após uma atualização, a tentativa continua no banco anterior
+        compartilhados.append(self.quiz_logic.questions.rows)
+        if self.quiz_logic.selector is not None:
+            compartilhados.append(self.quiz_logic.selector.index)
+        return compartilhados
+
+    def tipos_compartilhados(self) -> tuple:
+        """
+        Returns:
+            tuple: Tipos que nunca contam na memória da sessão, mesmo fora
+                de objetos_compartilhados() (ex.: a versão anterior de um
+                banco, ainda usada por uma tentativa após a atualização).
+        """
+        return (QuestionStore, BinaryBank, DifficultyIndex)
+
+    def carregar_revisao(self):
+        """
+        Identifica o aprendiz pelo ID guardado no navegador (criando um, se
+        necessário), carrega o seu baralho de revisão e retoma a sua
+        tentativa interrompida, se houver.
+        """
+        try:
+            aprendiz = self.page.client_storage.get(CHAVE_APRENDIZ)
+        except Exception as erro:  # Cliente sem resposta (timeout) ou desconectado
+            print(f"Não foi possível ler o aprendiz do navegador: {erro}")
+            aprendiz = None
+        # O valor vem do cliente: só é aceito no formato esperado (é nome de arquivo)
+        if not isinstance(aprendiz, str) or not LEARNER_ID_PATTERN.match(aprendiz):
+            aprendiz = uuid.uuid4().hex
+            try:
+                self.page.client_storage.set(CHAVE_APRENDIZ, aprendiz)
+            except Exception as erro:
+                print(f"Não foi possível gravar o aprendiz no navegador: {erro}")
+        self.revisao = get_review_deck(aprendiz)
+        self.aprendiz = aprendiz
+        anterior = None
+        try:
+            # O botão "Iniciar Quiz" só é habilitado depois desta decisão:
+            # nenhuma tentativa nova começa antes de a gravada ser retomada
+            with self.lock_estado:
+                self.checkpoint = AttemptCheckpoint(checkpoint_path(aprendiz))
+                anterior = self.retomar_tentativa()
+        finally:
+            self.revisao_carregada.set()
+            self.habilitar_inicio()
+        # A sessão que gravava a tentativa é encerrada fora do lock desta
+        if anterior is not None:
+            self.sessoes.encerrar(anterior, SUBSTITUIDA)
+
+    def habilitar_inicio(self):
+        """Habilita o botão "Iniciar Quiz", se a tela inicial estiver aberta."""
+        botao = self.botao_iniciar
+        if botao is not None and botao.page is not None and botao.disabled:
+            botao.disabled = False
+            try:
+                botao.update()
+            except Exception as erro:  # Cliente desconectado
+                print(f"Não foi possível habilitar o início: {erro}")
+
+    def retomar_tentativa(self):
+        """
+        Retoma, do ponto de retomada do aprendiz, a tentativa interrompida
+        (página recarregada, aplicativo fechado...), se ainda houver prazo.
+        Chamado com lock_estado adquirido.
+
+        Returns:
+            A sessão que gravava a tentativa até agora (a ser encerrada), ou None.
+        """
+        instantaneo = self.checkpoint.load()
+        if instantaneo is None or instantaneo.finished or self.estado_quiz.quiz_iniciado:
+            return None
+        restante = instantaneo.deadline - time.time()
+        if restante <= 0 or instantaneo.bank not in self.registro.banks:
+            return None
+        self.escolher_banco(instantaneo.bank)
+        respostas = instantaneo.answers
+        if not self.quiz_logic.restore(
+            instantaneo.keys, instantaneo.shown, [acertou for _, acertou in respostas], instantaneo.adaptive
+        ):
+            print("Tentativa não retomada: o banco de perguntas mudou.")
+            return None
+        # A sessão que gravava a tentativa para de gravar antes de reabrirmos o arquivo
+        anterior = self.sessoes.assumir_aprendiz(self.aprendiz, self)
+        if anterior is not None and anterior.checkpoint is not None:
+            anterior.checkpoint.close()
+        self.checkpoint.resume()
+        # Refaz o estado da tela a partir das respostas gravadas
+        self.estado_quiz.reiniciar()
+        for posicao, (opcao, _) in enumerate(respostas):
+            self.estado_quiz.registrar_resposta(posicao, opcao)
+        self.estado_quiz.pontuacao = self.quiz_logic.score
+        self.estado_quiz.pergunta_atual = self.quiz_logic.current_question
+        self.estado_quiz.quiz_iniciado = True
+        self.em_revisao = instantaneo.review
+        self.tentativa_id = instantaneo.attempt_id
+        perguntas = self.quiz_logic.questions
+        self.erros_tentativa = [] if self.em_revisao else [
+            perguntas[posicao][0] for posicao, (_, acertou) in enumerate(respostas) if not acertou
+        ]
+        self.latencias_clique.clear()
+        self.iniciar_timer(restante)
+        self.proxima_pergunta(None)
+        self.avisar("Tentativa retomada de onde parou.")
+        return anterior
+
+    def gravar_inicio(self):
+        """Recria o ponto de retomada do aprendiz com a tentativa que começa."""
+        if self.checkpoint is None:
+            return  # Aprendiz ainda não identificado: tentativa sem retomada
+        # Outra sessão do aprendiz com uma tentativa aberta deixa de gravá-la
+        anterior = self.sessoes.assumir_aprendiz(self.aprendiz, self)
+        if anterior is not None and anterior.checkpoint is not None:
+            anterior.checkpoint.close()
+        perguntas = self.quiz_logic.questions
+        self.checkpoint.begin(
+            self.banco_escolhido,
+            time.time() + (self.estado_quiz.prazo - time.monotonic()),
+            [question_key(perguntas[posicao][0]) for posicao in range(len(perguntas))],
+            self.tentativa_id,
+            review=self.em_revisao,
+            adaptive=self.quiz_logic.selector is not None,
+        )
 
     def exibir_tela_inicial(self):
         """Exibe a tela inicial do quiz, reiniciando o estado do jogo."""
         self.parar_timer()  # Para o timer, se estiver ativo
         self.estado_quiz.reiniciar()  # Reinicia o estado do quiz
-        self.page.clean()  # Limpa a página
+        self.pergunta_exibida = None  # Descarta a pergunta que estava na tela
+        # Limpa a página, removendo apenas os controles da tela (page.clean()
+        # também esvaziaria o overlay, forçando o reenvio dos áudios ao cliente)
+        self.page.controls.clear()
         exibir_tela_inicial(
             self.page, self
         )  # Exibe a tela inicial usando a função importada de views.py
-        self.page.update()  # Atualiza a página
+        with metrics.span("page_update"):
+            self.page.update()  # Atualiza a página
+
+    def escolher_banco(self, nome: str):
+        """
+        Define o banco de perguntas (certificação) das próximas tentativas.
+
+        Args:
+            nome (str): O nome do banco no registro.
+        """
+        self.ultima_atividade = time.monotonic()
+        self.banco_escolhido = nome
+        self.quiz_logic.bank = self.registro.get(nome)
 
     def iniciar_quiz(self, e):
         """
@@ -67,11 +364,89 @@ class QuizController:
         Args:
             e: Objeto evento do Flet.
         """
-        # Verifica se o quiz já foi iniciado
-        if not self.estado_quiz.quiz_iniciado:
-            self.estado_quiz.quiz_iniciado = True  # Define o quiz como iniciado
-            self.iniciar_timer()  # Inicia o timer
-            self.proxima_pergunta(e)  # Carrega a próxima pergunta (primeira, nesse caso)
+        self.ultima_atividade = time.monotonic()
+        # O botão fica desabilitado até a identificação do aprendiz (a tentativa
+        # interrompida pode ser retomada no lugar desta); sem esperar aqui, um
+        # cliente lento não congela a sessão
+        if not self.revisao_carregada.is_set():
+            return
+        with self.lock_estado:
+            # Verifica se o quiz já foi iniciado (ou retomado)
+            if not self.estado_quiz.quiz_iniciado:
+                self.estado_quiz.quiz_iniciado = True  # Define o quiz como iniciado
+                self.em_revisao = False
+                # Sorteia as perguntas a partir do banco mais recente (pode ter sido
+                # atualizado em segundo plano desde a última tentativa)
+                self.quiz_logic.new_attempt(adaptive=self.modo_adaptativo)
+                self.latencias_clique.clear()
+                # Registra a tentativa no histórico (apenas enfileira; não acessa o disco)
+                self.tentativa_id = self.historico.begin_attempt(
+                    self.page.session_id, self.quiz_logic.bank.content_hash
+                )
+                self.iniciar_timer()  # Inicia o timer
+                self.gravar_inicio()  # Permite retomar a tentativa se a sessão cair
+                self.proxima_pergunta(e)  # Carrega a próxima pergunta (primeira, nesse caso)
+
+    def iniciar_revisao(self, e):
+        """
+        Inicia uma revisão com as perguntas erradas que já venceram
+        (ver review.py), fora do histórico de tentativas.
+
+        Args:
+            e: Objeto evento do Flet.
+        """
+        self.ultima_atividade = time.monotonic()
+        self.fechar_modal(e)  # Fecha o modal de resultados
+        chaves = []
+        # Os resultados só aparecem após uma tentativa: o baralho já foi carregado
+        if self.revisao_carregada.is_set():
+            self.agendar_erros()  # Inclui os erros da tentativa que acabou de terminar
+            # O baralho reúne todos os bancos: busca folga para os cartões de outros
+            chaves = self.revisao.due_keys(limit=REVIEW_SIZE * len(self.registro))
+        with self.lock_estado:
+            self.parar_timer()
+            self.estado_quiz.reiniciar()
+            self.quiz_logic.new_review(chaves, REVIEW_SIZE)
+            if not len(self.quiz_logic.questions):
+                self.exibir_tela_inicial()
+                self.avisar("Nenhuma pergunta para revisar agora.")
+                return
+            self.em_revisao = True
+            self.estado_quiz.quiz_iniciado = True
+            self.latencias_clique.clear()
+            self.tentativa_id = None  # Revisões não entram nas estatísticas das perguntas
+            self.iniciar_timer()
+            self.gravar_inicio()
+            self.proxima_pergunta(e)
+
+    def agendar_erros(self):
+        """Passa ao baralho de revisão as perguntas erradas na última tentativa."""
+        with self.lock_erros:
+            erros, self.erros_tentativa = self.erros_tentativa, []
+            for enunciado in erros:
+                self.revisao.record_miss(question_key(enunciado))
+
+    def salvar_revisao(self):
+        """Agenda os erros da tentativa e grava o baralho (em segundo plano)."""
+        if not self.revisao_carregada.wait(ESPERA_REVISAO):
+            return
+        self.agendar_erros()
+        try:
+            self.revisao.save()
+        except OSError as erro:
+            print(f"Erro ao gravar o baralho de revisão: {erro}")
+
+    def avisar(self, mensagem: str):
+        """
+        Exibe uma mensagem curta na parte inferior da tela.
+
+        Args:
+            mensagem (str): A mensagem a exibir.
+        """
+        if self.aviso is None:
+            self.aviso = ft.SnackBar(ft.Text())
+        self.aviso.content.value = mensagem
+        self.page.open(self.aviso)
 
     def proxima_pergunta(self, e):
         """
@@ -81,69 +456,130 @@ class QuizController:
         Args:
             e: Objeto evento do Flet.
         """
+        # Ignora chamadas atrasadas (ex.: timer de feedback) após sair do quiz
+        if not self.estado_quiz.quiz_iniciado:
+            return
+        # Obtém a próxima pergunta já embaralhada e formatada pela lógica do quiz
+        pergunta = self.quiz_logic.next_question()
         # Verifica se ainda há perguntas a serem exibidas
-        if self.estado_quiz.pergunta_atual < len(
-            self.quiz_logic.questions
-        ):
-            # Obtém a pergunta atual da lista de perguntas
-            pergunta_atual = self.quiz_logic.questions[
-                self.estado_quiz.pergunta_atual
-            ]
-            # Cria uma instância da classe Pergunta com os dados da pergunta atual
-            pergunta = Pergunta(
-                pergunta_atual[0],
-                pergunta_atual[1:5],
-                pergunta_atual[5],
-            )
+        if pergunta is not None:
+            # Grava a pergunta (e a ordem das opções) antes de exibi-la: se a
+            # sessão cair, ela volta igual na retomada
+            if self.checkpoint is not None:
+                self.checkpoint.shown(
+                    self.estado_quiz.pergunta_atual, question_key(pergunta.enunciado), pergunta.ordem
+                )
             # Exibe a pergunta usando a função importada de views.py
-            exibir_pergunta(
-                self.page, pergunta, self.estado_quiz, self
-            )
+            with metrics.span("question_render"):
+                exibir_pergunta(
+                    self.page, pergunta, self.estado_quiz, self
+                )
 
             # Correção: Incrementar a pergunta_atual DEPOIS de exibir a pergunta
             self.estado_quiz.proxima_pergunta()
-
-            # Define o texto do tempo restante
-            self.texto_tempo = self.page.controls[0].controls[0]
+            self.pergunta_exibida = pergunta  # Pergunta que o próximo clique responde
+            self.instante_exibicao = time.monotonic()
         else:
             # Se não houver mais perguntas, finaliza o quiz
             self.finalizar_quiz(e)
-        self.page.update()  # Atualiza a página
+        with metrics.span("page_update"):
+            self.page.update()  # Atualiza a página
+
+        # Registra a latência do clique até a nova pergunta estar na tela
+        if self.instante_clique is not None:
+            latencia = time.perf_counter() - self.instante_clique
+            self.latencias_clique.append(latencia)
+            metrics.observe("click_to_question", latencia)
+            self.instante_clique = None
+
+        # Prepara as próximas perguntas enquanto o usuário lê a atual
+        self.quiz_logic.prefetch()
 
     def verificar_resposta(self, e):
         """
         Verifica a resposta selecionada pelo usuário.
         """
-        if not self.estado_quiz.quiz_finalizado:
-            # Corrigido: Usar o índice da resposta correta retornado por load_question()
-            _, _, resposta_correta = self.quiz_logic.load_question()
-            botao_clicado = e.control
-
-            if e.control.data == resposta_correta:
-                self.estado_quiz.pontuacao += 1
-                #if self.som_ativado:
-                    #reproduzir_audio("certo")
-                #piscar_verde(botao_clicado)
-                #else: # <-- Bloco else movido para cá
-                #if self.som_ativado:
-                    #reproduzir_audio("errado")
-                #piscar_vermelho(botao_clicado)  # Faz o botão piscar em vermelho
-            
-            # Define a função que será executada após um pequeno atraso
-            def proxima_pergunta_com_atraso():
-                """
-                Função auxiliar para adicionar um atraso
-                antes de carregar a próxima pergunta.
-                """
-                time.sleep(
-                    0.5
-                )  # Aguarda 0.5 segundos antes de carregar a próxima pergunta
-                self.proxima_pergunta(
-                    e
-                )  # Carrega a próxima pergunta
-
-            # Cria um timer para executar a função proxima_pergunta_com_atraso() após 0.1 segundos
-            threading.Timer(0.1, proxima_pergunta_com_atraso).start()
+        # Dois cliques simultâneos não podem responder a mesma pergunta
+        with self.lock_estado:
+            # Ignora cliques após o fim do quiz ou enquanto a próxima pergunta não aparece
+            if not self.estado_quiz.quiz_finalizado and self.pergunta_exibida is not None:
+                self.instante_clique = time.perf_counter()
+                self.ultima_atividade = time.monotonic()
+                pergunta = self.pergunta_exibida
+                self.pergunta_exibida = None
+                botao_clicado = e.control
+
+                # Registra a opção escolhida (a pergunta exibida é a anterior à atual)
+                posicao = self.estado_quiz.pergunta_atual - 1
+                self.estado_quiz.registrar_resposta(posicao, e.control.data)
+                self.registrar_no_historico(posicao, pergunta, e.control.data)
+                # O índice da resposta correta já foi calculado na preparação da pergunta
+                acertou = e.control.data == pergunta.resposta_correta
+                if self.checkpoint is not None:
+                    self.checkpoint.answer(posicao, e.control.data, acertou)  # Um os.write() de 5 bytes
+                self.quiz_logic.record_result(acertou)  # Ajusta a escolha adaptativa, se ativa
+                if self.em_revisao:
+                    # Reagenda a pergunta no baralho (O(log n); gravado no fim da revisão)
+                    self.revisao.review(question_key(pergunta.enunciado), acertou)
+                elif not acertou:
+                    self.erros_tentativa.append(pergunta.enunciado)  # Agendada no fim
+                if acertou:
+                    self.estado_quiz.pontuacao += 1
+                    self.reproduzir_audio("certo")
+                    #piscar_verde(botao_clicado)
+                else:
+                    self.reproduzir_audio("errado")
+                    #piscar_vermelho(botao_clicado)  # Faz o botão piscar em vermelho
+
+                # Carrega a próxima pergunta após o atraso intencional de feedback,
+                # pelo agendador (sem uma thread nova por clique)
+                self.agendador.agendar(ATRASO_FEEDBACK, self.avancar_apos_feedback, e)
+
+    def avancar_apos_feedback(self, e):
+        """
+        Exibe a próxima pergunta ao fim do atraso de feedback. Chamado pelo
+        agendador.
+
+        Args:
+            e: Objeto evento do Flet.
+        """
+        with self.lock_estado:
+            # Ignora se a próxima pergunta já está na tela (ex.: nova tentativa iniciada)
+            if self.pergunta_exibida is None:
+                self.proxima_pergunta(e)
+
+    def registrar_no_historico(self, posicao: int, pergunta: Pergunta, opcao: int):
+        """
+        Enfileira a resposta no histórico, com as opções na ordem original
+        do banco e o tempo gasto na pergunta.
+
+        Args:
+            posicao (int): A posição da pergunta na tentativa.
+            pergunta (Pergunta): A pergunta respondida.
+            opcao (int): O índice da opção escolhida (na ordem exibida).
+        """
+        if self.tentativa_id is None:
+            return
+        ordem = pergunta.ordem or range(len(pergunta.opcoes))
+        correta = pergunta.resposta_correta
+        self.historico.record_answer(
+            self.tentativa_id,
+            posicao,
+            pergunta.enunciado,
+            ordem[opcao],
+            ordem[correta] if correta >= 0 else -1,
+            time.monotonic() - self.instante_exibicao,
+        )
+
+    def reproduzir_audio(self, pasta: str):
+        """
+        Reproduz um áudio da pasta especificada, se o som estiver ativado.
+
+        Args:
+            pasta (str): O nome da pasta dentro do diretório "audio".
+        """
+        if self.som_ativado:
+            self.audio.reproduzir(pasta)
 
     def finalizar_quiz(self, e):
         """
@@ -153,6 +589,18 @@ class QuizController:
             e: Objeto evento do Flet.
         """
         self.parar_timer()  # Para o timer
+        self.ultima_atividade = time.monotonic()  # O tempo ocioso conta a partir dos resultados
+        if self.checkpoint is not None:
+            self.checkpoint.finish()  # Nada mais a retomar
+        # Fecha a tentativa no histórico (uma única vez, mesmo se chamado de novo)
+        if self.tentativa_id is not None:
+            self.historico.finish_attempt(
+                self.tentativa_id, self.estado_quiz.pontuacao, len(self.quiz_logic.questions)
+            )
+            self.tentativa_id = None
+        # Agenda os erros para revisão e grava o baralho fora da thread da sessão
+        if self.erros_tentativa or self.em_revisao:
+            threading.Thread(target=self.salvar_revisao, daemon=True).start()
         self.estado_quiz.quiz_finalizado = (
             True  # Define o quiz como finalizado
         )
@@ -166,6 +614,7 @@ class QuizController:
 
     def voltar_ao_inicio(self, e):
         """Volta à tela inicial do quiz, fechando o modal se necessário."""
+        self.ultima_atividade = time.monotonic()
         self.fechar_modal(
             e
         )  # Fecha o modal de resultados, se estiver aberto
@@ -187,49 +636,50 @@ class QuizController:
                 self.page.update()  # Atualiza a página
                 break  # Sai do loop, já que encontrou o modal
 
-    def iniciar_timer(self):
-        """Inicia o timer do quiz e configura a atualização do tempo."""
-
-        # Define a função que será executada a cada segundo pelo timer
-        def atualizar_tempo():
-            """
-            Função auxiliar para atualizar o tempo restante
-            do quiz a cada segundo.
-            """
-            # Verifica se ainda há tempo restante e se o quiz está em andamento
-            if self.estado_quiz.tempo_restante > 0 and self.estado_quiz.quiz_iniciado:
-                self.estado_quiz.tempo_restante -= 1  # Decrementa o tempo restante
-                self.atualizar_texto_tempo()  # Atualiza o texto do tempo na interface
-                # Define o timer para executar a função atualizar_tempo() novamente após 1 segundo
-                self.timer = threading.Timer(1, atualizar_tempo)
-                self.timer.start()  # Inicia o timer
-            else:
-                self.finalizar_quiz(
-                    None
-                )  # Finaliza o quiz se o tempo acabar
+    def iniciar_timer(self, duracao: float = TEMPO_LIMITE):
+        """
+        Inicia o prazo do quiz e inscreve a sessão no agendador de ticks.
 
+        Args:
+            duracao (float): O tempo disponível, em segundos.
+        """
+        self.estado_quiz.iniciar_prazo(duracao)  # O tempo restante passa a ser calculado a partir do prazo
         self.atualizar_texto_tempo()  # Atualiza o texto do tempo na interface
-        # Define o timer para executar a função atualizar_tempo() após 1 segundo
-        self.timer = threading.Timer(1, atualizar_tempo)
-        self.timer.start()  # Inicia o timer
+        self.agendador.inscrever(self.tick)  # Recebe um tick por segundo do agendador
+        self.timer_ativo = True
+
+    def tick(self):
+        """
+        Chamado pelo agendador a cada segundo: atualiza o texto do tempo
+        ou finaliza o quiz quando o prazo acaba.
+        """
+        # Verifica se o quiz ainda está em andamento e com tempo
+        if self.estado_quiz.quiz_iniciado and self.estado_quiz.tempo_restante > 0:
+            self.atualizar_texto_tempo()  # Atualiza o texto do tempo na interface
+            return
+        # Verifica e finaliza sob o lock: não finaliza no meio de uma resposta,
+        # nem de novo se outra finalização (ex.: a última resposta) veio antes
+        with self.lock_estado:
+            if self.estado_quiz.quiz_iniciado:
+                self.reproduzir_audio("acabar")  # Reproduz o áudio de "acabar"
+                self.finalizar_quiz(None)  # Finaliza o quiz se o tempo acabar
+            else:
+                self.parar_timer()
 
     def parar_timer(self):
         """Para o timer do quiz."""
-        # Verifica se o timer está ativo
-        if self.timer is not None:
-            self.timer.cancel()  # Cancela o timer
-            self.timer = None  # Define o timer como None
+        # Verifica se a sessão está inscrita no agendador
+        if self.timer_ativo:
+            self.agendador.cancelar(self.tick)  # Cancela a inscrição
+            self.timer_ativo = False
 
     def atualizar_texto_tempo(self):
         """Atualiza o texto do tempo restante na interface do usuário."""
-        # Verifica se o texto do tempo foi definido
-        if self.texto_tempo:
-            # Calcula as horas, minutos e segundos restantes
-            horas, resto = divmod(self.estado_quiz.tempo_restante, 3600)
-            minutos, segundos = divmod(resto, 60)
-            # Formata o tempo restante e define o valor do texto na interface
-            self.texto_tempo.value = (
-                f"Tempo restante: {horas:02d}:{minutos:02d}:{segundos:02d}"
-            )
-            self.page.update()  # Atualiza a página
-
+        # Verifica se o texto do tempo foi definido e ainda está na página
+        if self.texto_tempo is not None and self.texto_tempo.page is not None:
+            valor = formatar_tempo(self.estado_quiz.tempo_restante)
+            # Envia ao cliente apenas o controle do tempo, e só se o texto mudou
+            if self.texto_tempo.value != valor:
+                self.texto_tempo.value = valor
+                with metrics.span("timer_text_update"):
+                    self.texto_tempo.update()
@@ -1,21 +1,35 @@
+import math  # Importa a biblioteca math para arredondar o tempo restante
+import time  # Importa a biblioteca time para o relógio monotônico
+from array import array  # Importa array para guardar as respostas de forma compacta
+from dataclasses import dataclass  # Importa dataclass para o registro imutável da pergunta
+
+# Duração de uma tentativa do quiz, em segundos (1 hora)
+TEMPO_LIMITE = 3600
+
+
+@dataclass(frozen=True, slots=True)
 class Pergunta:
     """
     Representa uma pergunta do quiz com seu enunciado, opções de resposta
-    e a resposta correta.
-    """
+    e a resposta correta. Imutável e sem __dict__, pode ser compartilhada
+    entre sessões e preparada antecipadamente sem cópias.
 
-    def __init__(self, enunciado: str, opcoes: list, resposta_correta: int):
-        """
-        Inicializa uma nova pergunta.
+    Attributes:
+        enunciado (str): O texto da pergunta.
+        opcoes (tuple): As opções de resposta (strings).
+        resposta_correta (int): O índice da resposta correta em 'opcoes'
+            (-1 se a pergunta não tiver resposta válida).
+        rotulos (tuple): Os textos já formatados dos botões ("a) ...");
+            vazio para as opções que não devem ser exibidas.
+        ordem (tuple): Para cada opção exibida, o seu índice na ordem
+            original do banco (permite registrar a resposta sem o embaralhamento).
+    """
 
-        Args:
-            enunciado (str): O texto da pergunta.
-            opcoes (list): Uma lista de opções de resposta (strings).
-            resposta_correta (int): O índice da resposta correta na lista 'opcoes'.
-        """
-        self.enunciado = enunciado  # Atribui o enunciado da pergunta
-        self.opcoes = opcoes  # Atribui a lista de opções de resposta
-        self.resposta_correta = resposta_correta  # Atribui o índice da resposta correta
+    enunciado: str
+    opcoes: tuple
+    resposta_correta: int
+    rotulos: tuple = None
+    ordem: tuple = None
 
 
 class EstadoQuiz:
@@ -24,12 +38,21 @@ class EstadoQuiz:
     pontuação, e se o quiz está em andamento ou finalizado.
     """
 
+    __slots__ = (
+        "pergunta_atual",
+        "prazo",
+        "pontuacao",
+        "quiz_iniciado",
+        "quiz_finalizado",
+        "respostas",
+    )
+
     def __init__(self):
         """Inicializa um novo estado de quiz."""
         self.pergunta_atual: int = (
             0  # Índice da pergunta atual (inicia na primeira pergunta)
         )
-        self.tempo_restante: int = 3600  # Tempo restante em segundos (1 hora)
+        self.prazo: float = None  # Instante (time.monotonic()) em que o tempo acaba
         self.pontuacao: int = 0  # Pontuação atual (inicia em 0)
         self.quiz_iniciado: bool = (
             False  # Indica se o quiz foi iniciado (inicia como False)
@@ -37,6 +60,38 @@ class EstadoQuiz:
         self.quiz_finalizado: bool = (
             False  # Indica se o quiz foi finalizado (inicia como False)
         )
+        # Opção escolhida em cada pergunta (-1 = não respondida), 1 byte por pergunta
+        self.respostas: array = array("b")
+
+    @property
+    def tempo_restante(self) -> int:
+        """int: Tempo restante em segundos, calculado a partir do prazo."""
+        if self.prazo is None:
+            return TEMPO_LIMITE
+        return max(0, math.ceil(self.prazo - time.monotonic()))
+
+    def iniciar_prazo(self, duracao: float = TEMPO_LIMITE):
+        """
+        Define o prazo da tentativa a partir do instante atual.
+
+        Args:
+            duracao (float): O tempo disponível, em segundos (menor que
+                TEMPO_LIMITE ao retomar uma tentativa).
+        """
+        self.prazo = time.monotonic() + duracao
+
+    def registrar_resposta(self, posicao: int, opcao: int):
+        """
+        Registra a opção escolhida em uma pergunta.
+
+        Args:
+            posicao (int): A posição da pergunta na tentativa.
+            opcao (int): O índice da opção escolhida (na ordem exibida).
+        """
+        # Estende o array sob demanda, marcando as perguntas puladas como não respondidas
+        if posicao >= len(self.respostas):
+            self.respostas.extend([-1] * (posicao + 1 - len(self.respostas)))
+        self.respostas[posicao] = opcao
 
     def proxima_pergunta(self):
         """Avança para a próxima pergunta do quiz."""
@@ -45,7 +100,8 @@ class EstadoQuiz:
     def reiniciar(self):
         """Reinicia o estado do quiz para o início."""
         self.pergunta_atual = 0  # Reinicia o índice da pergunta atual
-        self.tempo_restante = 3600  # Reinicia o tempo restante
+        self.prazo = None  # Reinicia o prazo (tempo restante volta a 1 hora)
         self.pontuacao = 0  # Reinicia a pontuação
         self.quiz_iniciado = False  # Define o quiz como não iniciado
         self.quiz_finalizado = False  # Define o quiz como não finalizado
+        self.respostas = array("b")  # Descarta as respostas da tentativa anterior
@@ -0,0 +1,159 @@
+import heapq  # Importa a biblioteca heapq para a fila de chamadas agendadas
+import itertools  # Importa a biblioteca itertools para desempatar chamadas no mesmo instante
+import threading  # Importa a biblioteca threading para a thread do agendador
+import time  # Importa a biblioteca time para o relógio monotônico
+import traceback  # Importa a biblioteca traceback para registrar erros dos callbacks
+from concurrent.futures import ThreadPoolExecutor  # Importa o pool que executa os callbacks
+
+import metrics  # Importa a instrumentação dos trechos críticos
+
+# Threads que executam os callbacks: um cliente lento ocupa apenas uma delas
+MAX_TRABALHADORES = 8
+
+
+class TickScheduler:
+    """
+    Agendador único do processo que chama, a cada segundo, os callbacks de
+    todas as sessões inscritas e, no instante pedido, as chamadas agendadas
+    uma única vez (ex.: a próxima pergunta após o feedback). Uma só thread
+    marca o tempo e entrega os callbacks a um pool limitado, de modo que uma
+    sessão lenta (ex.: websocket bloqueado) não atrasa as demais. O tick de
+    um callback que ainda não terminou o anterior é descartado, em vez de
+    enfileirado.
+    """
+
+    def __init__(self, intervalo: float = 1.0, trabalhadores: int = MAX_TRABALHADORES):
+        """
+        Inicializa o agendador (a thread só é criada na primeira inscrição).
+
+        Args:
+            intervalo (float): Intervalo entre os ticks, em segundos.
+            trabalhadores (int): Threads que executam os callbacks.
+        """
+        self.intervalo = intervalo  # Intervalo entre os ticks
+        self.trabalhadores = trabalhadores  # Tamanho do pool de execução
+        self._callbacks = {}  # Callbacks inscritos (dict usado como conjunto ordenado)
+        self._agendados = []  # Heap de (instante, sequência, callback, argumentos)
+        self._sequencia = itertools.count()  # Ordem de chegada entre chamadas no mesmo instante
+        self._lock = threading.Lock()  # Protege o dicionário de callbacks e o heap
+        self._acordar = threading.Condition(self._lock)  # Avisa a thread de um novo agendamento
+        self._thread = None  # Thread do agendador
+        self._pool = None  # Pool que executa os callbacks (criado com a thread)
+        self._pendentes = set()  # Callbacks de tick na fila do pool ou em execução
+        self.ticks_descartados = 0  # Ticks não entregues: o anterior ainda não tinha terminado
+
+    def inscrever(self, callback):
+        """
+        Inscreve um callback para ser chamado a cada tick.
+
+        Args:
+            callback: Função sem argumentos chamada pela thread do agendador.
+        """
+        with self._lock:
+            self._callbacks[callback] = None
+            self._iniciar_thread()
+
+    def agendar(self, atraso: float, callback, *argumentos):
+        """
+        Agenda uma única chamada do callback, executada pelo pool do agendador.
+
+        Args:
+            atraso (float): Tempo até a chamada, em segundos.
+            callback: A função a chamar.
+            *argumentos: Os argumentos da chamada.
+        """
+        with self._lock:
+            item = (time.monotonic() + atraso, next(self._sequencia), callback, argumentos)
+            heapq.heappush(self._agendados, item)
+            self._iniciar_thread()
+            self._acordar.notify()  # A thread pode estar dormindo até um instante posterior
+
+    def _iniciar_thread(self):
+        """Cria a thread do agendador no primeiro uso (chamado com o lock)."""
+        if self._thread is None:
+            self._pool = ThreadPoolExecutor(self.trabalhadores, thread_name_prefix="tick")
+            self._thread = threading.Thread(target=self._executar, daemon=True)
+            self._thread.start()
+
+    def cancelar(self, callback):
+        """
+        Cancela a inscrição de um callback (ignora callbacks não inscritos).
+
+        Args:
+            callback: O callback a remover.
+        """
+        with self._lock:
+            self._callbacks.pop(callback, None)
+
+    @property
+    def total_inscritos(self) -> int:
+        """int: Quantidade de callbacks inscritos."""
+        return len(self._callbacks)
+
+    def _executar(self):
+        """
+        Laço da thread: aguarda o próximo tick ou a próxima chamada agendada,
+        o que vier antes, e entrega ao pool o que estiver vencido.
+        """
+        proximo_tick = time.monotonic() + self.intervalo
+        while True:
+            with self._lock:
+                # Dorme até o próximo tick ou até a chamada agendada mais próxima
+                while True:
+                    agora = time.monotonic()
+                    limite = min(proximo_tick, self._agendados[0][0] if self._agendados else proximo_tick)
+                    if limite <= agora:
+                        break
+                    self._acordar.wait(limite - agora)
+                vencidos = []
+                while self._agendados and self._agendados[0][0] <= agora:
+                    vencidos.append(heapq.heappop(self._agendados))
+                callbacks = []
+                if proximo_tick <= agora:
+                    # Se um tick atrasou, retoma a partir de agora em vez de disparar em rajada
+                    proximo_tick = max(proximo_tick + self.intervalo, agora)
+                    for callback in self._callbacks:
+                        if callback in self._pendentes:
+                            self.ticks_descartados += 1  # O tick anterior ainda não terminou
+                        else:
+                            self._pendentes.add(callback)
+                            callbacks.append(callback)
+            for _, _, callback, argumentos in vencidos:
+                self._pool.submit(self._chamar, "scheduled_call", callback, argumentos)
+            for callback in callbacks:
+                self._pool.submit(self._chamar_tick, callback)
+
+    def _chamar_tick(self, callback):
+        """Executa o tick de um callback e o libera para o próximo tick."""
+        try:
+            self._chamar("timer_tick", callback, ())
+        finally:
+            with self._lock:
+                self._pendentes.discard(callback)
+
+    @staticmethod
+    def _chamar(trecho: str, callback, argumentos: tuple):
+        """Chama um callback; um erro não pode interromper as demais sessões."""
+        try:
+            with metrics.span(trecho):
+                callback(*argumentos)
+        except Exception:
+            traceback.print_exc()
+
+
+_agendador = None  # Instância única do agendador no processo
+_agendador_lock = threading.Lock()
+
+
+def obter_agendador() -> TickScheduler:
+    """
+    Retorna o agendador de ticks do processo, criando-o na primeira chamada.
+
+    Returns:
+        TickScheduler: O agendador compartilhado.
+    """
+    global _agendador
+    with _agendador_lock:
+        if _agendador is None:
+            _agendador = TickScheduler()
+    return _agendador
@@ -0,0 +1,247 @@
+import gc  # Importa a biblioteca gc para percorrer os objetos de cada sessão
+import sys  # Importa a biblioteca sys para o tamanho de cada objeto
+import threading  # Importa a biblioteca threading para a thread de varredura
+import time  # Importa a biblioteca time para o relógio monotônico
+import traceback  # Importa a biblioteca traceback para registrar erros da varredura
+import types  # Importa a biblioteca types para ignorar módulos e funções na medição
+
+import flet as ft  # Importa a biblioteca Flet (a página não entra na medição)
+
+# Tempo (em segundos) sem nenhuma interação após o qual a sessão é encerrada
+# (exceto durante uma tentativa: o prazo da tentativa é o limite)
+TEMPO_OCIOSO = 30 * 60
+
+# Tempo (em segundos) que uma sessão desconectada aguarda uma reconexão
+TOLERANCIA_DESCONEXAO = 120
+
+# Intervalo (em segundos) entre duas varreduras das sessões
+INTERVALO_VARREDURA = 30
+
+# Memória máxima retida por sessão (controles, perguntas, diálogos...)
+LIMITE_BYTES_SESSAO = 4 * 1024 * 1024
+
+# Objetos visitados, no máximo, ao medir uma sessão (limita o custo da varredura)
+LIMITE_OBJETOS_MEDICAO = 100_000
+
+# Tipos nunca atribuídos a uma sessão: compartilhados pelo processo ou
+# portas de entrada para ele (a página é liberada pelo próprio Flet)
+_TIPOS_IGNORADOS = (
+    type,
+    types.ModuleType,
+    types.FunctionType,
+    types.BuiltinFunctionType,
+    ft.Page,
+)
+
+# Motivos de encerramento de uma sessão (SUBSTITUIDA: a tentativa foi
+# retomada em outra sessão do mesmo aprendiz, ex.: após recarregar a página)
+OCIOSA, DESCONECTADA, MEMORIA, SUBSTITUIDA = "ociosa", "desconectada", "memoria", "substituida"
+
+
+def estimar_bytes(raizes, compartilhados: set, tipos_compartilhados: tuple = ()) -> int:
+    """
+    Estima a memória retida a partir das raízes (soma de sys.getsizeof de
+    todos os objetos alcançáveis), sem contar os objetos compartilhados.
+
+    Args:
+        raizes: Os objetos de partida.
+        compartilhados (set): IDs dos objetos a ignorar (e tudo o que só é
+            alcançável por eles).
+        tipos_compartilhados (tuple): Tipos cujas instâncias são ignoradas
+            onde quer que apareçam (ex.: bancos de perguntas).
+
+    Returns:
+        int: A memória estimada, em bytes (limitada a LIMITE_OBJETOS_MEDICAO objetos).
+    """
+    ignorados = _TIPOS_IGNORADOS + tuple(tipos_compartilhados)
+    vistos = set(compartilhados)
+    pendentes = list(raizes)
+    total = 0
+    while pendentes and len(vistos) < LIMITE_OBJETOS_MEDICAO:
+        objeto = pendentes.pop()
+        if id(objeto) in vistos or isinstance(objeto, ignorados):
+            continue
+        vistos.add(id(objeto))
+        total += sys.getsizeof(objeto)
+        pendentes.extend(gc.get_referents(objeto))
+    return total
+
+
+class SessionRegistry:
+    """
+    Registro das sessões (QuizController) vivas no processo. Uma única
+    thread varre as sessões periodicamente e encerra as ociosas (fora de
+    uma tentativa), as
+    desconectadas há mais de TOLERANCIA_DESCONEXAO segundos e as que
+    ultrapassam LIMITE_BYTES_SESSAO.
+    """
+
+    def __init__(
+        self,
+        tempo_ocioso: float = TEMPO_OCIOSO,
+        tolerancia_desconexao: float = TOLERANCIA_DESCONEXAO,
+        intervalo: float = INTERVALO_VARREDURA,
+        limite_bytes: int = LIMITE_BYTES_SESSAO,
+    ):
+        """
+        Inicializa o registro (a thread só é criada no primeiro registro).
+
+        Args:
+            tempo_ocioso (float): Tempo sem interação até o encerramento.
+            tolerancia_desconexao (float): Espera por uma reconexão.
+            intervalo (float): Intervalo entre as varreduras.
+            limite_bytes (int): Memória máxima retida por sessão.
+        """
+        self.tempo_ocioso = tempo_ocioso
+        self.tolerancia_desconexao = tolerancia_desconexao
+        self.intervalo = intervalo
+        self.limite_bytes = limite_bytes
+        self._sessoes = {}  # Sessões registradas (dict usado como conjunto ordenado)
+        self._lock = threading.Lock()  # Protege o dicionário de sessões
+        self._thread = None  # Thread de varredura
+        self._donos = {}  # Aprendiz -> sessão que grava a sua tentativa em andamento
+        self.encerradas = {OCIOSA: 0, DESCONECTADA: 0, MEMORIA: 0, SUBSTITUIDA: 0}  # Por motivo
+
+    def registrar(self, sessao):
+        """
+        Registra uma sessão.
+
+        Args:
+            sessao: O QuizController da sessão.
+        """
+        with self._lock:
+            self._sessoes[sessao] = None
+            # Cria a thread de varredura no primeiro registro
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._executar, daemon=True)
+                self._thread.start()
+
+    def assumir_aprendiz(self, aprendiz: str, sessao):
+        """
+        Torna a sessão a dona da tentativa em andamento do aprendiz.
+
+        Args:
+            aprendiz (str): O identificador do aprendiz.
+            sessao: O QuizController da sessão.
+
+        Returns:
+            A sessão registrada que era a dona até agora, ou None.
+        """
+        with self._lock:
+            anterior = self._donos.get(aprendiz)
+            self._donos[aprendiz] = sessao
+        if anterior is sessao or anterior not in self._sessoes:
+            return None
+        return anterior
+
+    def sessoes(self) -> list:
+        """
+        Returns:
+            list: As sessões registradas, na ordem de registro.
+        """
+        with self._lock:
+            return list(self._sessoes)
+
+    @property
+    def total(self) -> int:
+        """int: Quantidade de sessões registradas."""
+        return len(self._sessoes)
+
+    @property
+    def desconectadas(self) -> int:
+        """int: Quantidade de sessões aguardando uma reconexão."""
+        return sum(1 for sessao in self.sessoes() if sessao.desconectada_em is not None)
+
+    @property
+    def bytes_retidos(self) -> int:
+        """int: Memória retida pelas sessões, segundo a última varredura."""
+        return sum(sessao.bytes_retidos for sessao in self.sessoes())
+
+    def encerrar(self, sessao, motivo: str):
+        """
+        Remove a sessão do registro e libera o seu estado.
+
+        Args:
+            sessao: O QuizController da sessão.
+            motivo (str): OCIOSA, DESCONECTADA, MEMORIA ou SUBSTITUIDA.
+        """
+        with self._lock:
+            if sessao not in self._sessoes:
+                return  # Já encerrada (ou nunca registrada)
+            del self._sessoes[sessao]
+            self.encerradas[motivo] += 1
+            if self._donos.get(sessao.aprendiz) is sessao:
+                del self._donos[sessao.aprendiz]
+        sessao.encerrar(motivo)
+
+    def medir(self, sessao) -> int:
+        """
+        Estima a memória retida pela sessão, sem contar o que é compartilhado
+        com as demais (página, bancos de perguntas, histórico...).
+
+        Args:
+            sessao: O QuizController da sessão.
+
+        Returns:
+            int: A memória estimada, em bytes.
+        """
+        sessao.bytes_retidos = estimar_bytes(
+            sessao.objetos_proprios(),
+            {id(objeto) for objeto in sessao.objetos_compartilhados()},
+            sessao.tipos_compartilhados(),
+        )
+        return sessao.bytes_retidos
+
+    def varrer(self, agora: float = None):
+        """
+        Encerra as sessões ociosas, desconectadas ou acima do limite de memória.
+
+        Args:
+            agora (float): O instante (time.monotonic()) da varredura.
+        """
+        agora = time.monotonic() if agora is None else agora
+        for sessao in self.sessoes():
+            if sessao.desconectada_em is not None:
+                if agora - sessao.desconectada_em >= self.tolerancia_desconexao:
+                    self.encerrar(sessao, DESCONECTADA)
+                continue
+            # Uma pergunta pode levar mais que tempo_ocioso: durante a
+            # tentativa, a sessão fica até o fim do prazo (ver QuizController.tick)
+            if (
+                not sessao.estado_quiz.quiz_iniciado
+                and agora - sessao.ultima_atividade >= self.tempo_ocioso
+            ):
+                self.encerrar(sessao, OCIOSA)
+            elif self.medir(sessao) > self.limite_bytes:
+                # Antes de encerrar, descarta o que pode ser recriado
+                sessao.liberar_memoria()
+                if self.medir(sessao) > self.limite_bytes:
+                    self.encerrar(sessao, MEMORIA)
+
+    def _executar(self):
+        """Laço da thread: varre as sessões a cada intervalo."""
+        while True:
+            time.sleep(self.intervalo)
+            try:
+                self.varrer()
+            except Exception:
+                # Um erro em uma sessão não pode interromper a varredura das demais
+                traceback.print_exc()
+
+
+_registro = None  # Instância única do registro de sessões no processo
+_registro_lock = threading.Lock()
+
+
+def obter_registro_sessoes() -> SessionRegistry:
+    """
+    Retorna o registro de sessões do processo, criando-o na primeira chamada.
+
+    Returns:
+        SessionRegistry: O registro compartilhado.
+    """
+    global _registro
+    with _registro_lock:
+        if _registro is None:
+            _registro = SessionRegistry()
+    return _registro
@@ -3,52 +3,29 @@ from .models import (
     Pergunta,
     EstadoQuiz,
 )  # Importa as classes Pergunta e EstadoQuiz (provavelmente de um arquivo models.py)
-import random  # Importa a biblioteca random para escolher áudios aleatórios
-
-# import pygame  # Importa a biblioteca Pygame para reprodução de áudio
-import os  # Importa a biblioteca os para interagir com o sistema de arquivos
 import threading  # Importa a biblioteca threading para usar threads
 import time  # Importa a biblioteca time para usar funções relacionadas a tempo
 
-# Inicializa o mixer do Pygame
-# pygame.mixer.init()
-
 # Define o botão "Fechar" como uma variável global (será melhorado posteriormente)
 # Idealmente, evite variáveis globais. Melhor encapsular em uma classe para melhor organização.
 btn_result__close = ft.ElevatedButton("Fechar", on_click=None, width=200, height=50)
 
 
-# Define a função para reproduzir áudio
-def reproduzir_audio(pasta: str):
+# Define a função para formatar o tempo restante
+def formatar_tempo(segundos: int) -> str:
     """
-    Reproduz um áudio aleatório da pasta especificada.
+    Formata o tempo restante para exibição.
 
     Args:
-        pasta (str): O nome da pasta dentro do diretório "audio"
-            onde os arquivos de áudio estão localizados.
-    """
-    # Constrói o caminho absoluto para a pasta de áudio
-    caminho_pasta = os.path.join(
-        os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir)),
-        "audio",
-        pasta,
-    )
-    # Obtém a lista de arquivos de áudio na pasta
-    arquivos_de_audio = [
-        f for f in os.listdir(caminho_pasta) if f.endswith((".mp3", ".wav"))
-    ]
-    # Se houver arquivos de áudio na pasta
-    if arquivos_de_audio:
-        # Escolhe um arquivo de áudio aleatório
-        audio_aleatorio = random.choice(arquivos_de_audio)
-        # Constrói o caminho completo para o arquivo de áudio
-        caminho_do_audio = os.path.join(caminho_pasta, audio_aleatorio)
-        # Carrega o arquivo de áudio
-
+        segundos (int): O tempo restante em segundos.
 
-#       pygame.mixer.music.load(caminho_do_audio)
-# Reproduz o áudio
-#      pygame.mixer.music.play()
+    Returns:
+        str: O texto "Tempo restante: HH:MM:SS".
+    """
+    # Calcula as horas, minutos e segundos restantes
+    horas, resto = divmod(segundos, 3600)
+    minutos, segundos = divmod(resto, 60)
+    return f"Tempo restante: {horas:02d}:{minutos:02d}:{segundos:02d}"
 
 
 # Define a função para exibir a tela inicial
@@ -76,7 +53,7 @@ def exibir_tela_inicial(page: ft.Page, controller):
         Args:
             e: Objeto evento do Flet.
         """
-        reproduzir_audio("inicio")  # Reproduz o áudio de início
+        controller.reproduzir_audio("inicio")  # Reproduz o áudio de início
         controller.iniciar_quiz(e)  # Chama a função do controlador para iniciar o quiz
 
     # Cria o botão "Iniciar Quiz"
@@ -85,6 +62,45 @@ def exibir_tela_inicial(page: ft.Page, controller):
         on_click=iniciar_quiz_com_som,  # Define a função que será chamada ao clicar
         width=200,  # Define a largura do botão
         height=50,  # Define a altura do botão
+        # Desabilitado até o aprendiz ser identificado (ver QuizController.carregar_revisao)
+        disabled=not controller.revisao_carregada.is_set(),
+    )
+    controller.botao_iniciar = button_start
+    # Cria o switch do modo adaptativo (perguntas escolhidas conforme o desempenho)
+    def alterar_modo(e):
+        """
+        Define o modo da próxima tentativa.
+
+        Args:
+            e: Objeto evento do Flet.
+        """
+        controller.modo_adaptativo = e.control.value
+
+    switch_adaptativo = ft.Switch(
+        label="Modo adaptativo",
+        value=controller.modo_adaptativo,
+        on_change=alterar_modo,
+    )
+    # Cria o seletor de certificação (exibido apenas com mais de um banco)
+    def alterar_banco(e):
+        """
+        Define o banco de perguntas da próxima tentativa.
+
+        Args:
+            e: Objeto evento do Flet.
+        """
+        controller.escolher_banco(e.control.value)
+
+    seletor_banco = ft.Dropdown(
+        label="Certificação",
+        options=[
+            ft.dropdown.Option(key=nome, text=titulo)
+            for nome, titulo in controller.registro.choices()
+        ],
+        value=controller.banco_escolhido,
+        on_change=alterar_banco,
+        width=300,
+        visible=len(controller.registro) > 1,
     )
     # Cria o botão "Fechar"
     close = ft.ElevatedButton(
@@ -108,7 +124,9 @@ def exibir_tela_inicial(page: ft.Page, controller):
         ft.Column(
             [
                 scrum_icon,  # Ícone do Scrum
+                seletor_banco,  # Seletor de certificação
                 button_start,  # Botão "Iniciar Quiz"
+                switch_adaptativo,  # Switch do modo adaptativo
                 close,  # Botão "Fechar"
                 button_certificacao,  # Botão "Certificação agora!"
             ],
@@ -123,58 +141,46 @@ def exibir_tela_inicial(page: ft.Page, controller):
     )  # Define a função que será chamada ao clicar no botão "Fechar"
 
 
-# Define a função para exibir uma pergunta do quiz
-def exibir_pergunta(
-    page: ft.Page, pergunta: Pergunta, estado_quiz: EstadoQuiz, controller
-):
-    """
-    Exibe uma pergunta do quiz com suas opções de resposta.
+# Define a quantidade máxima de opções de resposta por pergunta
+MAX_OPCOES = 4
 
-    Args:
-        page (ft.Page): A página do Flet para exibir a pergunta.
-        pergunta (Pergunta): A pergunta a ser exibida.
-        estado_quiz (EstadoQuiz): O estado atual do quiz.
-        controller: O objeto controlador do quiz.
+
+# Define a tela de pergunta persistente
+class TelaPergunta:
+    """
+    Tela de pergunta construída uma única vez por sessão. A cada nova
+    pergunta, apenas os textos e a visibilidade dos botões são alterados,
+    de modo que o Flet envia ao cliente só as propriedades modificadas em
+    vez de reconstruir a árvore de controles.
     """
 
-    # Limpa a página
-    page.clean()
-    # Cria o texto da pergunta
-    question_text = ft.Text(
-        f"{estado_quiz.pergunta_atual + 1}. {pergunta.enunciado}",  # Define o texto da pergunta com base no estado atual do quiz
-        size=20,  # Define o tamanho da fonte
-    )
-    # Cria uma lista para armazenar os botões de resposta
-    answer_buttons = []
-
-    # Itera pelas opções de resposta da pergunta
-    for i, opcao in enumerate(pergunta.opcoes):
-        # Verifica se a opção é uma string e se não está vazia
-        if isinstance(opcao, str) and opcao.strip():
-            # Cria um botão para a opção de resposta
-            button = ft.ElevatedButton(
-                text=f"{chr(ord('a') + i)}) {opcao}",  # Define o texto do botão com a letra correspondente à opção
+    def __init__(self, controller):
+        """
+        Cria os controles da tela de pergunta.
+
+        Args:
+            controller: O objeto controlador do quiz.
+        """
+        # Cria o texto para exibir o tempo restante
+        # (atualizado pelo controlador a cada tick do agendador compartilhado)
+        self.texto_tempo = ft.Text("", size=16)
+        # Cria o texto da pergunta
+        self.texto_pergunta = ft.Text("", size=20)
+        # Cria os botões de resposta; o índice da opção fica armazenado em data
+        self.botoes = [
+            ft.ElevatedButton(
+                text="",
                 on_click=controller.verificar_resposta,  # Define a função que será chamada ao clicar no botão
                 data=i,  # Armazena o índice da opção como dado no botão
             )
-            # Adiciona o botão à lista de botões de resposta
-            answer_buttons.append(button)
-
-    # Cria o texto para exibir o tempo restante
-    score_text = ft.Text(
-        f"Tempo restante: {estado_quiz.tempo_restante // 60:02d}:{estado_quiz.tempo_restante % 60:02d}",  # Define o texto do tempo restante
-        size=16,  # Define o tamanho da fonte
-    )
-    # Armazena o texto do tempo restante no controlador
-    controller.texto_tempo = score_text
-
-    # Adiciona os elementos à página
-    page.add(
-        ft.Column(
+            for i in range(MAX_OPCOES)
+        ]
+        # Cria a coluna com todos os elementos da tela
+        self.coluna = ft.Column(
             [
-                score_text,  # Texto do tempo restante
-                question_text,  # Texto da pergunta
-                *answer_buttons,  # Botões de resposta (desempacota a lista)
+                self.texto_tempo,  # Texto do tempo restante
+                self.texto_pergunta,  # Texto da pergunta
+                *self.botoes,  # Botões de resposta (desempacota a lista)
                 ft.ElevatedButton(
                     "Voltar ao Início",  # Botão "Voltar ao Início"
                     on_click=controller.voltar_ao_inicio,  # Define a função que será chamada ao clicar
@@ -183,34 +189,69 @@ def exibir_pergunta(
             alignment=ft.MainAxisAlignment.CENTER,  # Alinha os elementos ao centro verticalmente
             horizontal_alignment=ft.CrossAxisAlignment.CENTER,  # Alinha os elementos ao centro horizontalmente
         )
-    )
 
-    # Define a função que será executada em segundo plano para atualizar o tempo restante
-    def atualizar_tempo():
-        """Atualiza o tempo restante do quiz a cada segundo."""
-        # Verifica se o tempo restante é maior que 0 e se o quiz foi iniciado
-        if estado_quiz.tempo_restante > 0 and estado_quiz.quiz_iniciado:
-            # Decrementa o tempo restante em 1 segundo
-            estado_quiz.tempo_restante -= 1
-            # Calcula as horas, minutos e segundos restantes
-            horas, resto = divmod(estado_quiz.tempo_restante, 3600)
-            minutos, segundos = divmod(resto, 60)
-            # Atualiza o texto do tempo restante
-            score_text.value = (
-                f"Tempo restante: {horas:02d}:{minutos:02d}:{segundos:02d}"
-            )
-            # Atualiza a página
-            page.update()
-            # Agenda a próxima chamada da função atualizar_tempo() após 1 segundo
-            page.on_idle = lambda _: threading.Timer(1, atualizar_tempo).start()
-        else:
-            # Se o tempo acabar, reproduz o áudio de "acabar"
-            reproduzir_audio("acabar")
-            # Chama a função do controlador para finalizar o quiz
-            controller.finalizar_quiz(None)
+    def mostrar(self, pergunta: Pergunta, estado_quiz: EstadoQuiz):
+        """
+        Atualiza os controles com os dados de uma pergunta.
 
-    # Inicia a atualização do tempo
-    atualizar_tempo()
+        Args:
+            pergunta (Pergunta): A pergunta a ser exibida.
+            estado_quiz (EstadoQuiz): O estado atual do quiz.
+        """
+        self.texto_tempo.value = formatar_tempo(estado_quiz.tempo_restante)
+        # Define o texto da pergunta com base no estado atual do quiz
+        self.texto_pergunta.value = (
+            f"{estado_quiz.pergunta_atual + 1}. {pergunta.enunciado}"
+        )
+        # Atualiza cada botão com a opção correspondente, ocultando os que sobram
+        for i, botao in enumerate(self.botoes):
+            if pergunta.rotulos is not None:
+                # Rótulo já formatado na preparação da pergunta
+                rotulo = pergunta.rotulos[i] if i < len(pergunta.rotulos) else ""
+            else:
+                opcao = pergunta.opcoes[i] if i < len(pergunta.opcoes) else None
+                # Verifica se a opção é uma string e se não está vazia
+                rotulo = (
+                    f"{chr(ord('a') + i)}) {opcao}"
+                    if isinstance(opcao, str) and opcao.strip()
+                    else ""
+                )
+            botao.visible = bool(rotulo)
+            if botao.visible:
+                botao.text = rotulo  # Define o texto do botão com a letra da opção
+
+
+# Define a função para exibir uma pergunta do quiz
+def exibir_pergunta(
+    page: ft.Page, pergunta: Pergunta, estado_quiz: EstadoQuiz, controller
+):
+    """
+    Exibe uma pergunta do quiz com suas opções de resposta, reaprovei-
+    tando a tela de pergunta da sessão (ver TelaPergunta). A página só é
+    limpa quando a tela de pergunta ainda não está sendo exibida.
+
+    Args:
+        page (ft.Page): A página do Flet para exibir a pergunta.
+        pergunta (Pergunta): A pergunta a ser exibida.
+        estado_quiz (EstadoQuiz): O estado atual do quiz.
+        controller: O objeto controlador do quiz.
+    """
+    # Cria a tela de pergunta na primeira exibição da sessão
+    if controller.tela_pergunta is None:
+        controller.tela_pergunta = TelaPergunta(controller)
+    tela = controller.tela_pergunta
+
+    # Atualiza os controles com a nova pergunta
+    tela.mostrar(pergunta, estado_quiz)
+    # Armazena o texto do tempo restante no controlador
+    controller.texto_tempo = tela.texto_tempo
+
+    # Vindo de outra tela, limpa a página e adiciona a tela de pergunta;
+    # caso contrário, o page.update() do controlador envia só as diferenças
+    # (page.controls.clear() preserva o overlay, ao contrário de page.clean())
+    if tela.coluna not in page.controls:
+        page.controls.clear()
+        page.add(tela.coluna)
 
 
 # Define a função para exibir os resultados do quiz
@@ -229,6 +270,8 @@ def exibir_resultados(page: ft.Page, estado_quiz: EstadoQuiz, controller):
     total_acertos = estado_quiz.pontuacao
     # Calcula o número de erros
     total_erros = total_perguntas - total_acertos
+    # Revisões não têm nota de aprovação (são só as perguntas erradas antes)
+    em_revisao = controller.em_revisao
 
     # Verifica se o modal já está aberto
     if not controller.modal_aberto:
@@ -242,7 +285,9 @@ def exibir_resultados(page: ft.Page, estado_quiz: EstadoQuiz, controller):
         # Cria o AlertDialog para exibir os resultados
         dlg_modal = ft.AlertDialog(
             modal=True,  # Define o diálogo como modal
-            title=ft.Text("Fim do Quiz!"),  # Define o título do modal
+            title=ft.Text(
+                "Fim da revisão!" if em_revisao else "Fim do Quiz!"
+            ),  # Define o título do modal
             content=ft.Column(
                 [
                     ft.Text(
@@ -251,7 +296,8 @@ def exibir_resultados(page: ft.Page, estado_quiz: EstadoQuiz, controller):
                     ft.Text(f"Acertos: {total_acertos}"),  # Exibe o número de acertos
                     ft.Text(f"Erros: {total_erros}"),  # Exibe o número de erros
                     ft.Text(
-                        f"{'Aprovado!' if estado_quiz.pontuacao >= 32 else 'Reprovado.'}"
+                        f"{'Aprovado!' if estado_quiz.pontuacao >= 32 else 'Reprovado.'}",
+                        visible=not em_revisao,
                     ),  # Exibe se o usuário foi aprovado ou reprovado
                 ]
             ),
@@ -263,8 +309,12 @@ def exibir_resultados(page: ft.Page, estado_quiz: EstadoQuiz, controller):
             on_dismiss=close_dlg,  # Define a função que será chamada ao fechar o modal
         )
 
-        # Se a pontuação for menor que 32 (reprovado), adiciona um botão para baixar o Guia Scrum
-        if estado_quiz.pontuacao < 32:
+        # Se a pontuação for menor que 32 (reprovado), oferece a revisão das perguntas
+        # erradas (revisão espaçada, ver review.py) e um botão para baixar o Guia Scrum
+        if estado_quiz.pontuacao < 32 and not em_revisao:
+            dlg_modal.actions.append(
+                ft.ElevatedButton("Revisar erros", on_click=controller.iniciar_revisao)
+            )
             dlg_modal.actions.append(
                 ft.ElevatedButton(
                     "Baixar Guia Scrum",
@@ -274,19 +324,46 @@ def exibir_resultados(page: ft.Page, estado_quiz: EstadoQuiz, controller):
                 )
             )
 
-        # Adiciona o modal à página
+        # Adiciona o modal à página, descartando os diálogos de tentativas anteriores
+        controller.descartar_dialogos()
         page.overlay.append(dlg_modal)
         dlg_modal.open = True  # Abre o modal
         controller.modal_aberto = True  # Define a flag de modal aberto como True
         page.update()  # Atualiza a página
 
-    # Reproduz o áudio de acordo com a pontuação
+        # Reproduz o áudio de acordo com a pontuação
+        controller.reproduzir_audio(
+            "ganhou" if estado_quiz.pontuacao >= 32 or (em_revisao and not total_erros) else "perdeu"
+        )
+
+
+# Mensagens da tela de sessão encerrada, por motivo (ver sessions.py)
+MENSAGENS_ENCERRAMENTO = {
+    "ociosa": "Sua sessão foi encerrada por inatividade.",
+    "memoria": "Sua sessão foi encerrada para liberar recursos do servidor.",
+    "substituida": "Esta tentativa continuou em outra janela.",
+}
 
 
-# if estado_quiz.pontuacao >= 70:
-#    reproduzir_audio("ganhou")
-# else:
-#    reproduzir_audio("perdeu")
+# Define a função para exibir a tela de sessão encerrada
+def exibir_sessao_encerrada(page: ft.Page, motivo: str):
+    """
+    Substitui a tela pela mensagem de sessão encerrada.
+
+    Args:
+        page (ft.Page): A página do Flet da sessão.
+        motivo (str): O motivo do encerramento ("ociosa", "desconectada"...).
+    """
+    page.controls.clear()
+    page.add(
+        ft.Column(
+            [
+                ft.Text(MENSAGENS_ENCERRAMENTO.get(motivo, "Sua sessão foi encerrada."), size=18),
+                ft.Text("Recarregue a página para começar de novo."),
+            ],
+            horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+        )
+    )
 
 
 # Define a função para fazer o botão piscar em verde
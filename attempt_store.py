@@ -0,0 +1,271 @@
+"""
+Histórico persistente das tentativas do quiz (SQLite em modo WAL).
+
+As sessões nunca escrevem no banco diretamente: cada registro (início de
+tentativa, resposta, fim de tentativa) é apenas colocado em uma fila, o que
+custa microssegundos no clique. Uma única thread escritora esvazia a fila e
+grava tudo o que chegou em uma transação, no máximo a cada BATCH_INTERVAL
+segundos; assim, qualquer número de sessões simultâneas resulta em poucas
+transações por segundo.
+
+Tabelas:
+    attempts  (id, session_id, bank_hash, started_at, finished_at, score, total)
+    questions (key, text)  -- enunciados, uma vez por pergunta (ver question_key)
+    answers   (attempt_id, position, question_key, chosen, correct_option,
+               is_correct, elapsed, answered_at)
+
+As opções (chosen, correct_option) estão na ordem original do banco, e não
+na ordem embaralhada exibida; -1 indica sem resposta ou sem resposta válida.
+"""
+
+import atexit
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+
+import metrics
+from docs_parser import question_key
+
+# Arquivo do histórico de tentativas
+ATTEMPTS_DB = "quiz_attempts.db"
+
+# Intervalo mínimo (em segundos) entre duas transações da thread escritora
+BATCH_INTERVAL = 0.25
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS attempts (
+    id TEXT PRIMARY KEY,
+    session_id TEXT,
+    bank_hash TEXT,
+    started_at REAL NOT NULL,
+    finished_at REAL,
+    score INTEGER,
+    total INTEGER
+);
+CREATE TABLE IF NOT EXISTS questions (
+    key TEXT PRIMARY KEY,
+    text TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS answers (
+    attempt_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    question_key TEXT NOT NULL,
+    chosen INTEGER NOT NULL,
+    correct_option INTEGER NOT NULL,
+    is_correct INTEGER NOT NULL,
+    elapsed REAL NOT NULL,
+    answered_at REAL NOT NULL,
+    PRIMARY KEY (attempt_id, position)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS answers_question ON answers (question_key);
+CREATE INDEX IF NOT EXISTS attempts_finished ON attempts (finished_at);
+"""
+
+# Tipos de registro da fila
+_BEGIN, _ANSWER, _FINISH = range(3)
+
+
+class AttemptStore:
+    """
+    Histórico de tentativas com escrita assíncrona em lotes.
+
+    Os métodos begin_attempt(), record_answer() e finish_attempt() podem ser
+    chamados de qualquer thread e nunca acessam o disco.
+    """
+
+    def __init__(self, path: str = ATTEMPTS_DB, batch_interval: float = BATCH_INTERVAL):
+        """
+        Abre (ou cria) o histórico e inicia a thread escritora.
+
+        Args:
+            path (str): Caminho do arquivo SQLite.
+            batch_interval (float): Intervalo mínimo entre as transações.
+        """
+        self.path = path
+        self.batch_interval = batch_interval
+        self.transactions = 0  # Transações gravadas (para diagnóstico)
+        self._queue = queue.SimpleQueue()
+        self._pending = 0  # Registros enfileirados e ainda não gravados
+        self._pending_lock = threading.Condition()
+        self._connection = self._connect()
+        self._connection.executescript(SCHEMA)
+        self._thread = threading.Thread(target=self._write_loop, daemon=True)
+        self._thread.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Abre uma conexão em modo WAL (leitores não bloqueiam o escritor)."""
+        connection = sqlite3.connect(self.path, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        # Com WAL, NORMAL só arrisca as últimas transações em uma queda de energia
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    def _put(self, record: tuple):
+        """Enfileira um registro para a thread escritora."""
+        with self._pending_lock:
+            self._pending += 1
+        self._queue.put(record)
+
+    def begin_attempt(self, session_id: str = None, bank_hash: str = None) -> str:
+        """
+        Registra o início de uma tentativa.
+
+        Args:
+            session_id (str): O identificador da sessão Flet.
+            bank_hash (str): O hash do banco de perguntas usado.
+
+        Returns:
+            str: O identificador da tentativa (gerado sem acessar o banco).
+        """
+        attempt_id = uuid.uuid4().hex
+        self._put((_BEGIN, (attempt_id, session_id, bank_hash, time.time())))
+        return attempt_id
+
+    def record_answer(
+        self,
+        attempt_id: str,
+        position: int,
+        question_text: str,
+        chosen: int,
+        correct_option: int,
+        elapsed: float,
+    ):
+        """
+        Registra a resposta de uma pergunta.
+
+        Args:
+            attempt_id (str): O identificador da tentativa.
+            position (int): A posição da pergunta na tentativa.
+            question_text (str): O enunciado (a chave é calculada na escrita).
+            chosen (int): A opção escolhida, na ordem original do banco.
+            correct_option (int): A opção correta, na ordem original do banco.
+            elapsed (float): O tempo gasto na pergunta, em segundos.
+        """
+        self._put(
+            (
+                _ANSWER,
+                (attempt_id, position, question_text, chosen, correct_option, elapsed, time.time()),
+            )
+        )
+
+    def finish_attempt(self, attempt_id: str, score: int, total: int):
+        """
+        Registra o fim de uma tentativa.
+
+        Args:
+            attempt_id (str): O identificador da tentativa.
+            score (int): A pontuação final.
+            total (int): A quantidade de perguntas da tentativa.
+        """
+        self._put((_FINISH, (time.time(), score, total, attempt_id)))
+
+    def flush(self, timeout: float = None) -> bool:
+        """
+        Aguarda a gravação de todos os registros já enfileirados.
+
+        Args:
+            timeout (float): Tempo máximo de espera, em segundos.
+
+        Returns:
+            bool: True se a fila foi esvaziada.
+        """
+        with self._pending_lock:
+            return self._pending_lock.wait_for(lambda: self._pending == 0, timeout)
+
+    def read_connection(self) -> sqlite3.Connection:
+        """
+        Abre uma conexão separada para consultas (não disputa com a escrita).
+
+        Returns:
+            sqlite3.Connection: A nova conexão.
+        """
+        return self._connect()
+
+    def _write_loop(self):
+        """Laço da thread escritora: uma transação por lote de registros."""
+        while True:
+            records = [self._queue.get()]  # Aguarda o primeiro registro
+            # Acumula o que mais chegar durante o intervalo do lote
+            deadline = time.monotonic() + self.batch_interval
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    records.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._write_batch(records)
+            with self._pending_lock:
+                self._pending -= len(records)
+                self._pending_lock.notify_all()
+
+    def _write_batch(self, records: list):
+        """Grava um lote de registros em uma única transação."""
+        begins, questions, answers, finishes = [], {}, [], []
+        for kind, values in records:
+            if kind == _ANSWER:
+                attempt_id, position, text, chosen, correct_option, elapsed, answered_at = values
+                key = question_key(text)
+                questions[key] = text
+                answers.append(
+                    (
+                        attempt_id,
+                        position,
+                        key,
+                        chosen,
+                        correct_option,
+                        int(chosen == correct_option and chosen >= 0),
+                        elapsed,
+                        answered_at,
+                    )
+                )
+            elif kind == _BEGIN:
+                begins.append(values)
+            else:
+                finishes.append(values)
+        try:
+            with metrics.span("attempt_store_commit"), self._connection:
+                self._connection.executemany(
+                    "INSERT OR IGNORE INTO attempts (id, session_id, bank_hash, started_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    begins,
+                )
+                self._connection.executemany(
+                    "INSERT OR IGNORE INTO questions (key, text) VALUES (?, ?)",
+                    questions.items(),
+                )
+                self._connection.executemany(
+                    "INSERT OR REPLACE INTO answers VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    answers,
+                )
+                self._connection.executemany(
+                    "UPDATE attempts SET finished_at = ?, score = ?, total = ? WHERE id = ?",
+                    finishes,
+                )
+            self.transactions += 1
+        except sqlite3.Error as e:
+            # Um lote com erro é descartado; o quiz continua funcionando
+            print(f"Erro ao gravar o histórico de tentativas: {e}")
+
+
+_store = None  # Instância única do histórico no processo
+_store_lock = threading.Lock()
+
+
+def get_attempt_store() -> AttemptStore:
+    """
+    Retorna o histórico de tentativas do processo, abrindo-o na primeira
+    chamada (os registros pendentes são gravados ao encerrar o processo).
+
+    Returns:
+        AttemptStore: O histórico compartilhado.
+    """
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = AttemptStore()
+            atexit.register(_store.flush, 5)
+    return _store
@@ -1,47 +1,51 @@
 # Importa as bibliotecas necessárias
-import gspread  # Interage com o Google Sheets
-from oauth2client.service_account import ServiceAccountCredentials  # Autenticação com conta de serviço
-from googleapiclient.discovery import build  # Constrói serviços da API do Google
-from google.oauth2 import service_account  # Autenticação OAuth 2.0
+import random  # Jitter das esperas após falhas
 import time  # Pausas na execução
 import os  # Interação com o sistema operacional
 import traceback  # Rastreamento de exceções (erros)
 
-# Define as constantes para os arquivos de credenciais
-# Utiliza os.path.join para construir caminhos absolutos, tornando o código mais robusto
-SHEETS_CREDENTIALS_FILE = os.path.join(
-    os.path.dirname(__file__), "credentials_sheets.json"
-)  # Caminho para o arquivo de credenciais do Google Sheets
-DOCS_CREDENTIALS_FILE = os.path.join(
-    os.path.dirname(__file__), "credentials_docs.json"
-)  # Caminho para o arquivo de credenciais do Google Docs
-
-# Define os escopos de acesso para o Google Sheets e Google Docs
-# Especifica as permissões que o aplicativo precisa para interagir com as APIs
-SHEETS_SCOPES = [
-    "https://spreadsheets.google.com/feeds",  # Acesso aos dados da planilha
-    "https://www.googleapis.com/auth/drive",  # Acesso ao Google Drive (para abrir a planilha)
-]
-DOCS_SCOPES = [
-    "https://www.googleapis.com/auth/documents.readonly",  # Acesso de leitura ao Google Docs
-    "https://www.googleapis.com/auth/drive.readonly",  # Acesso de leitura ao Google Drive
-]
-
-# Define a URL da planilha e o ID do documento
+import metrics  # Medição dos trechos críticos
+from connectivity import get_connectivity  # Estado de conectividade do processo
+from docs_parser import parse_document, question_key  # Extração e chaves das perguntas
+
+# O google_api (gspread, google-auth, requests) é importado só dentro das
+# funções que acessam a rede: no modo offline ele nunca é carregado
+
+# Define a URL da planilha (o ID do documento fica em bank_registry.DOCUMENT_ID)
 SPREADSHEET_URL = "https://docs.google.com/spreadsheets/d/1Qg4BoRVHHniWdfibKovZr1x3ZuYHZ9pG9mmhNdZFmWM/edit?usp=sharing"  # URL da planilha
-DOCUMENT_ID = "1kQU6ElV41Y73Iiu6N1lOcfAoHaaWSNTqmOnOWBhifgg"  # ID do documento do Google Docs
 
 # Define o intervalo de verificação para alterações no Google Docs (em segundos)
 MONITORING_INTERVAL = 300  # 5 minutos
+# Limites do intervalo adaptativo: encurta quando o documento muda, alonga quando não muda
+MIN_MONITORING_INTERVAL = 60  # 1 minuto
+MAX_MONITORING_INTERVAL = 1800  # 30 minutos
+
+# Define a função para obter apenas o ID da revisão atual do documento
+def get_revision_id(document_id: str) -> str:
+    """
+    Obtém o ID da revisão atual do documento sem baixar o seu conteúdo
+    (requisição com máscara de campos).
+
+    Args:
+        document_id (str): O ID do documento do Google Docs.
+
+    Returns:
+        str: O ID da revisão atual.
+    """
+    from google_api import get_document  # Adiado: só quando há sincronização
+
+    return get_document(document_id, fields="revisionId")["revisionId"]
 
 
 # Define a função para extrair as perguntas do Google Docs
-def extract_questions_from_doc(document_id: str) -> list:
+def extract_questions_from_doc(document_id: str, document: dict = None) -> list:
     """
     Extrai perguntas e respostas de um documento do Google Docs.
 
     Args:
         document_id (str): O ID do documento do Google Docs.
+        document (dict): O documento já baixado, se disponível (evita
+            uma nova requisição).
 
     Returns:
         list: Uma lista de listas, onde cada sublista representa uma pergunta
@@ -49,64 +53,17 @@ def extract_questions_from_doc(document_id: str) -> list:
               ou None em caso de erro.
     """
     try:
-        # Carrega as credenciais da conta de serviço a partir do arquivo JSON
-        credentials = service_account.Credentials.from_service_account_file(
-            DOCS_CREDENTIALS_FILE, scopes=DOCS_SCOPES
-        )
-
-        # Constrói o serviço da API do Google Docs usando as credenciais
-        service = build("docs", "v1", credentials=credentials)
-
-        # Obtém o conteúdo do documento usando a API do Google Docs
-        document = service.documents().get(documentId=document_id).execute()
-        content = document.get("body").get("content")
-
-        questions = []  # Inicializa a lista para armazenar as perguntas
-        current_question = []  # Lista temporária para a pergunta atual
-        correct_answer = ""  # Variável para armazenar a resposta correta
-
-        # Itera sobre os elementos de conteúdo do documento
-        for item in content:
-            # Verifica se o elemento é um parágrafo
-            if "paragraph" in item:
-                elements = item.get("paragraph").get(
-                    "elements"
-                )  # Obtém os elementos do parágrafo
-                text = "".join(
-                    element["textRun"]["content"]
-                    for element in elements
-                    if "textRun" in element
-                ).strip()  # Extrai o texto do parágrafo, removendo espaços em branco
-
-                # Se o texto estiver vazio, continue para o próximo elemento
-                if not text:
-                    continue
-
-                # Verifica se o texto corresponde a uma opção de resposta (formato "(a) ...")
-                if len(text) > 2 and text[0].islower() and text[1] == ")":
-                    current_question.append(
-                        text[2:].strip()
-                    )  # Adiciona a opção de resposta à pergunta atual
-
-                    # Verifica se a opção de resposta está em negrito, indicando a resposta correta
-                    if "bold" in elements[0].get("textRun", {}).get("textStyle", {}):
-                        correct_answer = text[
-                            0
-                        ]  # Define a resposta correta com base na formatação em negrito
-                else:
-                    # Se o texto não for uma opção de resposta, significa que é uma nova pergunta
-                    if current_question:
-                        # Se já houver uma pergunta sendo processada, adiciona a resposta correta e a pergunta à lista de perguntas
-                        current_question.append(correct_answer)
-                        questions.append(current_question)
-                    # Inicia uma nova pergunta com o texto atual
-                    current_question = [text]
-                    correct_answer = ""  # Reinicia a resposta correta
-
-        # Adiciona a última pergunta à lista, se houver
-        if current_question:
-            current_question.append(correct_answer)
-            questions.append(current_question)
+        # Obtém o conteúdo do documento usando a API do Google Docs, se necessário
+        if document is None:
+            from google_api import get_document  # Adiado: só quando há sincronização
+
+            with metrics.span("docs_download"):
+                document = get_document(document_id)
+        # Extrai as perguntas em uma única passagem; problemas de formatação
+        # são registrados por pergunta, sem interromper a extração
+        with metrics.span("docs_extraction"):
+            questions, report = parse_document(document)
+        report.print()
 
         return questions  # Retorna a lista de perguntas extraídas
 
@@ -117,87 +74,260 @@ def extract_questions_from_doc(document_id: str) -> list:
         return None  # Retorna None para indicar que ocorreu um erro
 
 
+# Define o número de colunas de uma pergunta na planilha (pergunta, 4 opções, resposta e tópico)
+SHEET_COLUMNS = 7
+
+# Cabeçalho da planilha (linha 1)
+SHEET_HEADER = ["Pergunta", "a", "b", "c", "d", "Resposta", "Tópico"]
+
+# Cache das abas já autorizadas e abertas, por URL e nome da aba
+_sheets = {}
+
+
+# Define a função para obter a aba com o cliente compartilhado do processo
+def get_sheet(spreadsheet_url: str, worksheet: str = None):
+    """
+    Retorna uma aba da planilha, reutilizando o cliente autorizado
+    (ver google_api.get_sheets_client()).
+
+    Args:
+        spreadsheet_url (str): URL da planilha do Google Sheets.
+        worksheet (str): Nome da aba (None = a primeira aba).
+
+    Returns:
+        gspread.Worksheet: A aba da planilha.
+    """
+    key = (spreadsheet_url, worksheet)
+    if key not in _sheets:
+        from google_api import get_sheets_client  # Adiado: só quando há sincronização
+
+        spreadsheet = get_sheets_client().open_by_url(spreadsheet_url)
+        _sheets[key] = spreadsheet.worksheet(worksheet) if worksheet else spreadsheet.sheet1
+    return _sheets[key]
+
+
+# Define a função que formata uma pergunta como linha da planilha
+def format_row(question: list) -> list:
+    """
+    Formata uma pergunta extraída do Google Docs como linha da planilha.
+
+    Args:
+        question (list): A pergunta, suas opções e a resposta correta.
+
+    Returns:
+        list: A linha com as tags HTML removidas, com exatamente 7 colunas.
+    """
+    # Verifica se a pergunta tem pelo menos 4 opções de resposta
+    if len(question) < 5:
+        print(
+            f"Aviso: A pergunta '{question[0]}' tem menos de 4 opções de resposta. Verifique o Google Docs."
+        )
+    # Remove as tags HTML das perguntas e respostas
+    row = [item.replace("<b>", "").replace("</b>", "") for item in question]
+    # Descarta as colunas a mais: a escrita na planilha vai só até a coluna G,
+    # e uma linha maior faria a API rejeitar a sincronização inteira
+    if len(row) > SHEET_COLUMNS:
+        print(
+            f"Aviso: A pergunta '{row[0]}' tem {len(row)} colunas; as posteriores à "
+            f"{SHEET_COLUMNS}ª foram descartadas. Verifique o Google Docs."
+        )
+        del row[SHEET_COLUMNS:]
+    # Completa a pergunta com células vazias para garantir que tenha 7 colunas
+    row.extend([""] * (SHEET_COLUMNS - len(row)))
+    return row
+
+
+# Define a função que calcula as diferenças entre o Google Docs e a planilha
+def compute_sheet_delta(questions: list, sheet_rows: list) -> dict:
+    """
+    Calcula as inserções, atualizações e remoções necessárias para que a
+    planilha reflita as perguntas extraídas do Google Docs.
+
+    Args:
+        questions (list): Lista de perguntas extraídas do Google Docs.
+        sheet_rows (list): Linhas atuais da planilha, sem o cabeçalho.
+
+    Returns:
+        dict: "inserts" (linhas novas), "updates" (pares número da linha,
+              linha) e "deletes" (números das linhas a remover). Os números
+              de linha são os da planilha (a primeira pergunta está na linha 2).
+    """
+    # Indexa as perguntas do Google Docs pela chave (a primeira ocorrência vence)
+    desired = {}
+    for question in questions:
+        row = format_row(question)
+        desired.setdefault(question_key(row[0]), row)
+
+    updates = []
+    deletes = []
+    seen = set()
+    for index, current in enumerate(sheet_rows):
+        row_number = index + 2  # Ignora o cabeçalho (linha 1)
+        key = question_key(current[0]) if current else None
+        if key not in desired or key in seen:
+            # Pergunta removida do Google Docs (ou duplicada na planilha)
+            deletes.append(row_number)
+            continue
+        seen.add(key)
+        row = desired[key]
+        current = list(current[: len(row)])
+        current.extend([""] * (len(row) - len(current)))
+        if current != row:
+            updates.append((row_number, row))
+
+    inserts = [row for key, row in desired.items() if key not in seen]
+    return {"inserts": inserts, "updates": updates, "deletes": deletes}
+
+
+# Define a função que agrupa números de linha consecutivos
+def _group_contiguous(row_numbers: list) -> list:
+    """
+    Agrupa números de linha consecutivos em intervalos.
+
+    Args:
+        row_numbers (list): Números de linha em ordem crescente.
+
+    Returns:
+        list: Pares (primeira linha, última linha) de cada intervalo.
+    """
+    groups = []
+    for row_number in row_numbers:
+        if groups and groups[-1][1] == row_number - 1:
+            groups[-1][1] = row_number
+        else:
+            groups.append([row_number, row_number])
+    return [tuple(group) for group in groups]
+
+
+# Define a função que aplica as diferenças na planilha
+def apply_sheet_delta(sheet, delta: dict, row_count: int):
+    """
+    Aplica as diferenças na planilha com o menor número de escritas: as
+    linhas removidas são reaproveitadas pelas inserções, as atualizações de
+    linhas consecutivas são agrupadas em intervalos enviados em uma única
+    chamada batch_update, e as sobras são removidas de baixo para cima.
+
+    Args:
+        sheet (gspread.Worksheet): A aba da planilha.
+        delta (dict): As diferenças calculadas por compute_sheet_delta().
+        row_count (int): Quantidade de linhas de perguntas na planilha.
+    """
+    writes = dict(delta["updates"])
+    inserts = list(delta["inserts"])
+    deletes = list(delta["deletes"])
+
+    # Reaproveita as linhas removidas para as novas perguntas
+    while inserts and deletes:
+        writes[deletes.pop(0)] = inserts.pop(0)
+    # Acrescenta as novas perguntas restantes ao final da planilha
+    next_row = row_count + 2
+    for row in inserts:
+        writes[next_row] = row
+        next_row += 1
+
+    if writes:
+        last_column = chr(ord("A") + SHEET_COLUMNS - 1)
+        sheet.batch_update(
+            [
+                {
+                    "range": f"A{first}:{last_column}{last}",
+                    "values": [writes[r] for r in range(first, last + 1)],
+                }
+                for first, last in _group_contiguous(sorted(writes))
+            ]
+        )
+
+    # Remove as linhas restantes de baixo para cima, para não deslocar as demais
+    for first, last in reversed(_group_contiguous(deletes)):
+        sheet.delete_rows(first, last)
+
+
 # Define a função para escrever as perguntas na planilha do Google Sheets
-def write_to_spreadsheet(questions: list, spreadsheet_url: str):
+def write_to_spreadsheet(questions: list, spreadsheet_url: str, worksheet: str = None):
     """
-    Escreve as perguntas extraídas na planilha do Google Sheets.
+    Sincroniza as perguntas extraídas com a planilha do Google Sheets,
+    enviando apenas as inserções, atualizações e remoções necessárias.
 
     Args:
         questions (list): Lista de perguntas e respostas extraídas do Google Docs.
         spreadsheet_url (str): URL da planilha do Google Sheets.
+        worksheet (str): Nome da aba sincronizada (None = a primeira aba).
+
+    Returns:
+        dict: As diferenças aplicadas (ver compute_sheet_delta()), ou None em
+              caso de erro.
     """
     try:
-        # Carrega as credenciais da conta de serviço a partir do arquivo JSON
-        credentials = ServiceAccountCredentials.from_json_keyfile_name(
-            SHEETS_CREDENTIALS_FILE, scopes=SHEETS_SCOPES
-        )
-        # Autoriza o acesso à API do Google Sheets usando as credenciais
-        client = gspread.authorize(credentials)
-        # Abre a planilha especificada pela URL
-        sheet = client.open_by_url(spreadsheet_url).sheet1
-
-        # Obtém os valores da primeira coluna da planilha (onde estão as perguntas existentes)
-        existing_questions = sheet.col_values(1)[
-            1:
-        ]  # Ignora a primeira linha (cabeçalho)
-
-        new_questions = []  # Lista para armazenar as novas perguntas
-        # Itera sobre as perguntas extraídas do Google Docs
-        for question in questions:
-            question_text = question[0].replace("<b>", "").replace(
-                "</b>", ""
-            )  # Remove as tags HTML da pergunta
-            # Verifica se a pergunta já existe na planilha
-            if question_text not in existing_questions:
-                new_questions.append(
-                    question
-                )  # Adiciona a pergunta à lista de novas perguntas
-
-        # Se houver novas perguntas a serem adicionadas
-        if new_questions:
-            formatted_questions = (
-                []
-            )  # Lista para armazenar as perguntas formatadas para a planilha
-            # Itera sobre as novas perguntas
-            for question in new_questions:
-                # Verifica se a pergunta tem pelo menos 4 opções de resposta
-                if len(question) < 5:
-                    # Se a pergunta tiver menos de 4 opções de resposta, imprime um aviso
-                    print(
-                        f"Aviso: A pergunta '{question[0]}' tem menos de 4 opções de resposta. Verifique o Google Docs."
-                    )
-
-                # Remove as tags HTML das perguntas e respostas
-                question = [
-                    item.replace("<b>", "").replace("</b>", "") for item in question
-                ]
-                # Completa a pergunta com células vazias para garantir que tenha 6 colunas
-                question.extend([""] * (6 - len(question)))
-                # Adiciona a pergunta formatada à lista
-                formatted_questions.append(question)
-
-            # Define a linha a partir da qual as novas perguntas serão adicionadas
-            next_row = len(existing_questions) + 2
-            # Define o intervalo de células a serem atualizadas na planilha
-            update_range = f"A{next_row}:F{next_row + len(formatted_questions) - 1}"
-            # Atualiza a planilha com as novas perguntas formatadas
-            sheet.update(values=formatted_questions, range_name=update_range)
-
-            # Imprime uma mensagem informando quantas perguntas foram adicionadas
-            print(f"{len(formatted_questions)} novas perguntas adicionadas à planilha.")
+        sheet = get_sheet(spreadsheet_url, worksheet)
+        # Lê a planilha uma única vez (necessário para detectar edições feitas
+        # diretamente nela), ignorando a primeira linha (cabeçalho)
+        with metrics.span("sheet_download"):
+            values = sheet.get_all_values()
+        sheet_rows = values[1:]
+
+        # Planilhas antigas não têm a coluna do tópico no cabeçalho
+        if not values or values[0][:SHEET_COLUMNS] != SHEET_HEADER:
+            if values and any(values[0]):
+                # A linha 1 tem conteúdo do usuário: registra o que é substituído
+                print(f"Aviso: A linha 1 da planilha ({values[0]}) foi substituída pelo cabeçalho {SHEET_HEADER}.")
+            last_column = chr(ord("A") + SHEET_COLUMNS - 1)
+            sheet.batch_update([{"range": f"A1:{last_column}1", "values": [SHEET_HEADER]}])
+
+        delta = compute_sheet_delta(questions, sheet_rows)
+        if any(delta.values()):
+            with metrics.span("sheet_write"):
+                apply_sheet_delta(sheet, delta, len(sheet_rows))
+            # Imprime um resumo das alterações aplicadas
+            print(
+                f"Planilha sincronizada: {len(delta['inserts'])} inseridas, "
+                f"{len(delta['updates'])} atualizadas, {len(delta['deletes'])} removidas."
+            )
         else:
-            # Se não houver novas perguntas, imprime uma mensagem informando
-            print("Nenhuma nova pergunta encontrada.")
+            # Se não houver alterações, imprime uma mensagem informando
+            print("Nenhuma alteração encontrada.")
+        return delta
 
     except Exception as e:
         # Em caso de erro, imprime uma mensagem de erro e o traceback
         print(f"Erro ao escrever na planilha: {e}")
         traceback.print_exc()
+        return None
+
+
+# Define a função que sincroniza uma revisão do documento com a planilha
+def sync_document(document_id: str, spreadsheet_url: str, worksheet: str = None) -> str:
+    """
+    Baixa o documento, extrai as perguntas e as grava na planilha.
+
+    Args:
+        document_id (str): ID do documento do Google Docs.
+        spreadsheet_url (str): URL da planilha do Google Sheets.
+        worksheet (str): Aba que recebe as perguntas (None = a primeira aba).
+
+    Returns:
+        str: A revisão do documento gravada na planilha ("" se o documento
+             não a informa), ou None se a extração ou a escrita falhou.
+    """
+    from google_api import get_document  # Adiado: só quando há sincronização
+
+    # Baixa o documento uma única vez e o repassa ao extrator
+    with metrics.span("docs_download"):
+        document = get_document(document_id)
+    questions = extract_questions_from_doc(document_id, document)
+    if questions is None:
+        return None
+    if write_to_spreadsheet(questions, spreadsheet_url, worksheet) is None:
+        return None
+    # A revisão efetivamente baixada (pode ser mais nova que a verificada)
+    return document.get("revisionId", "")
 
 
 # Define a função para monitorar o Google Docs por alterações
 def monitor_google_docs(
-    document_id: str, spreadsheet_url: str, interval: int = MONITORING_INTERVAL
+    document_id: str,
+    spreadsheet_url: str,
+    interval: int = MONITORING_INTERVAL,
+    worksheet: str = None,
 ):
     """
     Monitora o Google Docs para alterações e atualiza a planilha do Google Sheets.
@@ -205,23 +335,27 @@ def monitor_google_docs(
     Args:
         document_id (str): ID do documento do Google Docs a ser monitorado.
         spreadsheet_url (str): URL da planilha do Google Sheets a ser atualizada.
-        interval (int): Intervalo de tempo (em segundos) para verificar alterações.
+        interval (int): Intervalo inicial (em segundos) entre as verificações.
+            É reduzido pela metade quando o documento muda e dobrado quando
+            não muda, entre MIN_MONITORING_INTERVAL e MAX_MONITORING_INTERVAL.
+        worksheet (str): Aba que recebe as perguntas do documento (None =
+            a primeira aba; ver bank_registry.BankSource.sync_worksheet).
     """
-    # Inicializa a variável para armazenar o ID da última revisão
+    # Inicializa a variável para armazenar o ID da última revisão sincronizada
     last_revision_id = None
+    # Falhas seguidas (as requisições já são repetidas em google_api.py)
+    failures = 0
     # Loop infinito para monitorar o documento continuamente
     while True:
         try:
-            # Carrega as credenciais da conta de serviço a partir do arquivo JSON
-            credentials = service_account.Credentials.from_service_account_file(
-                DOCS_CREDENTIALS_FILE, scopes=DOCS_SCOPES
-            )
-            # Constrói o serviço da API do Google Docs usando as credenciais
-            service = build("docs", "v1", credentials=credentials)
-            # Obtém o documento do Google Docs
-            document = service.documents().get(documentId=document_id).execute()
-            # Obtém o ID da revisão atual do documento
-            current_revision_id = document["revisionId"]
+            # Offline (segundo a sonda do processo): aguarda sem tentar a API
+            if not get_connectivity().is_online():
+                time.sleep(MIN_MONITORING_INTERVAL)
+                continue
+
+            # Obtém apenas o ID da revisão atual (sem o conteúdo do documento)
+            with metrics.span("docs_revision_check"):
+                current_revision_id = get_revision_id(document_id)
 
             # Verifica se o ID da revisão atual é diferente do ID da última revisão
             if current_revision_id != last_revision_id:
@@ -229,28 +363,38 @@ def monitor_google_docs(
                 print(
                     "Mudanças detectadas no Google Docs. Atualizando a planilha..."
                 )  # Imprime uma mensagem informando que o documento foi atualizado
-                # Extrai as perguntas do Google Docs usando a função extract_questions_from_doc()
-                questions = extract_questions_from_doc(document_id)
-                # Se a extração das perguntas for bem-sucedida
-                if questions is not None:
-                    # Escreve as perguntas na planilha do Google Sheets usando a função write_to_spreadsheet()
-                    write_to_spreadsheet(questions, spreadsheet_url)
-                # Atualiza o ID da última revisão para o ID da revisão atual
-                last_revision_id = current_revision_id
-
-            # Pausa a execução por um intervalo de tempo definido pelo parâmetro 'interval'
+                synced_revision_id = sync_document(document_id, spreadsheet_url, worksheet)
+                if synced_revision_id is None:
+                    # A revisão não é registrada: será sincronizada de novo
+                    # na próxima verificação (após a espera por falha abaixo)
+                    raise RuntimeError(f"revisão {current_revision_id} não sincronizada")
+                # A revisão baixada pode ser mais nova que a verificada
+                last_revision_id = synced_revision_id or current_revision_id
+                # O documento está mudando: verifica com mais frequência
+                interval = max(MIN_MONITORING_INTERVAL, interval // 2)
+            else:
+                # Nada mudou: espaça as verificações
+                interval = min(MAX_MONITORING_INTERVAL, interval * 2)
+
+            failures = 0
+            # Pausa a execução pelo intervalo atual (adaptativo)
             time.sleep(interval)
 
         except Exception as e:
             # Em caso de erro, imprime uma mensagem de erro e o traceback
             print(f"Erro ao monitorar o Google Docs: {e}")
             traceback.print_exc()
-            # Pausa a execução por 60 segundos (1 minuto) antes de tentar novamente
-            time.sleep(60)
+            # Aguarda antes de tentar novamente, com backoff exponencial e jitter
+            # (até MAX_MONITORING_INTERVAL)
+            failures += 1
+            delay = min(MAX_MONITORING_INTERVAL, MIN_MONITORING_INTERVAL * 2 ** min(failures - 1, 10))
+            time.sleep(delay / 2 + random.uniform(0, delay / 2))
 
 
 # Verifica se o script está sendo executado como principal
 if __name__ == "__main__":
     # Se o script estiver sendo executado como principal, chama a função monitor_google_docs()
-    # Passa o ID do documento, a URL da planilha e o intervalo de monitoramento como argumentos
+    # Passa o ID do documento e a URL da planilha do banco padrão como argumentos
+    from bank_registry import DOCUMENT_ID
+
     monitor_google_docs(DOCUMENT_ID, SPREADSHEET_URL)
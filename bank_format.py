@@ -0,0 +1,309 @@
+"""
+Formato binário indexado do banco de perguntas.
+
+Layout do arquivo (inteiros little-endian):
+
+    cabeçalho   magic "QZB1", versão (u16), reservado (u16),
+                número de registros n (u32), número de campos m (u32),
+                hash SHA-256 do conteúdo (32 bytes)
+    registros   n + 1 entradas u32: índice do primeiro campo de cada registro
+    campos      m + 1 entradas u32: deslocamento de cada campo na área de texto
+    texto       os campos concatenados, codificados em UTF-8
+
+Lido via mmap, o acesso a um registro só toca as entradas das tabelas e os
+bytes de texto desse registro.
+
+Um arquivo mapeado não pode ser substituído no Windows: cada atualização
+grava uma nova versão ao lado do arquivo base (quiz_bank.<hash>.bin, ver
+versioned_path()), e a versão anterior é apagada quando o seu
+mapeamento é liberado (ver BinaryBank.retire()).
+
+Uso como script:
+    python bank_format.py to-bin quiz_cache.json quiz_bank.bin
+    python bank_format.py to-json quiz_bank.bin quiz_cache.json
+"""
+
+from collections.abc import Sequence
+import glob
+import mmap
+import os
+import re
+import struct
+import sys
+import tempfile
+import weakref
+
+from question_cache import content_hash, read_cache, write_cache
+
+MAGIC = b"QZB1"
+FORMAT_VERSION = 1
+
+_HEADER = struct.Struct("<4sHHII32s")
+_RECORD = struct.Struct("<I")
+_FIELD = struct.Struct("<I")
+
+# Dígitos do hash do conteúdo no nome de uma versão do banco
+VERSION_DIGITS = 16
+_VERSION_PATTERN = re.compile(rf"\.[0-9a-f]{{{VERSION_DIGITS}}}$")
+
+
+def versioned_path(bank_file: str, digest: str) -> str:
+    """
+    Retorna o caminho da versão do banco com o conteúdo indicado.
+
+    Args:
+        bank_file (str): Caminho do arquivo base (ex.: "quiz_bank.bin").
+        digest (str): O hash do conteúdo da versão.
+
+    Returns:
+        str: O caminho da versão (ex.: "quiz_bank.0123456789abcdef.bin").
+    """
+    root, ext = os.path.splitext(bank_file)
+    return f"{root}.{digest[:VERSION_DIGITS]}{ext}"
+
+
+def bank_versions(bank_file: str) -> list:
+    """
+    Lista as versões gravadas do banco (sem o arquivo base).
+
+    Args:
+        bank_file (str): Caminho do arquivo base.
+
+    Returns:
+        list: Os caminhos das versões existentes.
+    """
+    root, ext = os.path.splitext(bank_file)
+    candidates = glob.glob(f"{glob.escape(root)}.*{glob.escape(ext)}")
+    return [
+        path
+        for path in candidates
+        if _VERSION_PATTERN.search(os.path.splitext(path)[0])
+        and os.path.splitext(path)[0][: -VERSION_DIGITS - 1] == root
+    ]
+
+
+def latest_bank_file(bank_file: str) -> str:
+    """
+    Retorna o arquivo mais recente entre o arquivo base e as suas versões.
+
+    Args:
+        bank_file (str): Caminho do arquivo base.
+
+    Returns:
+        str: O caminho mais recente, ou None se nenhum existir.
+    """
+    candidates = bank_versions(bank_file)
+    if os.path.exists(bank_file):
+        candidates.append(bank_file)
+    mtimes = {}
+    for path in candidates:
+        try:
+            mtimes[path] = os.path.getmtime(path)
+        except OSError:
+            pass  # Apagada por outro processo
+    return max(mtimes, key=mtimes.get) if mtimes else None
+
+
+def _release(mm, remove: list):
+    """Fecha o mapeamento e apaga os arquivos marcados (ver BinaryBank.retire())."""
+    mm.close()
+    for path in remove:
+        try:
+            os.remove(path)
+        except OSError:
+            pass  # Já apagado, ou ainda aberto por outro processo no Windows
+
+
+def write_bank(bank_file: str, all_questions, digest: str = None) -> str:
+    """
+    Grava o banco no formato binário, de forma atômica.
+
+    Args:
+        bank_file (str): Caminho do arquivo binário.
+        all_questions: O banco completo (lista de listas de strings).
+        digest (str): O hash do conteúdo, se já calculado.
+
+    Returns:
+        str: O hash do conteúdo gravado.
+    """
+    digest = digest or content_hash(all_questions)
+    record_table = [0]
+    field_table = [0]
+    blobs = []
+    text_size = 0
+    for question in all_questions:
+        for field in question:
+            data = field.encode("utf8")
+            blobs.append(data)
+            text_size += len(data)
+            field_table.append(text_size)
+        record_table.append(len(field_table) - 1)
+
+    directory = os.path.dirname(os.path.abspath(bank_file))
+    fd, temp_path = tempfile.mkstemp(
+        prefix=".quiz_bank.", suffix=".tmp", dir=directory
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(
+                _HEADER.pack(
+                    MAGIC,
+                    FORMAT_VERSION,
+                    0,
+                    len(record_table) - 1,
+                    len(field_table) - 1,
+                    bytes.fromhex(digest),
+                )
+            )
+            f.write(struct.pack(f"<{len(record_table)}I", *record_table))
+            f.write(struct.pack(f"<{len(field_table)}I", *field_table))
+            f.writelines(blobs)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, bank_file)  # Troca atômica do arquivo
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+    return digest
+
+
+class BinaryBank(Sequence):
+    """
+    Banco de perguntas somente leitura sobre um arquivo binário mapeado em
+    memória. Cada registro é decodificado apenas quando acessado. O
+    mapeamento é liberado por close() ou quando o objeto deixa de ser
+    referenciado (nenhuma QuestionSample aponta mais para ele).
+    """
+
+    def __init__(self, bank_file: str):
+        """
+        Abre e mapeia o arquivo binário.
+
+        Args:
+            bank_file (str): Caminho do arquivo binário.
+
+        Raises:
+            ValueError: Se o arquivo não estiver no formato esperado ou
+                estiver truncado (ex.: gravação interrompida).
+        """
+        self.bank_file = bank_file
+        with open(bank_file, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            n_records, n_fields, digest = self._check_layout()
+        except ValueError as e:
+            self._mm.close()
+            raise ValueError(f"Arquivo de banco inválido ({e}): {bank_file}") from None
+        self._remove = []  # Arquivos a apagar na liberação (ver retire())
+        self._finalizer = weakref.finalize(self, _release, self._mm, self._remove)
+        self._n_records = n_records
+        self._records_offset = _HEADER.size
+        self._fields_offset = self._records_offset + (n_records + 1) * _RECORD.size
+        self._text_offset = self._fields_offset + (n_fields + 1) * _FIELD.size
+        self.content_hash = digest.hex()
+
+    def _check_layout(self) -> tuple:
+        """
+        Confere o cabeçalho e os limites das tabelas antes de qualquer leitura.
+
+        Returns:
+            tuple: (número de registros, número de campos, hash do conteúdo).
+
+        Raises:
+            ValueError: Se o arquivo não corresponder ao layout.
+        """
+        mm = self._mm
+        if len(mm) < _HEADER.size:
+            raise ValueError("cabeçalho incompleto")
+        magic, version, _, n_records, n_fields, digest = _HEADER.unpack_from(mm, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError("formato desconhecido")
+        fields_offset = _HEADER.size + (n_records + 1) * _RECORD.size
+        text_offset = fields_offset + (n_fields + 1) * _FIELD.size
+        if text_offset > len(mm):
+            raise ValueError("tabelas incompletas")
+        # As tabelas são crescentes: basta conferir as últimas entradas
+        (last_field,) = _RECORD.unpack_from(mm, fields_offset - _RECORD.size)
+        (text_size,) = _FIELD.unpack_from(mm, text_offset - _FIELD.size)
+        if last_field != n_fields or text_offset + text_size != len(mm):
+            raise ValueError("tamanho diferente do indicado nas tabelas")
+        return n_records, n_fields, digest
+
+    def __len__(self):
+        return self._n_records
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self._n_records))]
+        if i < 0:
+            i += self._n_records
+        if not 0 <= i < self._n_records:
+            raise IndexError("índice de pergunta fora do intervalo")
+        mm = self._mm
+        first, last = struct.unpack_from(
+            "<II", mm, self._records_offset + i * _RECORD.size
+        )
+        offsets = struct.unpack_from(
+            f"<{last - first + 1}I", mm, self._fields_offset + first * _FIELD.size
+        )
+        base = self._text_offset
+        return tuple(
+            mm[base + start : base + end].decode("utf8")
+            for start, end in zip(offsets, offsets[1:])
+        )
+
+    def retire(self):
+        """Marca o arquivo para ser apagado quando o mapeamento for liberado."""
+        self._remove.append(self.bank_file)
+
+    def close(self):
+        """Libera o mapeamento do arquivo."""
+        self._finalizer()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def json_to_bank(cache_file: str, bank_file: str) -> str:
+    """
+    Converte o cache JSON (lista de listas, com ou sem cabeçalho) para o
+    formato binário.
+
+    Args:
+        cache_file (str): Caminho do cache JSON.
+        bank_file (str): Caminho do arquivo binário a gravar.
+
+    Returns:
+        str: O hash do conteúdo convertido.
+    """
+    data = read_cache(cache_file)
+    return write_bank(bank_file, data["questions"], data["hash"])
+
+
+def bank_to_json(bank_file: str, cache_file: str) -> str:
+    """
+    Converte o formato binário de volta para o cache JSON.
+
+    Args:
+        bank_file (str): Caminho do arquivo binário.
+        cache_file (str): Caminho do cache JSON a gravar.
+
+    Returns:
+        str: O hash do conteúdo convertido.
+    """
+    with BinaryBank(bank_file) as bank:
+        questions = list(bank)
+        digest = bank.content_hash
+    write_cache(cache_file, questions)
+    return digest
+
+
+if __name__ == "__main__":
+    commands = {"to-bin": json_to_bank, "to-json": bank_to_json}
+    if len(sys.argv) != 4 or sys.argv[1] not in commands:
+        print(__doc__)
+        sys.exit(1)
+    print(commands[sys.argv[1]](sys.argv[2], sys.argv[3]))
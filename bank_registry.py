@@ -0,0 +1,367 @@
+"""
+Registro dos bancos de perguntas (um por certificação).
+
+Cada banco vem de uma planilha do Google Sheets, com uma ou mais abas, e
+tem o seu próprio cache e banco binário. A lista de bancos é lida de
+BANKS_FILE, se existir; caso contrário, apenas o banco do SFPC é servido.
+Exemplo de BANKS_FILE:
+
+    [
+        {"name": "sfpc", "title": "Scrum Foundation (SFPC)",
+         "spreadsheet_url": "https://docs.google.com/...",
+         "document_id": "1kQU6..."},
+        {"name": "kmp", "title": "Kanban (KMP)",
+         "spreadsheet_url": "https://docs.google.com/...",
+         "worksheets": ["Fundamentos", "Métricas"]}
+    ]
+
+Um documento do Google Docs é sincronizado com uma única aba: um banco com
+"document_id" tem no máximo uma aba em "worksheets" (a aba que recebe as
+perguntas do documento; sem "worksheets", a primeira aba).
+
+Todas as abas de todos os bancos são baixadas em paralelo por um pool de
+threads limitado (MAX_PARALLEL_FETCHES), com um único cliente autorizado
+(ver google_api.get_sheets_client()). Assim, uma atualização completa
+leva o tempo da aba mais lenta, e não a soma de todas.
+
+No modo offline (ver offline_mode()), os bancos são servidos apenas dos
+arquivos locais, de preferência o banco binário pré-compilado
+(python bank_format.py to-bin quiz_cache.json quiz_bank.bin), sem
+download nem atualização agendada. Sem o binário, ele é compilado na
+primeira carga a partir do cache (local ou empacotado com o código, como o
+quiz_cache.json do repositório; ver build_offline_bank()). As bibliotecas
+do Google e o requests nem chegam a ser importados.
+"""
+
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+import metrics
+from bank_format import json_to_bank, latest_bank_file
+from question_bank import (
+    BANK_FILE,
+    CACHE_FILE,
+    REFRESH_INTERVAL,
+    SPREADSHEET_URL,
+    QuestionBank,
+)
+
+# Arquivo opcional com a lista de bancos (ver o exemplo acima)
+BANKS_FILE = "banks.json"
+
+# Documento do Google Docs sincronizado com a planilha do banco padrão
+DOCUMENT_ID = "1kQU6ElV41Y73Iiu6N1lOcfAoHaaWSNTqmOnOWBhifgg"
+
+# Downloads de abas simultâneos, somando todos os bancos
+MAX_PARALLEL_FETCHES = 8
+
+# Diretório do código: os bancos empacotados com o aplicativo ficam aqui
+BUNDLE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Credenciais do Google Sheets (o mesmo arquivo de google_api.py, que não é
+# importado aqui para não carregar as bibliotecas do Google)
+CREDENTIALS_FILE = os.path.join(BUNDLE_DIR, "credentials_sheets.json")
+
+
+def offline_mode() -> bool:
+    """
+    Indica se o processo deve rodar sem sincronização com o Google.
+
+    QUIZ_OFFLINE=1 (ou "true"/"yes") força o modo offline e QUIZ_OFFLINE=0
+    o desliga. Sem a variável, o modo offline é usado quando não há
+    credenciais do Google Sheets nem GOOGLE_API_ENDPOINT definido.
+
+    Returns:
+        bool: True no modo offline.
+    """
+    value = os.environ.get("QUIZ_OFFLINE", "").strip().lower()
+    if value:
+        return value in ("1", "true", "yes", "on")
+    return not (
+        os.path.exists(CREDENTIALS_FILE)
+        or os.environ.get("GOOGLE_API_ENDPOINT")
+        or os.environ.get("DOCS_API_ENDPOINT")
+    )
+
+
+def bundled_path(path: str) -> str:
+    """
+    Retorna o arquivo local, se existir, ou a cópia empacotada com o código.
+
+    Args:
+        path (str): O caminho do cache ou do banco binário.
+
+    Returns:
+        str: O caminho a usar.
+    """
+    bundled = os.path.join(BUNDLE_DIR, os.path.basename(path))
+    if not os.path.exists(path) and os.path.exists(bundled):
+        return bundled
+    return path
+
+
+def build_offline_bank(bank: QuestionBank) -> bool:
+    """
+    Compila o banco binário a partir do cache JSON quando ele ainda não
+    existe (primeira execução offline), para que o banco seja servido via
+    mmap e não carregado inteiro na memória.
+
+    Args:
+        bank (QuestionBank): O banco, ainda não carregado.
+
+    Returns:
+        bool: True se o banco binário foi gravado.
+    """
+    if not bank.bank_file or latest_bank_file(bank.bank_file) is not None:
+        return False
+    if not os.path.exists(bank.cache_file):
+        return False
+    try:
+        json_to_bank(bank.cache_file, bank.bank_file)
+    except (OSError, ValueError) as e:
+        # Segue com o cache JSON (ver QuestionBank.load())
+        print(f"Erro ao compilar o banco binário {bank.bank_file}: {e}")
+        return False
+    return True
+
+
+@dataclass(frozen=True)
+class BankSource:
+    """Origem e arquivos locais de um banco de perguntas."""
+
+    name: str  # Identificador curto (usado nos nomes dos arquivos)
+    title: str  # Nome exibido na tela inicial
+    spreadsheet_url: str
+    worksheets: tuple = ()  # Abas com perguntas (vazio = primeira aba)
+    document_id: str = None  # Documento do Google Docs sincronizado com a planilha
+    cache_file: str = None  # Padrão: quiz_cache_<name>.json
+    bank_file: str = None  # Padrão: quiz_bank_<name>.bin
+
+    def __post_init__(self):
+        # A sincronização regrava a aba inteira com o documento: com mais de
+        # uma aba, as perguntas das demais seriam duplicadas no banco
+        if self.document_id and len(self.worksheets) > 1:
+            raise ValueError(
+                f"banco {self.name!r}: um documento do Google Docs é sincronizado "
+                f"com uma única aba, mas há {len(self.worksheets)} em worksheets"
+            )
+
+    @property
+    def sync_worksheet(self) -> str:
+        """str: A aba que recebe as perguntas do documento (None = a primeira aba)."""
+        return self.worksheets[0] if self.worksheets else None
+
+    def create_bank(
+        self, refresh_interval: int = REFRESH_INTERVAL, bundled: bool = False
+    ) -> QuestionBank:
+        """
+        Cria o banco (vazio) desta origem.
+
+        Args:
+            refresh_interval (int): Intervalo entre atualizações agendadas.
+            bundled (bool): Usa as cópias empacotadas com o código quando os
+                arquivos locais não existem (só leitura: modo offline).
+
+        Returns:
+            QuestionBank: O banco, ainda não carregado.
+        """
+        cache_file = self.cache_file or f"quiz_cache_{self.name}.json"
+        bank_file = self.bank_file or f"quiz_bank_{self.name}.bin"
+        if bundled:
+            cache_file, bank_file = bundled_path(cache_file), bundled_path(bank_file)
+        return QuestionBank(
+            spreadsheet_url=self.spreadsheet_url,
+            cache_file=cache_file,
+            refresh_interval=refresh_interval,
+            bank_file=bank_file,
+            worksheets=self.worksheets,
+        )
+
+
+# Banco servido quando não há BANKS_FILE (mantém os arquivos de sempre)
+DEFAULT_SOURCES = (
+    BankSource(
+        name="sfpc",
+        title="Scrum Foundation (SFPC)",
+        spreadsheet_url=SPREADSHEET_URL,
+        document_id=DOCUMENT_ID,
+        cache_file=CACHE_FILE,
+        bank_file=BANK_FILE,
+    ),
+)
+
+
+def load_sources(path: str = BANKS_FILE) -> tuple:
+    """
+    Lê a lista de bancos do arquivo de configuração.
+
+    Args:
+        path (str): O arquivo JSON com a lista de bancos.
+
+    Returns:
+        tuple: As origens (BankSource); DEFAULT_SOURCES sem o arquivo.
+    """
+    if not os.path.exists(path):
+        return DEFAULT_SOURCES
+    with open(path, encoding="utf8") as f:
+        entries = json.load(f)
+    return tuple(
+        BankSource(**{**entry, "worksheets": tuple(entry.get("worksheets", ()))})
+        for entry in entries
+    )
+
+
+class BankRegistry:
+    """
+    Bancos de perguntas do processo, com atualização agendada conjunta.
+    """
+
+    def __init__(
+        self, sources=(), refresh_interval: int = REFRESH_INTERVAL, offline: bool = False
+    ):
+        """
+        Cria os bancos (vazios até a chamada de load()).
+
+        Args:
+            sources: As origens dos bancos, na ordem de exibição.
+            refresh_interval (int): Intervalo entre as atualizações agendadas.
+            offline (bool): Serve apenas os arquivos locais, sem sincronização.
+        """
+        self.refresh_interval = refresh_interval
+        self.offline = offline
+        self.sources = {}  # Nome -> BankSource
+        self.banks = {}  # Nome -> QuestionBank
+        # Pool compartilhado pelos downloads de abas de todos os bancos
+        self.fetch_pool = ThreadPoolExecutor(
+            MAX_PARALLEL_FETCHES, thread_name_prefix="sheet-fetch"
+        )
+        self._stop = threading.Event()
+        self.refresh_thread = None
+        for source in sources:
+            self.add(source)
+
+    def __len__(self):
+        return len(self.banks)
+
+    def add(self, source: BankSource, bank: QuestionBank = None):
+        """
+        Registra um banco.
+
+        Args:
+            source (BankSource): A origem do banco.
+            bank (QuestionBank): O banco já criado (None = criado a partir da origem).
+        """
+        self.sources[source.name] = source
+        self.banks[source.name] = bank or source.create_bank(
+            self.refresh_interval, bundled=self.offline
+        )
+
+    def get(self, name: str = None) -> QuestionBank:
+        """
+        Retorna um banco pelo nome.
+
+        Args:
+            name (str): O nome do banco (None = o primeiro registrado).
+
+        Returns:
+            QuestionBank: O banco.
+
+        Raises:
+            KeyError: Se não houver banco com esse nome.
+        """
+        if name is None:
+            name = next(iter(self.banks))
+        return self.banks[name]
+
+    def choices(self) -> list:
+        """
+        Returns:
+            list: (nome, título) de cada banco, na ordem de registro.
+        """
+        return [(name, source.title) for name, source in self.sources.items()]
+
+    def _each_bank(self, method) -> dict:
+        """Executa method(banco) em todos os bancos ao mesmo tempo."""
+        with ThreadPoolExecutor(max(1, len(self.banks))) as pool:
+            return dict(zip(self.banks, pool.map(method, self.banks.values())))
+
+    def load(self):
+        """Carrega todos os bancos (cache primeiro), em paralelo."""
+        if self.offline:
+            self._each_bank(build_offline_bank)
+        self._each_bank(lambda bank: bank.load(download=not self.offline))
+
+    def refresh_all(self) -> dict:
+        """
+        Atualiza todos os bancos a partir do Google Sheets. As abas de todos
+        eles são baixadas ao mesmo tempo pelo pool compartilhado.
+
+        Returns:
+            dict: Nome -> True se o banco foi atualizado.
+        """
+        return self._each_bank(lambda bank: bank.refresh(self.fetch_pool))
+
+    def start_scheduled_refresh(self):
+        """Inicia a thread que atualiza todos os bancos periodicamente."""
+        if self.offline:
+            return  # Sem sincronização no modo offline
+        if self.refresh_thread is None:
+            self.refresh_thread = threading.Thread(
+                target=self._refresh_loop, daemon=True
+            )
+            self.refresh_thread.start()
+
+    def stop_scheduled_refresh(self):
+        """Interrompe a thread de atualização agendada."""
+        self._stop.set()
+
+    def _refresh_loop(self):
+        """Atualiza os bancos imediatamente e, depois, a cada intervalo."""
+        while not self._stop.is_set():
+            self.refresh_all()
+            self._stop.wait(self.refresh_interval)
+
+
+_registry = None  # Registro único de bancos no processo
+_registry_lock = threading.Lock()
+
+# Arquivos binários inválidos (ex.: truncados) encontrados desde o início do processo
+metrics.register_gauge(
+    "bank_files_rejected",
+    lambda: sum(bank.rejected_files for bank in _registry.banks.values()) if _registry else 0,
+)
+
+
+def get_bank_registry() -> BankRegistry:
+    """
+    Retorna o registro de bancos do processo, carregando os bancos e
+    iniciando a atualização agendada na primeira chamada (exceto no modo
+    offline).
+
+    Returns:
+        BankRegistry: O registro compartilhado.
+    """
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            registry = BankRegistry(load_sources(), offline=offline_mode())
+            registry.load()
+            registry.start_scheduled_refresh()
+            _registry = registry
+    return _registry
+
+
+def get_question_bank(name: str = None) -> QuestionBank:
+    """
+    Retorna um banco de perguntas compartilhado do processo.
+
+    Args:
+        name (str): O nome do banco (None = o primeiro registrado).
+
+    Returns:
+        QuestionBank: O banco compartilhado.
+    """
+    return get_bank_registry().get(name)
@@ -0,0 +1,88 @@
+"""
+Benchmark do módulo de estatísticas por pergunta (analytics.py).
+
+Gera um histórico sintético no esquema do attempt_store (tentativas de 40
+perguntas, com alunos de habilidades diferentes) e mede a agregação
+completa e a incremental, que processa só as tentativas novas.
+
+Uso:
+    python benchmarks/bench_analytics.py [quantidade de respostas]
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir)))
+
+import analytics  # noqa: E402
+from attempt_store import SCHEMA  # noqa: E402
+
+PERGUNTAS_BANCO = 1000
+PERGUNTAS_TENTATIVA = 40
+
+
+def gerar_historico(conexao, n_tentativas: int, inicio: int, finalizadas_em: float):
+    """Grava n tentativas sintéticas finalizadas no instante informado."""
+    rng = np.random.default_rng(inicio)
+    dificuldade = np.linspace(-2, 2, PERGUNTAS_BANCO)  # Pergunta i: cada vez mais difícil
+    tentativas, respostas = [], []
+    for t in range(inicio, inicio + n_tentativas):
+        habilidade = rng.normal()
+        perguntas = rng.choice(PERGUNTAS_BANCO, PERGUNTAS_TENTATIVA, replace=False)
+        acerto = rng.random(PERGUNTAS_TENTATIVA) < 1 / (1 + np.exp(dificuldade[perguntas] - habilidade))
+        escolha = np.where(acerto, 0, rng.integers(1, 4, PERGUNTAS_TENTATIVA))
+        tempo = rng.lognormal(3, 0.5, PERGUNTAS_TENTATIVA)
+        tentativas.append((f"t{t}", finalizadas_em, int(acerto.sum()), PERGUNTAS_TENTATIVA))
+        respostas.extend(
+            (f"t{t}", p, f"q{perguntas[p]:04d}", int(escolha[p]), 0, int(acerto[p]), float(tempo[p]), 0.0)
+            for p in range(PERGUNTAS_TENTATIVA)
+        )
+    with conexao:
+        conexao.executemany(
+            "INSERT INTO attempts (id, finished_at, score, total, started_at) VALUES (?, ?, ?, ?, 0)",
+            tentativas,
+        )
+        conexao.executemany("INSERT INTO answers VALUES (?, ?, ?, ?, ?, ?, ?, ?)", respostas)
+
+
+def main():
+    n_respostas = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+    n_tentativas = n_respostas // PERGUNTAS_TENTATIVA
+    with tempfile.TemporaryDirectory() as diretorio:
+        conexao = sqlite3.connect(os.path.join(diretorio, "historico.db"))
+        conexao.executescript(SCHEMA)
+        agora = time.time()
+        gerar_historico(conexao, n_tentativas, 0, agora - 3600)
+
+        stats = analytics.ItemStatistics()
+        inicio = time.perf_counter()
+        processadas = analytics.update(stats, conexao, now=agora)
+        estatisticas = stats.statistics()
+        tempo_completo = time.perf_counter() - inicio
+        print(f"Completa: {processadas} respostas em {tempo_completo:.2f} s")
+
+        # Uma "noite" depois: 1% de tentativas novas
+        estado = os.path.join(diretorio, "estado.npz")
+        stats.save(estado)
+        gerar_historico(conexao, n_tentativas // 100, n_tentativas, agora + 10)
+        stats = analytics.ItemStatistics.load(estado)
+        inicio = time.perf_counter()
+        processadas = analytics.update(stats, conexao, now=agora + 3600)
+        stats.statistics()
+        print(f"Incremental: {processadas} respostas em {time.perf_counter() - inicio:.2f} s")
+
+        faceis, dificeis = estatisticas["q0000"], estatisticas[f"q{PERGUNTAS_BANCO - 1:04d}"]
+        print(
+            f"Pergunta mais fácil: p={faceis['p_value']} disc={faceis['discrimination']} "
+            f"mediana={faceis['median_time']} s | mais difícil: p={dificeis['p_value']} "
+            f"disc={dificeis['discrimination']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
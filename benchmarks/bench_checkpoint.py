@@ -0,0 +1,133 @@
+"""
+Benchmark dos pontos de retomada das tentativas (checkpoint.py).
+
+Mede:
+    - o custo de cada registro gravado (pergunta exibida e resposta);
+    - o tamanho do arquivo de uma tentativa completa;
+    - o tempo de retomada: leitura do arquivo e reconstrução da tentativa
+      (QuizLogic.restore), e a retomada completa em uma nova sessão.
+
+Uso:
+    python benchmarks/bench_checkpoint.py [repetições]
+"""
+
+import os
+import statistics
+import sys
+import tempfile
+import time
+import types
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, os.path.dirname(__file__))
+
+import flet as ft  # noqa: E402
+
+import app.controllers as controllers  # noqa: E402
+import attempt_store  # noqa: E402
+import checkpoint  # noqa: E402
+import review  # noqa: E402
+from bank_registry import get_question_bank  # noqa: E402
+from docs_parser import question_key  # noqa: E402
+from fake_flet import criar_pagina  # noqa: E402
+from quiz_logic import QuizLogic  # noqa: E402
+
+
+def mediana_us(amostras: list) -> float:
+    """Mediana das amostras (segundos), em microssegundos."""
+    return statistics.median(amostras) * 1e6
+
+
+def aguardar(condicao):
+    """Aguarda a condição (a próxima pergunta é exibida em outra thread)."""
+    while not condicao():
+        time.sleep(0.0005)
+
+
+def responder(controller, quantidade: int = None):
+    """
+    Responde quantidade perguntas da sessão (todas, se None, aguardando o
+    fim da tentativa).
+    """
+    total = len(controller.quiz_logic.questions) if quantidade is None else quantidade
+    for i in range(total):
+        aguardar(lambda: controller.pergunta_exibida is not None)
+        controller.verificar_resposta(types.SimpleNamespace(control=controller.tela_pergunta.botoes[i % 4]))
+    if quantidade is None:
+        aguardar(lambda: controller.estado_quiz.quiz_finalizado)
+
+
+def nova_sessao(armazenamento: dict = None):
+    """Cria uma sessão na conexão falsa e aguarda a identificação do aprendiz."""
+    page = criar_pagina()
+    if armazenamento is not None:
+        page.conexao_falsa.armazenamento = armazenamento
+    controller = controllers.QuizController(page, ft.Switch(), True)
+    controller.revisao_carregada.wait()
+    return controller, page
+
+
+def main():
+    repeticoes = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    controllers.ATRASO_FEEDBACK = 0
+    diretorio = tempfile.mkdtemp(prefix="quiz-checkpoint-")
+    checkpoint.CHECKPOINT_DIR = os.path.join(diretorio, "attempt_state")
+    review.REVIEW_DIR = os.path.join(diretorio, "review_state")
+    attempt_store._store = attempt_store.AttemptStore(os.path.join(diretorio, "quiz_attempts.db"))
+
+    # Custo de cada registro
+    ponto = checkpoint.AttemptCheckpoint(os.path.join(diretorio, "bench.bin"))
+    chave = question_key("Pergunta de exemplo")
+    ponto.begin("sfpc", time.time() + 3600, [chave] * 40, "0" * 32)
+    exibidas, respostas = [], []
+    for i in range(repeticoes * 50):
+        inicio = time.perf_counter()
+        ponto.shown(i % 40, chave, (2, 0, 3, 1))
+        meio = time.perf_counter()
+        ponto.answer(i % 40, i % 4, i % 2 == 0)
+        exibidas.append(meio - inicio)
+        respostas.append(time.perf_counter() - meio)
+    ponto.close()
+    print(f"Registro de pergunta exibida: {mediana_us(exibidas):.1f} µs | resposta: {mediana_us(respostas):.1f} µs")
+
+    # Tamanho do arquivo de uma tentativa completa, em uma sessão
+    controller, page = nova_sessao()
+    controller.iniciar_quiz(None)
+    responder(controller)
+    print(f"Arquivo de uma tentativa completa: {os.path.getsize(controller.checkpoint.path)} bytes")
+
+    # Retomada: tentativa interrompida na metade
+    controller.voltar_ao_inicio(None)
+    controller.iniciar_quiz(None)
+    responder(controller, 20)
+    aguardar(lambda: controller.pergunta_exibida is not None)
+    bank = get_question_bank()
+    leituras, reconstrucoes = [], []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        instantaneo = controller.checkpoint.load()
+        meio = time.perf_counter()
+        logica = QuizLogic(bank)
+        logica.restore(
+            instantaneo.keys, instantaneo.shown, [acertou for _, acertou in instantaneo.answers]
+        )
+        reconstrucoes.append(time.perf_counter() - meio)
+        leituras.append(meio - inicio)
+    print(
+        f"Retomada ({len(instantaneo.answers)} respostas, {os.path.getsize(controller.checkpoint.path)} bytes): "
+        f"leitura {mediana_us(leituras):.0f} µs + reconstrução {mediana_us(reconstrucoes):.0f} µs"
+    )
+
+    # Retomada completa em uma nova sessão (recarga da página)
+    inicio = time.perf_counter()
+    nova, _ = nova_sessao(page.conexao_falsa.armazenamento)
+    aguardar(lambda: nova.pergunta_exibida is not None)
+    print(
+        f"Nova sessão até a pergunta retomada na tela: {(time.perf_counter() - inicio) * 1000:.1f} ms "
+        f"(pergunta {nova.estado_quiz.pergunta_atual}, {nova.estado_quiz.pontuacao} acertos)"
+    )
+
+
+if __name__ == "__main__":
+    main()
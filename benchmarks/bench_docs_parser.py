@@ -0,0 +1,78 @@
+"""
+Benchmark do parser de perguntas do Google Docs (docs_parser.py).
+
+Gera documentos sintéticos no formato JSON da API do Google Docs e mede o
+tempo de extração e o pico de memória alocada pelo parser.
+
+Uso:
+    python benchmarks/bench_docs_parser.py [quantidade de perguntas ...]
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir)))
+
+from docs_parser import iter_questions, parse_document  # noqa: E402
+
+
+def _paragraph(text: str, bold: bool = False) -> dict:
+    """Monta um parágrafo no formato da API do Google Docs."""
+    style = {"bold": True} if bold else {}
+    return {"paragraph": {"elements": [{"textRun": {"content": text + "\n", "textStyle": style}}]}}
+
+
+def synthetic_content(n_questions: int):
+    """
+    Gera o conteúdo de um documento com n perguntas (sob demanda).
+
+    Args:
+        n_questions (int): Quantidade de perguntas.
+
+    Yields:
+        dict: Os elementos de body.content do documento.
+    """
+    for i in range(n_questions):
+        yield _paragraph(f"Pergunta sintética número {i} sobre os eventos do Scrum?")
+        for j, letter in enumerate("abcd"):
+            yield _paragraph(f"{letter}) Opção {letter} da pergunta {i}", bold=(j == i % 4))
+        yield _paragraph("")
+
+
+def bench(n_questions: int):
+    """Executa o benchmark para um documento com n perguntas."""
+    document = {"body": {"content": list(synthetic_content(n_questions))}}
+
+    # Tempo medido sem o tracemalloc, que distorce o custo das alocações
+    inicio = time.perf_counter()
+    rows, report = parse_document(document)
+    tempo_lista = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    total = sum(1 for _ in iter_questions(synthetic_content(n_questions)))
+    tempo_stream = time.perf_counter() - inicio
+
+    # Pico de memória: extração completa em lista x consumo incremental de
+    # um conteúdo gerado sob demanda
+    tracemalloc.start()
+    parse_document(document)
+    _, pico_lista = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    tracemalloc.start()
+    for _ in iter_questions(synthetic_content(n_questions)):
+        pass
+    _, pico_stream = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert len(rows) == total == n_questions and not report.diagnostics
+    print(
+        f"{n_questions:>7} perguntas | lista: {tempo_lista * 1000:8.1f} ms, "
+        f"pico {pico_lista / 1024:8.0f} KiB | incremental: {tempo_stream * 1000:8.1f} ms, "
+        f"pico {pico_stream / 1024:6.0f} KiB"
+    )
+
+
+if __name__ == "__main__":
+    for n in [int(arg) for arg in sys.argv[1:]] or [1000, 10000]:
+        bench(n)
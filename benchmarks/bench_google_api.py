@@ -0,0 +1,83 @@
+"""
+Benchmark da camada de acesso às APIs do Google (google_api.py) contra o
+servidor falso local (fake_google.py).
+
+Mede:
+    - leituras idênticas simultâneas (várias threads pedindo
+      get_all_values() da mesma aba): quantas requisições chegam ao servidor;
+    - repetição com backoff: leituras que recebem 429/503 antes de
+      conseguir a resposta;
+    - leitura de um documento do Google Docs pela API REST.
+
+Uso:
+    python benchmarks/bench_google_api.py [threads] [latência em ms]
+"""
+
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir)))
+
+import google_api  # noqa: E402
+from fake_google import EstadoFalso, iniciar  # noqa: E402
+
+PLANILHA = "https://docs.google.com/spreadsheets/d/planilha-falsa/edit"
+
+
+def main():
+    threads = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    latencia = (int(sys.argv[2]) if len(sys.argv) > 2 else 200) / 1000
+
+    linhas = [[f"Pergunta {i}", "a", "b", "c", "d", "a", "Geral"] for i in range(1000)]
+    estado = EstadoFalso(linhas, latencia=latencia)
+    servidor, endereco = iniciar(estado)
+    google_api.GOOGLE_API_ENDPOINT = endereco
+    google_api.BACKOFF_BASE = 0.05  # Esperas curtas no benchmark
+
+    aba = google_api.get_sheets_client().open_by_url(PLANILHA).sheet1
+    sessao = google_api.get_session(google_api.SHEETS_CREDENTIALS_FILE, google_api.SHEETS_SCOPES)
+
+    # Leituras idênticas simultâneas
+    antes = estado.requisicoes
+    resultados = []
+    barreira = threading.Barrier(threads)
+
+    def ler():
+        barreira.wait()
+        resultados.append(len(aba.get_all_values()))
+
+    inicio = time.perf_counter()
+    leitores = [threading.Thread(target=ler) for _ in range(threads)]
+    for leitor in leitores:
+        leitor.start()
+    for leitor in leitores:
+        leitor.join()
+    duracao = time.perf_counter() - inicio
+    print(
+        f"{threads} leituras simultâneas de get_all_values(): {estado.requisicoes - antes} "
+        f"requisição(ões) ao servidor, {sessao.coalesced} agrupadas, {duracao * 1000:.0f} ms "
+        f"(latência do servidor: {latencia * 1000:.0f} ms)"
+    )
+    assert set(resultados) == {len(linhas) + 1}
+
+    # Repetição com backoff após 429 e 503
+    estado.falhas = [429, 503, 429]
+    antes, repeticoes = estado.requisicoes, sessao.retries
+    inicio = time.perf_counter()
+    valores = aba.get_all_values()
+    print(
+        f"Leitura com 3 falhas (429, 503, 429): {len(valores)} linhas após "
+        f"{estado.requisicoes - antes} requisições e {sessao.retries - repeticoes} repetições "
+        f"em {(time.perf_counter() - inicio) * 1000:.0f} ms"
+    )
+
+    # Google Docs pela API REST, na mesma camada
+    documento = google_api.get_document("documento-falso", fields="revisionId")
+    print(f"Google Docs: revisionId = {documento['revisionId']}")
+    servidor.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmark de memória do banco de perguntas e das sessões.
+
+Mede, com o tracemalloc, a memória de 10 mil perguntas sintéticas em cada
+representação (lista de listas do JSON, tuplas e QuestionStore) e a memória
+adicional de cada sessão (QuizLogic com o sorteio e as perguntas preparadas,
+mais o EstadoQuiz com as 40 respostas).
+
+Uso:
+    python benchmarks/bench_memory.py [quantidade de perguntas]
+"""
+
+import json
+import os
+import random
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir)))
+
+from app.models import EstadoQuiz  # noqa: E402
+from question_bank import QuestionBank, QuestionStore  # noqa: E402
+from quiz_logic import QuizLogic  # noqa: E402
+
+# Opções comuns que se repetem entre perguntas em um banco real
+OPCOES_COMUNS = ["Todas as anteriores.", "Nenhuma das anteriores.", "Apenas a e b."]
+
+
+def banco_sintetico(n: int) -> list:
+    """Gera n perguntas no formato do JSON (lista de listas de strings)."""
+    perguntas = []
+    for i in range(n):
+        opcoes = [f"Opção {letra} da pergunta sintética {i}" for letra in "abc"]
+        opcoes.append(random.choice(OPCOES_COMUNS))
+        perguntas.append(
+            [f"Pergunta sintética {i} sobre artefatos do Scrum?", *opcoes, random.choice("abcd")]
+        )
+    # Recodifica como o json.load faria (strings independentes, sem compartilhamento)
+    return json.loads(json.dumps(perguntas, ensure_ascii=False))
+
+
+def medir(construir) -> tuple:
+    """Retorna (objeto, bytes alocados) para a função construtora."""
+    tracemalloc.start()
+    antes = tracemalloc.get_traced_memory()[0]
+    objeto = construir()
+    depois = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return objeto, depois - antes
+
+
+def nova_sessao(bank: QuestionBank):
+    """Cria a lógica e o estado de uma sessão com uma tentativa completa."""
+    logica = QuizLogic(bank)
+    logica.new_attempt()
+    estado = EstadoQuiz()
+    logica.prefetch()
+    for posicao in range(len(logica.questions)):
+        estado.registrar_resposta(posicao, posicao % 4)
+    return logica, estado
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    linhas = banco_sintetico(n)
+
+    _, bytes_listas = medir(lambda: json.loads(json.dumps(linhas, ensure_ascii=False)))
+    _, bytes_tuplas = medir(lambda: tuple(tuple(linha) for linha in json.loads(json.dumps(linhas))))
+    _, bytes_store = medir(lambda: QuestionStore(json.loads(json.dumps(linhas))))
+
+    print(f"Banco com {n} perguntas:")
+    print(f"  lista de listas (JSON): {bytes_listas / 1024:10.0f} KiB")
+    print(f"  tuplas de tuplas:       {bytes_tuplas / 1024:10.0f} KiB")
+    print(f"  QuestionStore:          {bytes_store / 1024:10.0f} KiB")
+
+    bank = QuestionBank()
+    bank.set_rows(linhas)
+    sessoes, bytes_sessoes = medir(lambda: [nova_sessao(bank) for _ in range(100)])
+    print(f"Memória por sessão (média de {len(sessoes)}): {bytes_sessoes / len(sessoes) / 1024:.1f} KiB")
@@ -0,0 +1,90 @@
+"""
+Benchmark da atualização conjunta dos bancos (bank_registry.py).
+
+Simula vários bancos com várias abas cada, em que cada download de aba
+demora um tempo aleatório (latência da API), e compara a atualização
+sequencial (um banco e uma aba de cada vez) com a do registro (todas as
+abas em paralelo pelo pool compartilhado).
+
+Uso:
+    python benchmarks/bench_registry.py [bancos] [abas por banco]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir)))
+
+from bank_registry import BankRegistry, BankSource  # noqa: E402
+
+# Latência simulada de cada download de aba (segundos)
+LATENCIA_MINIMA = 0.2
+LATENCIA_MAXIMA = 0.8
+PERGUNTAS_ABA = 200
+
+
+class AbaFalsa:
+    """Aba do Google Sheets com latência simulada."""
+
+    def __init__(self, nome: str, latencia: float):
+        self.latencia = latencia
+        self.linhas = [["Pergunta", "a", "b", "c", "d", "Resposta", "Tópico"]] + [
+            [f"{nome} {i}", "a", "b", "c", "d", "a", nome] for i in range(PERGUNTAS_ABA)
+        ]
+
+    def get_all_values(self):
+        time.sleep(self.latencia)
+        return [list(linha) for linha in self.linhas]
+
+
+def montar_registro(bancos: int, abas: int, diretorio: str, rodada: int) -> tuple:
+    """Cria um registro com bancos e abas falsos; retorna (registro, latências)."""
+    registro = BankRegistry()
+    latencias = []
+    for b in range(bancos):
+        nome = f"banco{b}_{rodada}"
+        registro.add(
+            BankSource(
+                nome,
+                nome,
+                "planilha-falsa",
+                cache_file=os.path.join(diretorio, f"{nome}.json"),
+                bank_file=os.path.join(diretorio, f"{nome}.bin"),
+            )
+        )
+        banco = registro.get(nome)
+        banco.check_internet_connection = lambda: True
+        banco.sheets = []
+        for a in range(abas):
+            latencia = random.uniform(LATENCIA_MINIMA, LATENCIA_MAXIMA)
+            latencias.append(latencia)
+            banco.sheets.append(AbaFalsa(f"{nome}-aba{a}", latencia))
+    return registro, latencias
+
+
+def main():
+    bancos = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    abas = int(sys.argv[2]) if len(sys.argv) > 2 else 2
+    with tempfile.TemporaryDirectory() as diretorio:
+        registro, latencias = montar_registro(bancos, abas, diretorio, 0)
+        inicio = time.perf_counter()
+        for banco in registro.banks.values():
+            banco.refresh()  # Sem pool: uma aba após a outra
+        sequencial = time.perf_counter() - inicio
+
+        registro, latencias = montar_registro(bancos, abas, diretorio, 1)
+        inicio = time.perf_counter()
+        atualizados = registro.refresh_all()
+        paralelo = time.perf_counter() - inicio
+
+    print(f"{bancos} bancos x {abas} abas ({PERGUNTAS_ABA} perguntas por aba)")
+    print(f"  sequencial:           {sequencial:.2f} s")
+    print(f"  registro (paralelo):  {paralelo:.2f} s (aba mais lenta: {max(latencias):.2f} s)")
+    print(f"  bancos atualizados:   {sum(atualizados.values())}/{len(atualizados)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Benchmark dos bytes enviados ao cliente por transição de pergunta.
+
+Compara a renderização antiga (page.clean() e reconstrução da tela a cada
+pergunta) com a tela de pergunta persistente (app.views.TelaPergunta),
+usando uma conexão Flet falsa que mede as mensagens do websocket.
+
+Uso:
+    python benchmarks/bench_render_bytes.py
+"""
+
+import json
+import os
+import sys
+import types
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, os.path.dirname(__file__))
+
+import flet as ft  # noqa: E402
+
+from app.models import EstadoQuiz, Pergunta  # noqa: E402
+from app.views import exibir_pergunta, formatar_tempo  # noqa: E402
+from fake_flet import criar_pagina  # noqa: E402
+
+
+def exibir_pergunta_reconstruindo(page, pergunta, estado_quiz, controller):
+    """Renderização anterior: limpa a página e recria todos os controles."""
+    page.clean()
+    botoes = [
+        ft.ElevatedButton(
+            text=f"{chr(ord('a') + i)}) {opcao}",
+            on_click=controller.verificar_resposta,
+            data=i,
+        )
+        for i, opcao in enumerate(pergunta.opcoes)
+        if isinstance(opcao, str) and opcao.strip()
+    ]
+    controller.texto_tempo = ft.Text(formatar_tempo(estado_quiz.tempo_restante), size=16)
+    page.add(
+        ft.Column(
+            [
+                controller.texto_tempo,
+                ft.Text(f"{estado_quiz.pergunta_atual + 1}. {pergunta.enunciado}", size=20),
+                *botoes,
+                ft.ElevatedButton("Voltar ao Início", on_click=controller.voltar_ao_inicio),
+            ],
+            alignment=ft.MainAxisAlignment.CENTER,
+            horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+        )
+    )
+
+
+def medir(exibir, perguntas: list) -> float:
+    """
+    Exibe as perguntas em sequência e retorna a média de bytes enviados por
+    transição (a primeira exibição, que monta a tela, não é contada).
+    """
+    page = criar_pagina()
+    controller = types.SimpleNamespace(
+        verificar_resposta=lambda e: None,
+        voltar_ao_inicio=lambda e: None,
+        tela_pergunta=None,
+        texto_tempo=None,
+    )
+    estado = EstadoQuiz()
+    conexao = page.conexao_falsa
+    inicio = None
+    for linha in perguntas:
+        exibir(page, Pergunta(linha[0], linha[1:5], linha[5]), estado, controller)
+        page.update()  # Como em QuizController.proxima_pergunta()
+        estado.proxima_pergunta()
+        if inicio is None:
+            inicio = conexao.bytes_enviados
+    return (conexao.bytes_enviados - inicio) / (len(perguntas) - 1)
+
+
+if __name__ == "__main__":
+    with open(os.path.join(RAIZ, "quiz_cache.json"), encoding="utf8") as f:
+        dados = json.load(f)
+    perguntas = dados["questions"] if isinstance(dados, dict) else dados
+    perguntas = perguntas[:40]
+
+    antes = medir(exibir_pergunta_reconstruindo, perguntas)
+    depois = medir(exibir_pergunta, perguntas)
+    print(f"Reconstrução (page.clean): {antes:8.0f} bytes por transição")
+    print(f"Tela persistente:          {depois:8.0f} bytes por transição")
+    print(f"Redução:                   {100 * (1 - depois / antes):7.1f} %")
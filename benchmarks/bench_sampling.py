@@ -0,0 +1,61 @@
+"""
+Benchmark do sorteio estratificado por tópico (sampling.py).
+
+Monta um banco sintético com tópicos de tamanhos bem diferentes e compara
+o sorteio uniforme (random.sample) com o estratificado: tempo de
+construção das tabelas de alias, tempo por tentativa de 40 perguntas e
+distribuição das perguntas entre os tópicos.
+
+Uso:
+    python benchmarks/bench_sampling.py [quantidade de perguntas]
+"""
+
+import os
+import random
+import statistics
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir)))
+
+from sampling import StratifiedSampler, question_topic  # noqa: E402
+
+# Tópicos e a fração do banco que cada um ocupa
+TOPICOS = {"Valores": 0.55, "Papéis": 0.2, "Eventos": 0.15, "Artefatos": 0.1}
+PERGUNTAS_TENTATIVA = 40
+TENTATIVAS = 2000
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    nomes, pesos = zip(*TOPICOS.items())
+    linhas = [
+        (f"Pergunta {i}", "a", "b", "c", "d", "a", random.choices(nomes, pesos)[0])
+        for i in range(n)
+    ]
+
+    inicio = time.perf_counter()
+    sorteador = StratifiedSampler(linhas)
+    print(f"{n} perguntas | tabelas de alias construídas em {(time.perf_counter() - inicio) * 1000:.0f} ms")
+
+    for nome, sortear in (
+        ("uniforme", lambda: random.sample(range(n), PERGUNTAS_TENTATIVA)),
+        ("estratificado", lambda: sorteador.draw(PERGUNTAS_TENTATIVA)),
+        ("cotas iguais", lambda: sorteador.draw(PERGUNTAS_TENTATIVA, dict.fromkeys(nomes, 1))),
+    ):
+        inicio = time.perf_counter()
+        tentativas = [sortear() for _ in range(TENTATIVAS)]
+        tempo = (time.perf_counter() - inicio) / TENTATIVAS * 1e6
+        # Desvio padrão, entre as tentativas, da quantidade de perguntas de cada tópico
+        contagens = [Counter(question_topic(linhas[i]) for i in t) for t in tentativas]
+        desvios = {t: statistics.pstdev(c[t] for c in contagens) for t in nomes}
+        medias = {t: statistics.mean(c[t] for c in contagens) for t in nomes}
+        print(
+            f"{nome:>13}: {tempo:6.1f} us/tentativa | "
+            + " ".join(f"{t} {medias[t]:4.1f}±{desvios[t]:.1f}" for t in nomes)
+        )
+
+
+if __name__ == "__main__":
+    main()
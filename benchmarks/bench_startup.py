@@ -0,0 +1,115 @@
+"""
+Benchmark da partida a frio do aplicativo (tempo, memória e importações).
+
+Cada medição roda em um processo novo, em um diretório temporário com o
+banco empacotado (quiz_bank.bin gerado a partir de quiz_cache.json), e
+executa a partida do main.py sem abrir a janela: importa o main,
+chama iniciar_processo() e monta a primeira sessão (main(page)) sobre a
+conexão Flet falsa. São comparados o modo offline (QUIZ_OFFLINE=1)
+e o modo com sincronização (QUIZ_OFFLINE=0).
+
+Para cada modo, informa a mediana do tempo até a tela inicial, o pico de
+memória residente (RSS), se as bibliotecas do Google e o requests foram
+importados e as importações mais caras segundo "python -X importtime".
+
+Uso:
+    python benchmarks/bench_startup.py [repetições]
+"""
+
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+from collections import Counter
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+
+# Módulos cuja presença indica acesso à rede/Google já na partida
+MODULOS_REDE = ("gspread", "google.auth", "googleapiclient", "oauth2client", "requests")
+
+# Pacotes exibidos por modo (os de maior tempo de importação)
+MAIS_CARAS = 12
+
+# Partida do main.py, sem ft.app() (executada em um processo novo)
+PARTIDA = """
+import time
+inicio = time.perf_counter()
+import json, resource, sys, threading
+sys.path[:0] = [{raiz!r}, {benchmarks!r}]
+import main
+importacoes = time.perf_counter() - inicio
+from fake_flet import criar_pagina
+main.iniciar_processo()
+main.main(criar_pagina())
+print(json.dumps({{
+    "importacoes": importacoes,
+    "tela": time.perf_counter() - inicio,
+    "rss_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    "rede": [m for m in {modulos!r} if m in sys.modules],
+    "threads": threading.active_count(),
+}}))
+"""
+
+
+def preparar_diretorio() -> str:
+    """Cria o diretório de execução com o banco empacotado e o cache."""
+    diretorio = tempfile.mkdtemp(prefix="quiz-startup-")
+    shutil.copy(os.path.join(RAIZ, "quiz_cache.json"), diretorio)
+    subprocess.run(
+        [sys.executable, os.path.join(RAIZ, "bank_format.py"), "to-bin", "quiz_cache.json", "quiz_bank.bin"],
+        cwd=diretorio,
+        check=True,
+        capture_output=True,
+    )
+    return diretorio
+
+
+def executar(diretorio: str, offline: str, importtime: bool = False) -> tuple:
+    """Roda uma partida; retorna (resultado, saída de erro)."""
+    codigo = PARTIDA.format(raiz=RAIZ, benchmarks=BENCHMARKS, modulos=MODULOS_REDE)
+    comando = [sys.executable] + (["-X", "importtime"] if importtime else []) + ["-c", codigo]
+    ambiente = dict(os.environ, QUIZ_OFFLINE=offline, PYTHONDONTWRITEBYTECODE="1")
+    processo = subprocess.run(comando, cwd=diretorio, env=ambiente, capture_output=True, text=True, timeout=120)
+    linhas = [linha for linha in processo.stdout.splitlines() if linha.startswith("{")]
+    if not linhas:
+        raise RuntimeError(processo.stderr[-2000:])
+    return json.loads(linhas[-1]), processo.stderr
+
+
+def mais_caras(saida_importtime: str) -> list:
+    """Soma o tempo próprio das importações por pacote raiz (flet, google...)."""
+    pacotes = Counter()
+    for linha in saida_importtime.splitlines():
+        if not linha.startswith("import time:") or "cumulative" in linha:
+            continue
+        proprio, _, nome = linha[len("import time:") :].split("|")
+        pacotes[nome.strip().split(".")[0]] += int(proprio) / 1000
+    return [(ms, nome) for nome, ms in pacotes.most_common(MAIS_CARAS)]
+
+
+def main():
+    repeticoes = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    diretorio = preparar_diretorio()
+    try:
+        for rotulo, offline in (("offline (QUIZ_OFFLINE=1)", "1"), ("com sincronização (QUIZ_OFFLINE=0)", "0")):
+            resultados = [executar(diretorio, offline)[0] for _ in range(repeticoes)]
+            _, saida = executar(diretorio, offline, importtime=True)
+            print(f"Modo {rotulo}:")
+            print(f"  importações:         {statistics.median(r['importacoes'] for r in resultados) * 1000:7.0f} ms")
+            print(f"  até a tela inicial:  {statistics.median(r['tela'] for r in resultados) * 1000:7.0f} ms")
+            print(f"  pico de RSS:         {statistics.median(r['rss_kib'] for r in resultados) / 1024:7.1f} MiB")
+            print(f"  threads:             {resultados[-1]['threads']}")
+            print(f"  rede importada:      {', '.join(resultados[-1]['rede']) or 'nada'}")
+            print("  importações mais caras (-X importtime, tempo próprio por pacote):")
+            for milissegundos, nome in mais_caras(saida):
+                print(f"    {milissegundos:7.1f} ms  {nome}")
+    finally:
+        shutil.rmtree(diretorio, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Conexão Flet falsa para benchmarks e simulações sem cliente.
+
+A conexão processa os comandos como o servidor local do Flet (atribuindo
+IDs aos controles adicionados) e contabiliza os bytes das mensagens que
+seriam enviadas ao cliente pelo websocket. As chamadas ao armazenamento
+local do cliente (page.client_storage) são respondidas na hora, a partir
+de um dicionário em memória.
+"""
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+import flet as ft
+from flet_core.local_connection import LocalConnection
+from flet_core.protocol import CommandEncoder, PageCommandsBatchResponsePayload
+
+
+class ConexaoFalsa(LocalConnection):
+    """
+    Conexão que não envia nada: apenas mede as mensagens geradas.
+    """
+
+    def __init__(self):
+        """Inicializa os contadores da conexão."""
+        super().__init__()
+        self.bytes_enviados = 0  # Total de bytes das mensagens ao cliente
+        self.lotes_enviados = 0  # Total de lotes de comandos (chamadas de update)
+        self.armazenamento = {}  # Conteúdo simulado do client_storage
+        self.pagina = None  # Página que recebe as respostas do "cliente"
+
+    def send_commands(self, session_id: str, commands: list):
+        """Processa um lote de comandos, contabilizando as mensagens."""
+        self.lotes_enviados += 1
+        results = []
+        for command in commands:
+            result, message = self._process_command(command)
+            if command.name in ["add", "get"]:
+                results.append(result)
+            if message:
+                self.bytes_enviados += len(
+                    json.dumps(message, cls=CommandEncoder, separators=(",", ":"))
+                )
+            if command.name == "invokeMethod":
+                self._responder_metodo(command.values[0], command.values[1], command.attrs)
+        return PageCommandsBatchResponsePayload(results=results, error="")
+
+    def _responder_metodo(self, metodo_id: str, metodo: str, argumentos: dict):
+        """Responde como o cliente às chamadas do client_storage."""
+        if metodo == "clientStorage:get":
+            valor = self.armazenamento.get(argumentos["key"])
+            resultado = None if valor is None else json.dumps(valor)
+        elif metodo == "clientStorage:set":
+            self.armazenamento[argumentos["key"]] = argumentos["value"]
+            resultado = "true"
+        else:
+            return  # Demais métodos não aguardam resposta
+        dados = {"method_id": metodo_id, "result": resultado, "error": None}
+        self.pagina._Page__on_invoke_method_result(SimpleNamespace(data=json.dumps(dados)))
+
+    def send_command(self, session_id: str, command):
+        """Processa um único comando."""
+        return self.send_commands(session_id, [command])
+
+
+def criar_pagina(session_id: str = "sessao") -> ft.Page:
+    """
+    Cria uma página Flet ligada a uma ConexaoFalsa.
+
+    Args:
+        session_id (str): O ID da sessão simulada.
+
+    Returns:
+        ft.Page: A página; a conexão fica acessível em page.conexao_falsa.
+    """
+    conexao = ConexaoFalsa()
+    page = ft.Page(conexao, session_id, asyncio.new_event_loop())
+    page.conexao_falsa = conexao
+    conexao.pagina = page
+    return page
@@ -0,0 +1,148 @@
+"""
+Servidor HTTP falso das APIs do Google (Sheets, Drive e Docs) para
+benchmarks e simulações sem rede.
+
+Atende às requisições que o gspread e o google_api.py fazem para ler e
+escrever uma planilha de uma aba e para ler um documento, com latência
+configurável e injeção de falhas (429/503). Para usá-lo, defina
+GOOGLE_API_ENDPOINT (ou google_api.GOOGLE_API_ENDPOINT) com o endereço
+retornado por iniciar().
+"""
+
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlparse
+
+CABECALHO = ["Pergunta", "a", "b", "c", "d", "Resposta", "Tópico"]
+
+
+class EstadoFalso:
+    """Conteúdo e contadores do servidor falso."""
+
+    def __init__(self, linhas: list, documento: dict = None, latencia: float = 0.0):
+        self.linhas = [list(CABECALHO)] + [list(linha) for linha in linhas]
+        self.documento = documento or {"revisionId": "rev-1", "body": {"content": []}}
+        self.latencia = latencia  # Atraso de cada resposta (segundos)
+        self.falhas = []  # Status a devolver nas próximas requisições (ex.: [429, 503])
+        self.requisicoes = 0  # Requisições recebidas (inclui as que falharam)
+        self.caminhos = []  # Método e caminho de cada requisição
+        self.consultas = []  # Parâmetros da URL de cada requisição (ex.: {"fields": ["revisionId"]})
+        self.lock = threading.Lock()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Trata as rotas usadas pelo gspread e pelo google_api.py."""
+
+    estado: EstadoFalso = None
+    protocol_version = "HTTP/1.1"  # Mantém a conexão aberta (pool de conexões)
+
+    def log_message(self, *args):
+        pass  # Silencioso
+
+    def _responder(self, status: int, corpo: dict = None, cabecalhos: dict = None):
+        dados = json.dumps(corpo or {}).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(dados)))
+        for nome, valor in (cabecalhos or {}).items():
+            self.send_header(nome, valor)
+        self.end_headers()
+        self.wfile.write(dados)
+
+    def _tratar(self, metodo: str):
+        estado = self.estado
+        tamanho = int(self.headers.get("Content-Length") or 0)
+        corpo = json.loads(self.rfile.read(tamanho) or b"{}") if tamanho else {}
+        url = urlparse(self.path)
+        caminho = unquote(url.path)
+        consulta = parse_qs(url.query)
+        with estado.lock:
+            estado.requisicoes += 1
+            estado.caminhos.append(f"{metodo} {caminho}")
+            estado.consultas.append(consulta)
+            falha = estado.falhas.pop(0) if estado.falhas else None
+        time.sleep(estado.latencia)
+        if falha:
+            return self._responder(falha, {"error": {"code": falha}}, {"Retry-After": "0"})
+
+        if m := re.fullmatch(r"/v1/documents/([^/]+)", caminho):
+            documento = estado.documento
+            if "fields" in consulta:  # Máscara de campos: só os campos pedidos
+                campos = consulta["fields"][0].split(",")
+                documento = {campo: documento[campo] for campo in campos if campo in documento}
+            return self._responder(200, documento)
+        if m := re.fullmatch(r"/drive/v3/files/([^/]+)", caminho):
+            return self._responder(200, {"id": m.group(1), "modifiedTime": "2024-01-01T00:00:00Z"})
+        if m := re.fullmatch(r"/v4/spreadsheets/([^/:]+)", caminho):
+            return self._responder(200, self._metadados(m.group(1)))
+        if m := re.fullmatch(r"/v4/spreadsheets/([^/]+)/values/([^/:]+)", caminho):
+            with estado.lock:
+                valores = [list(linha) for linha in estado.linhas]
+            return self._responder(200, {"range": m.group(2), "majorDimension": "ROWS", "values": valores})
+        if m := re.fullmatch(r"/v4/spreadsheets/([^/]+)/values:batchUpdate", caminho):
+            with estado.lock:
+                for item in corpo.get("data", []):
+                    self._escrever(item["range"], item["values"])
+            return self._responder(200, {"spreadsheetId": m.group(1)})
+        if m := re.fullmatch(r"/v4/spreadsheets/([^/]+):batchUpdate", caminho):
+            with estado.lock:
+                for pedido in corpo.get("requests", []):
+                    intervalo = pedido.get("deleteDimension", {}).get("range")
+                    if intervalo:
+                        del estado.linhas[intervalo["startIndex"] : intervalo["endIndex"]]
+            return self._responder(200, {"spreadsheetId": m.group(1), "replies": []})
+        return self._responder(404, {"error": {"code": 404, "message": caminho}})
+
+    def _metadados(self, planilha: str) -> dict:
+        return {
+            "spreadsheetId": planilha,
+            "properties": {"title": "Planilha falsa"},
+            "sheets": [
+                {
+                    "properties": {
+                        "sheetId": 0,
+                        "title": "Perguntas",
+                        "index": 0,
+                        "gridProperties": {"rowCount": len(self.estado.linhas), "columnCount": 7},
+                    }
+                }
+            ],
+        }
+
+    def _escrever(self, intervalo: str, valores: list):
+        """Aplica uma escrita "Aba!A2:G4" (ou "A2:G4") às linhas."""
+        primeira = int(re.search(r"[A-Z]+(\d+)", intervalo.split("!")[-1]).group(1))
+        for deslocamento, linha in enumerate(valores):
+            indice = primeira - 1 + deslocamento
+            while len(self.estado.linhas) <= indice:
+                self.estado.linhas.append([""] * len(linha))
+            self.estado.linhas[indice] = list(linha)
+
+    def do_GET(self):
+        self._tratar("GET")
+
+    def do_POST(self):
+        self._tratar("POST")
+
+    def do_PUT(self):
+        self._tratar("PUT")
+
+
+def iniciar(estado: EstadoFalso) -> tuple:
+    """
+    Inicia o servidor falso em uma porta livre, em segundo plano.
+
+    Args:
+        estado (EstadoFalso): O conteúdo e os contadores do servidor.
+
+    Returns:
+        tuple: (servidor, endereço "http://127.0.0.1:porta").
+    """
+    handler = type("Handler", (_Handler,), {"estado": estado})
+    servidor = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    servidor.daemon_threads = True
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor, f"http://127.0.0.1:{servidor.server_address[1]}"
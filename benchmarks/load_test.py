@@ -0,0 +1,226 @@
+"""
+Teste de carga sem interface: simula N usuários fazendo tentativas completas.
+
+Cada usuário simulado tem a sua página Flet ligada a uma conexão falsa
+(benchmarks/fake_flet.py) e o seu QuizController, e percorre o fluxo
+iniciar_quiz -> verificar_resposta -> proxima_pergunta -> finalizar_quiz
+como um clique real faria. O banco de perguntas vem de backends falsos:
+um documento sintético no formato da API do Google Docs é extraído por
+automate_spreadsheet, sincronizado com uma planilha falsa em memória e
+carregado pelo QuestionBank, sem nenhuma chamada de rede.
+
+Ao final, reporta as latências clique -> nova pergunta (p50/p95/p99, sem o
+atraso intencional de feedback), o pico de threads vivas, os lotes de
+comandos enviados (page.update e afins), os bytes enviados, as sessões
+registradas e a memória retida por elas (ver app/sessions.py), quantas
+restam depois que todos os clientes se desconectam, com --memoria, a
+memória por sessão e, com --metricas, os trechos medidos por metrics.py.
+
+Uso:
+    python benchmarks/load_test.py --usuarios 200 --pensar 0.2
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import types
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, os.path.dirname(__file__))
+
+import flet as ft  # noqa: E402
+
+import app.controllers as controllers  # noqa: E402
+import app.sessions as sessions  # noqa: E402
+import attempt_store  # noqa: E402
+import bank_registry  # noqa: E402
+import automate_spreadsheet  # noqa: E402
+import checkpoint  # noqa: E402
+import metrics  # noqa: E402
+import question_bank  # noqa: E402
+import review  # noqa: E402
+from bench_docs_parser import synthetic_content  # noqa: E402
+from fake_flet import criar_pagina  # noqa: E402
+
+PLANILHA_FALSA = "planilha-falsa"
+
+
+class PlanilhaFalsa:
+    """Aba do Google Sheets em memória, com a API usada pelo projeto."""
+
+    def __init__(self):
+        """Inicializa a planilha apenas com o cabeçalho."""
+        self.linhas = [["Pergunta", "a", "b", "c", "d", "Resposta"]]
+        self.escritas = 0  # Chamadas de escrita recebidas
+
+    def get_all_values(self):
+        """Retorna todas as linhas, como o gspread."""
+        return [list(linha) for linha in self.linhas]
+
+    def batch_update(self, dados):
+        """Aplica escritas por intervalo ("A2:F4")."""
+        self.escritas += 1
+        for item in dados:
+            primeira = int(item["range"].split(":")[0][1:])
+            for deslocamento, valores in enumerate(item["values"]):
+                indice = primeira - 1 + deslocamento
+                while len(self.linhas) <= indice:
+                    self.linhas.append([""] * len(valores))
+                self.linhas[indice] = list(valores)
+
+    def delete_rows(self, inicio, fim):
+        """Remove as linhas do intervalo (numeração da planilha)."""
+        self.escritas += 1
+        del self.linhas[inicio - 1 : fim]
+
+
+def preparar_banco(n_perguntas: int, diretorio: str):
+    """
+    Monta o banco compartilhado a partir dos backends falsos:
+    Google Docs sintético -> planilha falsa -> QuestionBank.
+    """
+    documento = {"body": {"content": list(synthetic_content(n_perguntas))}}
+    perguntas = automate_spreadsheet.extract_questions_from_doc("doc-falso", documento)
+
+    planilha = PlanilhaFalsa()
+    automate_spreadsheet._sheets[PLANILHA_FALSA, None] = planilha  # A primeira aba
+    automate_spreadsheet.write_to_spreadsheet(perguntas, PLANILHA_FALSA)
+
+    banco = question_bank.QuestionBank(
+        spreadsheet_url=PLANILHA_FALSA,
+        cache_file=os.path.join(diretorio, "quiz_cache.json"),
+    )
+    banco.sheets = [planilha]  # Dispensa a autorização no Google
+    banco.check_internet_connection = lambda: True
+    banco.refresh()
+    # Todas as sessões usarão este banco
+    registro = bank_registry.BankRegistry()
+    registro.add(bank_registry.BankSource("sfpc", "SFPC", PLANILHA_FALSA), banco)
+    bank_registry._registry = registro
+    # Histórico de tentativas no diretório temporário
+    attempt_store._store = attempt_store.AttemptStore(os.path.join(diretorio, "quiz_attempts.db"))
+    review.REVIEW_DIR = os.path.join(diretorio, "review_state")  # Baralhos de revisão
+    checkpoint.CHECKPOINT_DIR = os.path.join(diretorio, "attempt_state")  # Pontos de retomada
+    return banco
+
+
+def simular_usuario(indice: int, pensar: float, resultados: list, inicio: threading.Event):
+    """Executa uma tentativa completa de um usuário simulado."""
+    page = criar_pagina(f"sessao-{indice}")
+    controller = controllers.QuizController(page, ft.Switch(), True)
+    controller.revisao_carregada.wait()  # O botão "Iniciar Quiz" é habilitado aqui
+    inicio.wait()
+    controller.iniciar_quiz(None)
+    while not controller.estado_quiz.quiz_finalizado:
+        pergunta = controller.pergunta_exibida
+        if pergunta is None:
+            time.sleep(0.002)  # Aguarda a próxima pergunta aparecer
+            continue
+        time.sleep(random.uniform(0, 2 * pensar))  # Tempo de leitura
+        botao = controller.tela_pergunta.botoes[random.randrange(4)]
+        controller.verificar_resposta(types.SimpleNamespace(control=botao))
+    resultados.append((controller, page))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--usuarios", type=int, default=100)
+    parser.add_argument("--pensar", type=float, default=0.1, help="tempo médio de leitura (s)")
+    parser.add_argument("--atraso", type=float, default=controllers.ATRASO_FEEDBACK, help="atraso de feedback (s)")
+    parser.add_argument("--perguntas", type=int, default=1000, help="tamanho do banco sintético")
+    parser.add_argument("--memoria", action="store_true", help="mede a memória por sessão (mais lento)")
+    parser.add_argument("--metricas", metavar="PORTA", help="liga metrics.py e imprime as métricas ao final")
+    args = parser.parse_args()
+
+    controllers.ATRASO_FEEDBACK = args.atraso
+    if args.metricas:
+        metrics.configure(args.metricas)
+    with tempfile.TemporaryDirectory() as diretorio:
+        preparar_banco(args.perguntas, diretorio)
+
+        if args.memoria:
+            tracemalloc.start()
+        memoria_antes = tracemalloc.get_traced_memory()[0] if args.memoria else 0
+
+        resultados = []
+        inicio = threading.Event()
+        usuarios = [
+            threading.Thread(target=simular_usuario, args=(i, args.pensar, resultados, inicio))
+            for i in range(args.usuarios)
+        ]
+        for usuario in usuarios:
+            usuario.start()
+
+        # Amostra o número de threads vivas enquanto as tentativas acontecem
+        pico_threads = threading.active_count()
+        t0 = time.perf_counter()
+        inicio.set()
+        while any(usuario.is_alive() for usuario in usuarios):
+            pico_threads = max(pico_threads, threading.active_count())
+            time.sleep(0.05)
+        duracao = time.perf_counter() - t0
+        historico = attempt_store._store
+        historico.flush()
+        with historico.read_connection() as conexao:
+            respostas_gravadas = conexao.execute("SELECT COUNT(*) FROM answers").fetchone()[0]
+
+        latencias = [
+            (latencia - args.atraso) * 1000
+            for controller, _ in resultados
+            for latencia in controller.latencias_clique
+        ]
+
+        # Sessões registradas e memória retida, antes e depois da desconexão de todos
+        registro_sessoes = sessions.obter_registro_sessoes()
+        t_medicao = time.perf_counter()
+        for controller, _ in resultados:
+            registro_sessoes.medir(controller)
+        t_medicao = time.perf_counter() - t_medicao
+        sessoes_vivas, bytes_retidos = registro_sessoes.total, registro_sessoes.bytes_retidos
+        for controller, page in resultados:
+            page.on_disconnect(None)
+        registro_sessoes.varrer(time.monotonic() + registro_sessoes.tolerancia_desconexao)
+
+        memoria_sessao = None
+        if args.memoria:
+            memoria_sessao = (tracemalloc.get_traced_memory()[0] - memoria_antes) / len(resultados)
+            tracemalloc.stop()
+
+    percentis = statistics.quantiles(latencias, n=100)
+    lotes = [page.conexao_falsa.lotes_enviados for _, page in resultados]
+    bytes_enviados = [page.conexao_falsa.bytes_enviados for _, page in resultados]
+
+    print(f"Usuários: {len(resultados)} em {duracao:.1f} s ({len(latencias)} cliques)")
+    print(
+        f"Clique -> nova pergunta (sem o atraso de {args.atraso:.2f} s): "
+        f"p50 {percentis[49]:.2f} ms | p95 {percentis[94]:.2f} ms | p99 {percentis[98]:.2f} ms"
+    )
+    print(f"Pico de threads vivas: {pico_threads} (threads dos usuários simulados incluídas)")
+    print(f"Lotes de comandos por sessão (page.update e afins): {statistics.mean(lotes):.0f}")
+    print(f"Bytes enviados por sessão: {statistics.mean(bytes_enviados) / 1024:.0f} KiB")
+    print(
+        f"Histórico: {respostas_gravadas} respostas em {historico.transactions} transações "
+        f"({historico.transactions / duracao:.1f} por segundo)"
+    )
+    print(
+        f"Sessões registradas: {sessoes_vivas}, retendo {bytes_retidos / 1024:.0f} KiB "
+        f"({bytes_retidos / max(1, sessoes_vivas) / 1024:.1f} KiB por sessão, medidos em "
+        f"{t_medicao * 1000:.0f} ms); após a desconexão de todos: {registro_sessoes.total} "
+        f"(encerradas: {registro_sessoes.encerradas})"
+    )
+    if memoria_sessao is not None:
+        print(f"Memória por sessão: {memoria_sessao / 1024:.0f} KiB")
+    if args.metricas:
+        print(json.dumps(metrics.snapshot(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+"""
+Pontos de retomada das tentativas em andamento, por aprendiz.
+
+Se o navegador recarregar a página ou o aplicativo fechar no meio de uma
+tentativa, ela pode ser retomada a partir do arquivo do aprendiz
+(CHECKPOINT_DIR/<id>.bin). O arquivo é gravado só por acréscimos: um
+registro de início por tentativa (que recria o arquivo) e, depois, um
+registro curto por pergunta exibida e por resposta, cada um com uma única
+chamada os.write() em um arquivo aberto com O_APPEND, sem buffer nem
+fsync (sobrevive ao fim do processo, não a uma queda do sistema).
+
+Registros (inteiros little-endian):
+
+    início      magic "QZS1", modo (u8: 1 = revisão, 2 = adaptativo),
+                tamanho do nome do banco (u8), prazo em segundos desde
+                1970 (f64), ID da tentativa no histórico (16 bytes; zeros
+                = fora do histórico), número de perguntas sorteadas n
+                (u16), nome do banco (UTF-8) e n chaves (SHA-1, 20 bytes)
+    exibida     "S", posição (u16), chave da pergunta (20 bytes), ordem
+                das opções (u8, 2 bits por opção; 255 = sem ordem)
+    resposta    "A", posição (u16), opção escolhida na ordem exibida (u8),
+                acerto (u8)
+    fim         "E"
+
+Um registro incompleto no fim do arquivo (gravação interrompida) é ignorado.
+"""
+
+import os
+import struct
+import threading
+from dataclasses import dataclass, field
+
+from review import LEARNER_ID_PATTERN
+
+# Diretório dos arquivos de retomada (um por aprendiz)
+CHECKPOINT_DIR = "attempt_state"
+
+MAGIC = b"QZS1"
+REVIEW_MODE = 1
+ADAPTIVE_MODE = 2
+
+_BEGIN = struct.Struct("<4sBBd16sH")
+_KEY = struct.Struct("<20s")
+_SHOWN = struct.Struct("<cH20sB")
+_ANSWER = struct.Struct("<cHBB")
+_END = b"E"
+
+# Ordem das opções não representável em 1 byte (mais de 4 opções)
+NO_ORDER = 0xFF
+
+
+def pack_order(order) -> int:
+    """
+    Codifica a ordem de até 4 opções em um byte (2 bits por opção).
+
+    Args:
+        order (tuple): Para cada opção exibida, o seu índice original.
+
+    Returns:
+        int: O byte da ordem (NO_ORDER se não couber).
+    """
+    if not order or len(order) != 4:
+        return NO_ORDER
+    return order[0] | order[1] << 2 | order[2] << 4 | order[3] << 6
+
+
+def unpack_order(packed: int) -> tuple:
+    """
+    Decodifica a ordem gravada por pack_order().
+
+    Args:
+        packed (int): O byte da ordem.
+
+    Returns:
+        tuple: A ordem das opções (None para NO_ORDER).
+    """
+    if packed == NO_ORDER:
+        return None
+    return tuple(packed >> shift & 3 for shift in (0, 2, 4, 6))
+
+
+@dataclass
+class AttemptSnapshot:
+    """Tentativa lida de um arquivo de retomada."""
+
+    bank: str  # Nome do banco no registro (ver bank_registry.py)
+    review: bool  # Se é uma revisão (ver review.py)
+    adaptive: bool  # Se as perguntas são escolhidas uma a uma (ver adaptive.py)
+    deadline: float  # Fim do prazo, em segundos desde 1970
+    attempt_id: str  # ID da tentativa no histórico (None = fora do histórico)
+    keys: list  # Chaves hexadecimais das perguntas sorteadas (vazio no modo adaptativo)
+    shown: list = field(default_factory=list)  # (chave, ordem) por posição exibida
+    answers: list = field(default_factory=list)  # (opção, acerto) por posição respondida
+    finished: bool = False
+
+
+class AttemptCheckpoint:
+    """
+    Arquivo de retomada de um aprendiz, mantido aberto durante a tentativa.
+    """
+
+    def __init__(self, path: str):
+        """
+        Inicializa o ponto de retomada (o arquivo é aberto em begin()/resume()).
+
+        Args:
+            path (str): O arquivo de retomada.
+        """
+        self.path = path
+        self._fd = None
+        self._lock = threading.Lock()  # Impede a gravação em um descritor já fechado
+
+    def _open(self, truncate: bool):
+        """Abre o arquivo para acréscimos (recriando-o, se truncate)."""
+        self.close()
+        flags = os.O_WRONLY | os.O_CREAT | os.O_APPEND | (os.O_TRUNC if truncate else 0)
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            fd = os.open(self.path, flags, 0o600)
+        except OSError as e:
+            print(f"Erro ao abrir o ponto de retomada: {e}")
+            return
+        with self._lock:
+            self._fd = fd
+
+    def _write(self, data: bytes):
+        """Acrescenta um registro; uma falha de disco desliga a retomada."""
+        with self._lock:
+            if self._fd is None:
+                return
+            try:
+                os.write(self._fd, data)
+                return
+            except OSError as e:
+                print(f"Erro ao gravar o ponto de retomada: {e}")
+        self.close()
+
+    def begin(
+        self,
+        bank: str,
+        deadline: float,
+        keys,
+        attempt_id: str = None,
+        review: bool = False,
+        adaptive: bool = False,
+    ):
+        """
+        Recria o arquivo com o início de uma nova tentativa.
+
+        Args:
+            bank (str): O nome do banco.
+            deadline (float): O fim do prazo, em segundos desde 1970.
+            keys: As chaves hexadecimais das perguntas sorteadas, na ordem.
+            attempt_id (str): O ID hexadecimal da tentativa no histórico.
+            review (bool): Se é uma revisão.
+            adaptive (bool): Se é uma tentativa adaptativa.
+        """
+        name = bank.encode("utf8")[:255]
+        mode = (REVIEW_MODE if review else 0) | (ADAPTIVE_MODE if adaptive else 0)
+        attempt = bytes.fromhex(attempt_id) if attempt_id else bytes(16)
+        keys = list(keys)
+        data = [_BEGIN.pack(MAGIC, mode, len(name), deadline, attempt, len(keys)), name]
+        data.extend(bytes.fromhex(key) for key in keys)
+        self._open(truncate=True)
+        self._write(b"".join(data))
+
+    def resume(self):
+        """Reabre o arquivo para continuar a tentativa gravada (ver load())."""
+        self._open(truncate=False)
+
+    def shown(self, position: int, key: str, order: tuple = None):
+        """
+        Registra a pergunta exibida em uma posição.
+
+        Args:
+            position (int): A posição da pergunta na tentativa.
+            key (str): A chave hexadecimal da pergunta (question_key).
+            order (tuple): A ordem das opções exibidas (ver Pergunta.ordem).
+        """
+        self._write(_SHOWN.pack(b"S", position, bytes.fromhex(key), pack_order(order)))
+
+    def answer(self, position: int, option: int, correct: bool):
+        """
+        Registra a resposta de uma pergunta.
+
+        Args:
+            position (int): A posição da pergunta na tentativa.
+            option (int): A opção escolhida (na ordem exibida).
+            correct (bool): Se a resposta estava correta.
+        """
+        self._write(_ANSWER.pack(b"A", position, option & 0xFF, correct))
+
+    def finish(self):
+        """Registra o fim da tentativa (nada mais a retomar) e fecha o arquivo."""
+        self._write(_END)
+        self.close()
+
+    def close(self):
+        """Fecha o arquivo, mantendo-o em disco para uma retomada."""
+        with self._lock:
+            fd, self._fd = self._fd, None
+            if fd is not None:
+                os.close(fd)
+
+    def load(self) -> AttemptSnapshot:
+        """
+        Lê a última tentativa gravada no arquivo.
+
+        Returns:
+            AttemptSnapshot: A tentativa, ou None se o arquivo não existir ou
+                for inválido.
+        """
+        try:
+            with open(self.path, "rb") as f:
+                data = f.read()
+            magic, mode, name_size, deadline, attempt, count = _BEGIN.unpack_from(data)
+        except (OSError, struct.error):
+            return None
+        offset = _BEGIN.size + name_size + count * _KEY.size
+        if magic != MAGIC or len(data) < offset:
+            print(f"Arquivo de retomada inválido ignorado: {self.path}")
+            return None
+        keys_start = _BEGIN.size + name_size
+        snapshot = AttemptSnapshot(
+            bank=data[_BEGIN.size : keys_start].decode("utf8", "replace"),
+            review=bool(mode & REVIEW_MODE),
+            adaptive=bool(mode & ADAPTIVE_MODE),
+            deadline=deadline,
+            attempt_id=attempt.hex() if any(attempt) else None,
+            keys=[key.hex() for (key,) in _KEY.iter_unpack(data[keys_start:offset])],
+        )
+        shown, answers = {}, {}
+        while offset < len(data):
+            tag = data[offset : offset + 1]
+            if tag == _END:
+                snapshot.finished = True
+                break
+            record = _SHOWN if tag == b"S" else _ANSWER if tag == b"A" else None
+            if record is None or offset + record.size > len(data):
+                break  # Registro desconhecido ou incompleto: para aqui
+            if record is _SHOWN:
+                _, position, key, order = record.unpack_from(data, offset)
+                shown[position] = (key.hex(), unpack_order(order))
+            else:
+                _, position, option, correct = record.unpack_from(data, offset)
+                answers[position] = (option, bool(correct))
+            offset += record.size
+        snapshot.shown = _contiguous(shown)
+        snapshot.answers = _contiguous(answers)
+        return snapshot
+
+
+def _contiguous(records: dict) -> list:
+    """Registros das posições 0, 1, 2... até a primeira lacuna (a ordem do quiz)."""
+    result = []
+    while len(result) in records:
+        result.append(records[len(result)])
+    return result
+
+
+def checkpoint_path(learner_id: str, directory: str = None) -> str:
+    """
+    Retorna o arquivo de retomada de um aprendiz.
+
+    Args:
+        learner_id (str): O identificador do aprendiz (32 dígitos hexadecimais).
+        directory (str): O diretório dos arquivos (padrão: CHECKPOINT_DIR).
+
+    Returns:
+        str: O caminho do arquivo.
+
+    Raises:
+        ValueError: Se o identificador não tiver o formato esperado.
+    """
+    if not LEARNER_ID_PATTERN.match(learner_id or ""):
+        raise ValueError(f"identificador de aprendiz inválido: {learner_id!r}")
+    return os.path.join(directory or CHECKPOINT_DIR, f"{learner_id}.bin")
@@ -0,0 +1,171 @@
+"""
+Estado de conectividade do processo, mantido por uma sonda em segundo plano.
+
+Em vez de cada chamador fazer uma requisição bloqueante para saber se há
+internet, uma única thread testa a conexão a cada TTL segundos e guarda o
+resultado; is_online() apenas lê esse estado. Falhas consecutivas (da sonda
+ou relatadas pelos chamadores via report_failure()) abrem o circuito: por
+OPEN_INTERVAL segundos o processo é considerado offline sem nenhuma nova
+tentativa, e depois uma única sonda decide se o circuito fecha novamente.
+"""
+
+import threading
+import time
+
+# URL testada pela sonda (resposta curta, sem conteúdo)
+PROBE_URL = "http://www.google.com/generate_204"
+
+# Tempo máximo (em segundos) de espera de cada sonda
+PROBE_TIMEOUT = 2
+
+# Validade (em segundos) de um resultado positivo antes da próxima sonda
+PROBE_TTL = 30
+
+# Falhas consecutivas que abrem o circuito
+FAILURE_THRESHOLD = 2
+
+# Tempo (em segundos) em que o circuito fica aberto antes de uma nova sonda
+OPEN_INTERVAL = 60
+
+
+class ConnectivityProbe:
+    """
+    Sonda de conectividade compartilhada, com cache do último resultado e
+    semântica de circuit breaker (fechado, aberto, meio-aberto).
+    """
+
+    def __init__(
+        self,
+        url: str = PROBE_URL,
+        timeout: float = PROBE_TIMEOUT,
+        ttl: float = PROBE_TTL,
+        failure_threshold: int = FAILURE_THRESHOLD,
+        open_interval: float = OPEN_INTERVAL,
+    ):
+        """
+        Inicializa a sonda (a thread só é criada em start()).
+
+        Args:
+            url (str): A URL testada.
+            timeout (float): Tempo máximo de cada sonda, em segundos.
+            ttl (float): Intervalo entre as sondas com o circuito fechado.
+            failure_threshold (int): Falhas consecutivas que abrem o circuito.
+            open_interval (float): Duração do circuito aberto, em segundos.
+        """
+        self.url = url
+        self.timeout = timeout
+        self.ttl = ttl
+        self.failure_threshold = failure_threshold
+        self.open_interval = open_interval
+        self.online = None  # Último resultado (None enquanto nenhuma sonda terminou: assume conexão)
+        self.checked_at = 0.0  # Instante (monotônico) do último resultado
+        self.failures = 0  # Falhas consecutivas
+        self.open_until = 0.0  # Fim (monotônico) do circuito aberto
+        self._lock = threading.Lock()
+        self._probe_lock = threading.Lock()  # Uma sonda por vez
+        self._wake = threading.Event()
+        self._thread = None
+
+    @property
+    def circuit_open(self) -> bool:
+        """bool: Se o circuito está aberto (offline sem novas tentativas)."""
+        return time.monotonic() < self.open_until
+
+    def start(self):
+        """Inicia a thread da sonda (uma vez)."""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._probe_loop, daemon=True)
+                self._thread.start()
+
+    def is_online(self) -> bool:
+        """
+        Retorna o último estado conhecido, sem esperar pela rede: só a
+        thread da sonda faz requisições (e espera pelo _probe_lock).
+
+        Enquanto nenhuma sonda terminou, assume que há conexão: uma chamada
+        real que falhe é relatada por report_failure() e corrige o estado.
+
+        Returns:
+            bool: True se a última sonda encontrou conexão (ou se ainda não
+                há resultado).
+        """
+        if self._thread is None:
+            self.start()  # A primeira sonda roda em segundo plano
+        if self.circuit_open:
+            return False
+        return self.online is not False
+
+    def probe(self) -> bool:
+        """
+        Testa a conexão agora e atualiza o estado.
+
+        Returns:
+            bool: True se houve resposta dentro do tempo limite.
+        """
+        import requests  # Adiado: o processo offline não carrega o requests
+
+        with self._probe_lock:
+            try:
+                requests.head(self.url, timeout=self.timeout, allow_redirects=False)
+            except requests.RequestException:
+                # ConnectionError, Timeout e afins: tudo conta como offline
+                self.report_failure()
+                return False
+            self.report_success()
+            return True
+
+    def report_success(self):
+        """Registra uma comunicação bem-sucedida e fecha o circuito."""
+        with self._lock:
+            self.online = True
+            self.checked_at = time.monotonic()
+            self.failures = 0
+            self.open_until = 0.0
+
+    def report_failure(self):
+        """
+        Registra uma falha de rede (da sonda ou de uma chamada real); ao
+        atingir FAILURE_THRESHOLD falhas consecutivas, abre o circuito.
+        """
+        with self._lock:
+            self.online = False
+            self.checked_at = time.monotonic()
+            self.failures += 1
+            if self.failures >= self.failure_threshold:
+                self.open_until = self.checked_at + self.open_interval
+        self._wake.set()  # A thread reagenda a próxima sonda
+
+    def _probe_loop(self):
+        """Laço da thread: sonda a cada TTL ou, com o circuito aberto, ao fim dele."""
+        while True:
+            self._wake.clear()
+            delay = self.open_until - time.monotonic()
+            if delay > 0:
+                # Circuito aberto: nenhuma sonda até o fim do intervalo (meio-aberto)
+                self._wake.wait(delay)
+                continue
+            self.probe()
+            self._wake.clear()
+            # Depois de uma falha isolada, confirma logo; com conexão, espera o TTL
+            self._wake.wait(self.ttl if self.online else min(self.ttl, self.timeout * 2))
+
+
+_probe = None  # Instância única da sonda no processo
+_probe_lock = threading.Lock()
+
+
+def get_connectivity() -> ConnectivityProbe:
+    """
+    Retorna a sonda de conectividade do processo, iniciando-a na primeira
+    chamada.
+
+    Returns:
+        ConnectivityProbe: A sonda compartilhada.
+    """
+    global _probe
+    with _probe_lock:
+        if _probe is None:
+            _probe = ConnectivityProbe()
+            _probe.start()
+    return _probe
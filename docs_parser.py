@@ -0,0 +1,271 @@
+"""
+Parser incremental das perguntas de um documento do Google Docs.
+
+O documento segue o formato:
+
+    Tópico                <- título (estilo "Título 1", "Título 2"...), opcional
+    Enunciado da pergunta
+    a) Opção
+    b) Opção          <- a opção correta está em negrito
+    c) Opção
+    d) Opção
+
+O parser percorre a estrutura JSON do documento uma única vez, entregando
+cada pergunta assim que ela termina, e registra problemas de formatação por
+pergunta em vez de interromper a extração. Cada pergunta recebe como
+tópico o texto do último título que a antecede.
+"""
+
+import hashlib
+import re
+
+# Reconhece uma opção de resposta: "a) texto" ou "(a) texto". Uma opção sem
+# texto ("a)") também é reconhecida, para ser relatada em vez de virar enunciado
+OPTION_PATTERN = re.compile(r"^\(?([a-z])\)\s*(.*)$", re.DOTALL)
+
+# Quantidade de opções esperada por pergunta
+EXPECTED_OPTIONS = 4
+
+
+def question_key(question_text: str) -> str:
+    """
+    Gera a chave de uma pergunta a partir do seu enunciado normalizado
+    (sem tags HTML, sem diferença de maiúsculas e de espaços).
+
+    Args:
+        question_text (str): O enunciado da pergunta.
+
+    Returns:
+        str: O hash SHA-1 hexadecimal do enunciado normalizado.
+    """
+    text = question_text.replace("<b>", "").replace("</b>", "")
+    normalized = " ".join(text.split()).casefold()
+    return hashlib.sha1(normalized.encode("utf8")).hexdigest()
+
+
+class QuestionRecord:
+    """
+    Pergunta extraída do documento, já normalizada.
+    """
+
+    __slots__ = ("text", "options", "answer", "paragraph", "topic")
+
+    def __init__(self, text: str, paragraph: int, topic: str = ""):
+        """
+        Inicializa a pergunta com o seu enunciado.
+
+        Args:
+            text (str): O enunciado da pergunta.
+            paragraph (int): O índice do parágrafo do enunciado no documento.
+            topic (str): O tópico (último título antes da pergunta).
+        """
+        self.text = text
+        self.options = []  # Textos das opções, na ordem do documento
+        self.answer = ""  # Letra da opção correta ("" se não identificada)
+        self.paragraph = paragraph
+        self.topic = topic
+
+    def to_row(self) -> list:
+        """
+        Converte a pergunta para o formato de linha da planilha. Com menos
+        de 4 opções, as que faltam ficam vazias; as opções além da quarta
+        são descartadas (ver _finish()), para que a resposta e o tópico
+        fiquem sempre nas mesmas colunas.
+
+        Returns:
+            list: [enunciado, 4 opções, letra da resposta correta, tópico].
+        """
+        options = self.options[:EXPECTED_OPTIONS]
+        options += [""] * (EXPECTED_OPTIONS - len(options))
+        return [self.text, *options, self.answer, self.topic]
+
+
+class ParseReport:
+    """
+    Diagnósticos coletados durante a extração.
+    """
+
+    def __init__(self):
+        """Inicializa um relatório vazio."""
+        self.questions = 0  # Quantidade de perguntas entregues
+        self.diagnostics = []  # Tuplas (parágrafo, pergunta, mensagem)
+
+    def add(self, paragraph: int, question: str, message: str):
+        """
+        Registra um problema encontrado.
+
+        Args:
+            paragraph (int): Índice do parágrafo no documento.
+            question (str): Enunciado da pergunta afetada ("" se nenhuma).
+            message (str): Descrição do problema.
+        """
+        self.diagnostics.append((paragraph, question, message))
+
+    def print(self):
+        """Imprime os diagnósticos coletados."""
+        for paragraph, question, message in self.diagnostics:
+            print(f"Aviso (parágrafo {paragraph}): {message} - '{question[:60]}'")
+
+
+def _paragraph_runs(item: dict):
+    """
+    Retorna os trechos de texto (textRun) de um parágrafo.
+
+    Args:
+        item (dict): Um elemento do conteúdo do documento.
+
+    Returns:
+        list: Os textRun do parágrafo (vazia se não for um parágrafo).
+    """
+    paragraph = item.get("paragraph")
+    if paragraph is None:
+        return []
+    return [
+        element["textRun"]
+        for element in paragraph.get("elements", ())
+        if "textRun" in element
+    ]
+
+
+def _heading_style(item: dict) -> str:
+    """
+    Retorna o estilo do parágrafo se ele for um título ("HEADING_1", "TITLE"...).
+
+    Args:
+        item (dict): Um elemento do conteúdo do documento.
+
+    Returns:
+        str: O estilo do título, ou "" se o parágrafo não for um título.
+    """
+    style = item["paragraph"].get("paragraphStyle", {}).get("namedStyleType", "")
+    return style if style.startswith("HEADING") or style == "TITLE" else ""
+
+
+def _is_bold(runs: list) -> bool:
+    """Indica se algum trecho com texto visível do parágrafo está em negrito."""
+    return any(
+        run.get("textStyle", {}).get("bold") and run.get("content", "").strip()
+        for run in runs
+    )
+
+
+def _finish(question: QuestionRecord, report: ParseReport, bold_answers: int):
+    """Valida uma pergunta concluída e registra os problemas encontrados."""
+    if len(question.options) > EXPECTED_OPTIONS:
+        # A planilha tem colunas para 4 opções: as demais não são gravadas
+        last = chr(ord("a") + EXPECTED_OPTIONS - 1)
+        report.add(
+            question.paragraph,
+            question.text,
+            f"{len(question.options)} opções em vez de {EXPECTED_OPTIONS}; "
+            f"as posteriores a '{last})' foram descartadas",
+        )
+        if question.answer > last:
+            report.add(question.paragraph, question.text, "a opção correta foi descartada")
+            question.answer = ""
+    elif len(question.options) < EXPECTED_OPTIONS:
+        report.add(
+            question.paragraph,
+            question.text,
+            f"{len(question.options)} opções em vez de {EXPECTED_OPTIONS}",
+        )
+    if bold_answers == 0:
+        report.add(question.paragraph, question.text, "nenhuma opção em negrito")
+    elif bold_answers > 1:
+        report.add(
+            question.paragraph,
+            question.text,
+            f"{bold_answers} opções em negrito; usando a primeira",
+        )
+    report.questions += 1
+    return question
+
+
+def iter_questions(content, report: ParseReport = None):
+    """
+    Percorre o conteúdo do documento entregando cada pergunta assim que
+    ela é concluída.
+
+    Args:
+        content: Os elementos de body.content do documento (qualquer
+            iterável, inclusive um gerador).
+        report (ParseReport): Relatório onde registrar os diagnósticos.
+
+    Yields:
+        QuestionRecord: As perguntas, na ordem do documento.
+    """
+    if report is None:
+        report = ParseReport()
+    question = None
+    bold_answers = 0
+    topic = ""  # Texto do último título encontrado
+    for index, item in enumerate(content):
+        try:
+            runs = _paragraph_runs(item)
+            text = "".join(run.get("content", "") for run in runs).strip()
+        except (AttributeError, TypeError):
+            report.add(index, "", "elemento com estrutura inesperada ignorado")
+            continue
+        if not text:
+            continue
+
+        heading = _heading_style(item)
+        if heading:
+            # Um título encerra a pergunta anterior e define o tópico das seguintes
+            # (o título do documento, "TITLE", não é um tópico)
+            if question is not None:
+                yield _finish(question, report, bold_answers)
+                question = None
+            if heading != "TITLE":
+                topic = text
+            continue
+
+        match = OPTION_PATTERN.match(text)
+        if match is None:
+            # Um texto que não é opção inicia uma nova pergunta
+            if question is not None:
+                yield _finish(question, report, bold_answers)
+            question = QuestionRecord(text, index, topic)
+            bold_answers = 0
+            continue
+
+        if question is None:
+            report.add(index, "", f"opção sem enunciado ignorada: '{text[:40]}'")
+            continue
+        letter, option_text = match.groups()
+        expected = chr(ord("a") + len(question.options))
+        if letter != expected:
+            report.add(
+                index,
+                question.text,
+                f"opção '{letter})' fora de ordem (esperada '{expected})')",
+            )
+        option_text = option_text.strip()
+        if not option_text:
+            report.add(index, question.text, f"opção '{letter})' sem texto")
+        question.options.append(option_text)
+        if _is_bold(runs):
+            bold_answers += 1
+            if not question.answer:
+                # A resposta é a posição da opção, não a letra digitada
+                question.answer = chr(ord("a") + len(question.options) - 1)
+
+    if question is not None:
+        yield _finish(question, report, bold_answers)
+
+
+def parse_document(document: dict):
+    """
+    Extrai todas as perguntas de um documento do Google Docs.
+
+    Args:
+        document (dict): O documento retornado pela API do Google Docs.
+
+    Returns:
+        tuple: A lista de perguntas no formato de linha da planilha
+               (ver QuestionRecord.to_row()) e o ParseReport da extração.
+    """
+    report = ParseReport()
+    content = document.get("body", {}).get("content", ())
+    rows = [question.to_row() for question in iter_questions(content, report)]
+    return rows, report
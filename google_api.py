@@ -0,0 +1,287 @@
+"""
+Camada compartilhada de acesso às APIs do Google (Sheets, Drive e Docs).
+
+Todas as chamadas do processo passam por uma GoogleSession por conjunto de
+credenciais, que:
+    - reaproveita as credenciais e o token de acesso (renovado só quando
+      expira) e um pool de conexões HTTP keep-alive;
+    - repete as requisições que recebem 429 ou 5xx com backoff exponencial
+      e jitter (respeitando o cabeçalho Retry-After);
+    - agrupa leituras (GET) idênticas simultâneas em uma única requisição:
+      quem chega enquanto a mesma leitura está em andamento espera e recebe
+      a mesma resposta (single-flight).
+
+Com GOOGLE_API_ENDPOINT definido (ex.: http://127.0.0.1:8080), todas as
+URLs das APIs do Google são redirecionadas para esse endereço, com
+credenciais anônimas; é assim que o código é exercitado contra um servidor
+falso local (ver benchmarks/fake_google.py). DOCS_API_ENDPOINT continua
+aceito com o mesmo efeito.
+"""
+
+import os
+import random
+import threading
+import time
+
+import gspread
+import requests
+from google.auth.credentials import AnonymousCredentials
+from google.auth.transport.requests import AuthorizedSession
+from google.oauth2 import service_account
+from requests.adapters import HTTPAdapter
+
+import metrics
+
+# Arquivos de credenciais das contas de serviço
+SHEETS_CREDENTIALS_FILE = os.path.join(os.path.dirname(__file__), "credentials_sheets.json")
+DOCS_CREDENTIALS_FILE = os.path.join(os.path.dirname(__file__), "credentials_docs.json")
+
+# Escopos de acesso ao Google Sheets (inclui o Drive, para abrir a planilha)
+SHEETS_SCOPES = (
+    "https://spreadsheets.google.com/feeds",
+    "https://www.googleapis.com/auth/drive",
+)
+# Escopos de leitura do Google Docs
+DOCS_SCOPES = (
+    "https://www.googleapis.com/auth/documents.readonly",
+    "https://www.googleapis.com/auth/drive.readonly",
+)
+
+# Endereço alternativo para todas as APIs (ex.: um servidor falso local)
+GOOGLE_API_ENDPOINT = os.environ.get("GOOGLE_API_ENDPOINT") or os.environ.get(
+    "DOCS_API_ENDPOINT"
+)
+
+# Hosts das APIs redirecionados para GOOGLE_API_ENDPOINT
+GOOGLE_HOSTS = (
+    "https://sheets.googleapis.com",
+    "https://docs.googleapis.com",
+    "https://www.googleapis.com",
+)
+
+# Endereço base da API do Google Docs
+DOCS_API_URL = "https://docs.googleapis.com/v1/documents"
+
+# Respostas repetidas com backoff (cota excedida e erros temporários do servidor)
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Métodos que podem ser repetidos após um 5xx ou erro de conexão (o 429 é
+# sempre repetido: a requisição foi recusada sem ser executada)
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "PUT"})
+
+# Tentativas extras e limites do backoff (em segundos)
+MAX_RETRIES = 5
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 32.0
+
+# Conexões mantidas abertas por host
+POOL_SIZE = 16
+
+# Tempo máximo de conexão e de leitura das requisições (em segundos)
+REQUEST_TIMEOUT = (5, 60)
+
+
+def backoff_delay(attempt: int, retry_after: str = None) -> float:
+    """
+    Calcula a espera antes de uma nova tentativa (backoff exponencial com
+    "full jitter": um valor aleatório entre 0 e o limite da tentativa).
+
+    Args:
+        attempt (int): O número da tentativa que falhou (0 = a primeira).
+        retry_after (str): O cabeçalho Retry-After da resposta, se houver.
+
+    Returns:
+        float: A espera em segundos.
+    """
+    delay = random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2**attempt))
+    if retry_after and retry_after.isdigit():
+        delay = max(delay, min(BACKOFF_MAX, float(retry_after)))
+    return delay
+
+
+class _Flight:
+    """Uma leitura em andamento, compartilhada pelas requisições idênticas."""
+
+    __slots__ = ("done", "response", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.response = None
+        self.error = None
+
+
+class GoogleSession(AuthorizedSession):
+    """
+    Sessão HTTP autorizada com pool de conexões, repetição com backoff e
+    agrupamento de leituras idênticas simultâneas. Pode ser usada por
+    várias threads ao mesmo tempo.
+    """
+
+    def __init__(self, credentials, endpoint: str = None, max_retries: int = MAX_RETRIES):
+        """
+        Inicializa a sessão.
+
+        Args:
+            credentials: As credenciais (google.auth); o token é renovado
+                automaticamente quando expira.
+            endpoint (str): Endereço que substitui os hosts das APIs do Google.
+            max_retries (int): Tentativas extras em respostas 429/5xx.
+        """
+        super().__init__(credentials)
+        adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+        self.endpoint = endpoint.rstrip("/") if endpoint else None
+        self.max_retries = max_retries
+        self.sent = 0  # Requisições enviadas (inclui as repetições)
+        self.retries = 0  # Repetições após 429/5xx ou erro de conexão
+        self.coalesced = 0  # Leituras atendidas por uma requisição já em andamento
+        self._flights = {}  # Chave da leitura -> _Flight
+        self._flights_lock = threading.Lock()
+
+    def _rewrite(self, url: str) -> str:
+        """Redireciona as URLs das APIs do Google para o endpoint alternativo."""
+        if self.endpoint:
+            for host in GOOGLE_HOSTS:
+                if url.startswith(host):
+                    return self.endpoint + url[len(host) :]
+        return url
+
+    def request(self, method, url, **kwargs):
+        """Envia a requisição com backoff; leituras idênticas simultâneas são agrupadas."""
+        if "_credential_refresh_attempt" in kwargs:
+            # Repetição interna do AuthorizedSession após renovar o token
+            return super().request(method, url, **kwargs)
+        url = self._rewrite(url)
+        kwargs.setdefault("timeout", REQUEST_TIMEOUT)
+        method = method.upper()
+        if method != "GET" or kwargs.get("stream") or kwargs.get("data") or kwargs.get("json"):
+            return self._send(method, url, kwargs)
+        key = (url, _freeze(kwargs.get("params")), _freeze(kwargs.get("headers")))
+        with self._flights_lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            else:
+                self.coalesced += 1
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.response
+        try:
+            flight.response = self._send(method, url, kwargs)
+            return flight.response
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._flights_lock:
+                del self._flights[key]
+            flight.done.set()
+
+    def _send(self, method: str, url: str, kwargs: dict) -> requests.Response:
+        """Envia a requisição, repetindo-a com backoff em falhas temporárias."""
+        attempt = 0
+        while True:
+            self.sent += 1
+            try:
+                response = super().request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if method not in IDEMPOTENT_METHODS or attempt >= self.max_retries:
+                    raise
+                retry_after = None
+            else:
+                retryable = response.status_code == 429 or (
+                    response.status_code in RETRY_STATUSES and method in IDEMPOTENT_METHODS
+                )
+                if not retryable or attempt >= self.max_retries:
+                    return response
+                retry_after = response.headers.get("Retry-After")
+            self.retries += 1
+            delay = backoff_delay(attempt, retry_after)
+            metrics.observe("google_api_backoff", delay)
+            time.sleep(delay)
+            attempt += 1
+
+
+def _freeze(value):
+    """Converte parâmetros/cabeçalhos em algo utilizável como chave de dicionário."""
+    if value is None:
+        return None
+    if isinstance(value, dict):
+        return tuple(sorted((str(k), str(v)) for k, v in value.items()))
+    return tuple(value) if isinstance(value, (list, tuple)) else value
+
+
+_sessions = {}  # (arquivo de credenciais, escopos) -> GoogleSession
+_sessions_lock = threading.Lock()
+
+
+def get_session(credentials_file: str, scopes: tuple) -> GoogleSession:
+    """
+    Retorna a sessão compartilhada de um conjunto de credenciais, lendo o
+    arquivo da conta de serviço apenas na primeira chamada.
+
+    Args:
+        credentials_file (str): O arquivo JSON da conta de serviço.
+        scopes (tuple): Os escopos de acesso.
+
+    Returns:
+        GoogleSession: A sessão compartilhada.
+    """
+    key = (credentials_file, tuple(scopes))
+    with _sessions_lock:
+        session = _sessions.get(key)
+        if session is None:
+            if GOOGLE_API_ENDPOINT:
+                credentials = AnonymousCredentials()
+            else:
+                credentials = service_account.Credentials.from_service_account_file(
+                    credentials_file, scopes=list(scopes)
+                )
+            session = _sessions[key] = GoogleSession(credentials, GOOGLE_API_ENDPOINT)
+    return session
+
+
+_sheets_client = None  # Cliente do gspread sobre a sessão compartilhada
+_sheets_client_lock = threading.Lock()
+
+
+def get_sheets_client() -> gspread.Client:
+    """
+    Retorna o cliente do Google Sheets do processo (gspread sobre a
+    GoogleSession das credenciais do Sheets).
+
+    Returns:
+        gspread.Client: O cliente compartilhado.
+    """
+    global _sheets_client
+    with _sheets_client_lock:
+        if _sheets_client is None:
+            session = get_session(SHEETS_CREDENTIALS_FILE, SHEETS_SCOPES)
+            _sheets_client = gspread.Client(session.credentials, session=session)
+    return _sheets_client
+
+
+def get_document(document_id: str, fields: str = None) -> dict:
+    """
+    Lê um documento do Google Docs (API REST v1).
+
+    Args:
+        document_id (str): O ID do documento.
+        fields (str): Máscara de campos (ex.: "revisionId"); None = documento inteiro.
+
+    Returns:
+        dict: O documento (ou os campos pedidos).
+
+    Raises:
+        requests.HTTPError: Se a API responder com erro após as repetições.
+    """
+    session = get_session(DOCS_CREDENTIALS_FILE, DOCS_SCOPES)
+    response = session.get(
+        f"{DOCS_API_URL}/{document_id}", params={"fields": fields} if fields else None
+    )
+    response.raise_for_status()
+    return response.json()
@@ -1,9 +1,13 @@
 import threading  # Para executar a atualização das perguntas em segundo plano
+import time  # Para medir o tempo até a primeira tela
 
 import flet as ft  # Importa a biblioteca Flet para a interface gráfica
 from flet import icons  # Ícones da biblioteca Flet
 
+import metrics  # Importa a instrumentação dos trechos críticos (ligada por QUIZ_METRICS)
 import automate_spreadsheet  # Importa o módulo responsável pela automação com Google Docs/Sheets
+from bank_registry import get_bank_registry  # Importa o registro de bancos (um por certificação)
+from app.audio import DIRETORIO_AUDIO, carregar_indice  # Importa o índice dos áudios
 from app.controllers import QuizController  # Importa o controlador do quiz
 from app.models import EstadoQuiz  # Importa o modelo de estado do quiz (não utilizado no código, verificar necessidade)
 from quiz_logic import QuizLogic  # Importa a lógica do quiz (não utilizado no código, verificar necessidade)
@@ -21,6 +25,9 @@ def main(page: ft.Page):
     Args:
         page (ft.Page): Objeto página do Flet.
     """
+    # Marca o início da sessão para medir o tempo até a primeira tela
+    inicio_sessao = time.perf_counter()
+
     # Configura o título da página
     page.title = "Quiz - Scrum Foundation Professional Certification - SFPC™ (v2020)"
     # Define o alinhamento vertical do conteúdo da página para o centro
@@ -28,18 +35,6 @@ def main(page: ft.Page):
     # Define o alinhamento horizontal do conteúdo da página para o centro
     page.horizontal_alignment = ft.CrossAxisAlignment.CENTER
 
-    # Cria e inicia uma thread para atualizar as perguntas em segundo plano
-    # Isso evita que a interface do aplicativo trave durante a atualização
-    thread_atualizacao = threading.Thread(
-        target=automate_spreadsheet.monitor_google_docs,  # Função que será executada na thread
-        args=(
-            automate_spreadsheet.DOCUMENT_ID,  # ID do documento do Google Docs
-            automate_spreadsheet.SPREADSHEET_URL,  # URL da planilha do Google Sheets
-        ),
-    )
-    thread_atualizacao.daemon = True  # Define a thread como daemon (encerra quando o programa principal termina)
-    thread_atualizacao.start()  # Inicia a thread
-
     # Variável para controlar o tema escuro (False = tema claro, True = tema escuro)
     tema_escuro_ativado = False
 
@@ -119,5 +114,50 @@ def main(page: ft.Page):
     # Exibe a tela inicial do quiz
     quiz_controller.exibir_tela_inicial()
 
-# Inicializa o aplicativo Flet, definindo a função main() como ponto de entrada
-ft.app(target=main)
+    # Reporta o tempo até a primeira tela (time-to-first-screen)
+    tempo_primeira_tela = (time.perf_counter() - inicio_sessao) * 1000
+    print(f"Tempo até a primeira tela: {tempo_primeira_tela:.1f} ms")
+    metrics.observe("first_screen", tempo_primeira_tela / 1000)
+
+# Define a preparação do processo, executada uma única vez antes da primeira sessão
+def iniciar_processo():
+    """
+    Prepara o processo: métricas, áudios, bancos de perguntas e, fora do
+    modo offline, as threads de sincronização com o Google Docs (uma por
+    documento configurado).
+    """
+    # Liga o endpoint de métricas ou o log periódico, se QUIZ_METRICS estiver definida
+    metrics.configure()
+
+    # Indexa os áudios uma única vez, antes da primeira sessão
+    carregar_indice()
+
+    # No modo offline, os bancos vêm só dos arquivos locais: nada a sincronizar
+    registro = get_bank_registry()
+    if registro.offline:
+        print("Modo offline: usando o banco de perguntas local, sem sincronização.")
+        return
+
+    # Cria e inicia, uma única vez no processo, uma thread por documento do Google
+    # Docs para atualizar as planilhas em segundo plano (sem travar a interface)
+    for origem in registro.sources.values():
+        if origem.document_id:
+            thread_atualizacao = threading.Thread(
+                target=automate_spreadsheet.monitor_google_docs,  # Função que será executada na thread
+                args=(
+                    origem.document_id,  # ID do documento do Google Docs
+                    origem.spreadsheet_url,  # URL da planilha do Google Sheets
+                ),
+                kwargs={"worksheet": origem.sync_worksheet},  # Aba do banco que recebe o documento
+            )
+            thread_atualizacao.daemon = True  # Define a thread como daemon (encerra quando o programa principal termina)
+            thread_atualizacao.start()  # Inicia a thread
+
+
+# Executado como script (python main.py ou flet run main.py)
+if __name__ == "__main__":
+    iniciar_processo()
+
+    # Inicializa o aplicativo Flet, definindo a função main() como ponto de entrada
+    # e servindo os áudios como assets (o cliente os baixa e guarda em cache)
+    ft.app(target=main, assets_dir=DIRETORIO_AUDIO)
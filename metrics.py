@@ -0,0 +1,260 @@
+"""
+Instrumentação dos trechos críticos do servidor do quiz.
+
+Mede a duração de trechos nomeados (download da planilha, extração do
+Google Docs, leitura do cache, renderização das perguntas, page.update,
+ticks do timer) e expõe esses tempos, junto com medidores instantâneos
+(sessões ativas, inscrições no timer, threads vivas), em um endpoint
+local no formato de texto do Prometheus ou em um log estruturado
+periódico (uma linha JSON por intervalo).
+
+A instrumentação fica desligada por padrão. Desligada, span() retorna
+sempre o mesmo gerenciador de contexto vazio, sem ler o relógio nem
+tomar locks. Para ligá-la, defina a variável de ambiente QUIZ_METRICS:
+
+    QUIZ_METRICS=9100        endpoint em http://127.0.0.1:9100/metrics
+    QUIZ_METRICS=log         log a cada 60 segundos na saída padrão
+    QUIZ_METRICS=log:10      log a cada 10 segundos
+"""
+
+import contextlib
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Limites (em segundos) dos intervalos do histograma de cada trecho
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Intervalo padrão (em segundos) do log periódico
+LOG_INTERVAL = 60
+
+# Prefixo dos nomes das métricas exportadas
+PREFIX = "quiz"
+
+_enabled = False  # Se a instrumentação está ligada (ver configure())
+_lock = threading.Lock()  # Protege as estatísticas dos trechos
+_spans = {}  # Para cada trecho: [contagem, soma, máximo, contagens por intervalo]
+_gauges = {}  # Para cada medidor: função sem argumentos que retorna o valor
+_NOOP = contextlib.nullcontext()  # Retornado por span() quando desligada
+
+
+class _Span:
+    """Gerenciador de contexto que mede a duração de um trecho."""
+
+    __slots__ = ("name", "start")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        observe(self.name, time.perf_counter() - self.start)
+        return False
+
+
+def enabled() -> bool:
+    """bool: Se a instrumentação está ligada."""
+    return _enabled
+
+
+def span(name: str):
+    """
+    Mede a duração do bloco "with" como uma ocorrência do trecho.
+
+    Args:
+        name (str): O nome do trecho (ex.: "sheet_download").
+
+    Returns:
+        Um gerenciador de contexto (vazio se a instrumentação estiver desligada).
+    """
+    if not _enabled:
+        return _NOOP
+    return _Span(name)
+
+
+def observe(name: str, seconds: float):
+    """
+    Registra uma duração já medida para o trecho.
+
+    Args:
+        name (str): O nome do trecho.
+        seconds (float): A duração, em segundos.
+    """
+    if not _enabled:
+        return
+    bucket = bisect_left(BUCKETS, seconds)
+    with _lock:
+        stats = _spans.get(name)
+        if stats is None:
+            stats = _spans[name] = [0, 0.0, 0.0, [0] * (len(BUCKETS) + 1)]
+        stats[0] += 1
+        stats[1] += seconds
+        if seconds > stats[2]:
+            stats[2] = seconds
+        stats[3][bucket] += 1
+
+
+def register_gauge(name: str, function):
+    """
+    Registra um medidor, avaliado apenas quando as métricas são lidas.
+
+    Args:
+        name (str): O nome do medidor (ex.: "sessions_active").
+        function: Função sem argumentos que retorna o valor atual.
+    """
+    _gauges[name] = function
+
+
+def _read_gauges() -> dict:
+    """Avalia os medidores registrados (ignorando os que falharem)."""
+    values = {}
+    for name, function in list(_gauges.items()):
+        try:
+            values[name] = function()
+        except Exception:
+            continue
+    return values
+
+
+def snapshot() -> dict:
+    """
+    Retorna uma cópia das métricas atuais.
+
+    Returns:
+        dict: {"spans": {nome: {count, sum, max, mean}}, "gauges": {nome: valor}}.
+    """
+    with _lock:
+        spans = {
+            name: {
+                "count": count,
+                "sum": round(total, 6),
+                "max": round(maximum, 6),
+                "mean": round(total / count, 6) if count else 0.0,
+            }
+            for name, (count, total, maximum, _) in _spans.items()
+        }
+    return {"spans": spans, "gauges": _read_gauges()}
+
+
+def render() -> str:
+    """
+    Formata as métricas atuais no formato de texto do Prometheus.
+
+    Returns:
+        str: Um histograma por trecho e um medidor por medidor registrado.
+    """
+    lines = [
+        f"# HELP {PREFIX}_span_seconds Duração dos trechos instrumentados.",
+        f"# TYPE {PREFIX}_span_seconds histogram",
+    ]
+    with _lock:
+        spans = [(name, stats[0], stats[1], list(stats[3])) for name, stats in _spans.items()]
+    for name, count, total, buckets in sorted(spans):
+        cumulative = 0
+        for limit, bucket_count in zip(BUCKETS, buckets):
+            cumulative += bucket_count
+            lines.append(f'{PREFIX}_span_seconds_bucket{{span="{name}",le="{limit}"}} {cumulative}')
+        lines.append(f'{PREFIX}_span_seconds_bucket{{span="{name}",le="+Inf"}} {count}')
+        lines.append(f'{PREFIX}_span_seconds_sum{{span="{name}"}} {total:.6f}')
+        lines.append(f'{PREFIX}_span_seconds_count{{span="{name}"}} {count}')
+    for name, value in sorted(_read_gauges().items()):
+        lines.append(f"# TYPE {PREFIX}_{name} gauge")
+        lines.append(f"{PREFIX}_{name} {value}")
+    return "\n".join(lines) + "\n"
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    """Responde GET /metrics com as métricas no formato do Prometheus."""
+
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body = render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Não polui a saída do servidor a cada coleta
+
+
+def start_http_server(port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """
+    Inicia o endpoint de métricas em uma thread daemon.
+
+    Args:
+        port (int): A porta local do endpoint.
+        host (str): O endereço de escuta (apenas local por padrão).
+
+    Returns:
+        ThreadingHTTPServer: O servidor iniciado.
+    """
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def start_periodic_log(interval: float = LOG_INTERVAL) -> threading.Thread:
+    """
+    Inicia uma thread daemon que imprime as métricas como uma linha JSON
+    a cada intervalo.
+
+    Args:
+        interval (float): O intervalo entre as linhas, em segundos.
+
+    Returns:
+        threading.Thread: A thread iniciada.
+    """
+
+    def _log_loop():
+        while True:
+            time.sleep(interval)
+            print(json.dumps({"metrics": snapshot(), "time": time.time()}))
+
+    thread = threading.Thread(target=_log_loop, daemon=True)
+    thread.start()
+    return thread
+
+
+def configure(spec: str = None) -> bool:
+    """
+    Liga a instrumentação conforme a especificação (por padrão, a variável
+    de ambiente QUIZ_METRICS) e inicia o endpoint ou o log periódico.
+
+    Args:
+        spec (str): "PORTA", "log" ou "log:SEGUNDOS". Vazio mantém desligada.
+
+    Returns:
+        bool: True se a instrumentação foi ligada.
+    """
+    global _enabled
+    if spec is None:
+        spec = os.environ.get("QUIZ_METRICS", "")
+    spec = spec.strip().lower()
+    if not spec:
+        return False
+    try:
+        if spec == "log" or spec.startswith("log:"):
+            interval = float(spec[4:]) if spec.startswith("log:") else LOG_INTERVAL
+            _enabled = True
+            start_periodic_log(interval)
+            print(f"Métricas: log a cada {interval:g} s")
+        else:
+            port = int(spec)
+            start_http_server(port)
+            _enabled = True
+            print(f"Métricas: http://127.0.0.1:{port}/metrics")
+    except (ValueError, OSError) as e:
+        print(f"Métricas desligadas (QUIZ_METRICS={spec!r}): {e}")
+        return False
+    return True
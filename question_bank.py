@@ -0,0 +1,469 @@
+from array import array
+from collections.abc import Sequence
+import os
+import threading
+
+import metrics
+from connectivity import get_connectivity
+from docs_parser import question_key
+from bank_format import BinaryBank, bank_versions, latest_bank_file, versioned_path, write_bank
+from question_cache import CacheReader, content_hash, write_cache
+from sampling import StratifiedSampler
+
+# URL da planilha do Google Sheets com o banco de perguntas
+SPREADSHEET_URL = "https://docs.google.com/spreadsheets/d/1Qg4BoRVHHniWdfibKovZr1x3ZuYHZ9pG9mmhNdZFmWM/edit?usp=sharing"
+
+# Arquivo de cache local do banco de perguntas
+CACHE_FILE = "quiz_cache.json"
+
+# Arquivo do banco no formato binário indexado (ver bank_format.py)
+BANK_FILE = "quiz_bank.bin"
+
+# Intervalo (em segundos) entre as atualizações agendadas do banco
+REFRESH_INTERVAL = 300  # 5 minutos
+
+# Peso relativo de cada tópico nas tentativas (tópico -> peso). Vazio: cada
+# tópico recebe perguntas em proporção à sua quantidade de perguntas no banco
+TOPIC_QUOTAS = {}
+
+
+def letter_to_index(letter: str) -> int:
+    """
+    Converte a letra da resposta correta ("a" a "d") no índice da opção.
+
+    Args:
+        letter (str): A letra da resposta, como gravada na planilha.
+
+    Returns:
+        int: O índice da opção correta (0 a 3), ou -1 se a letra for inválida.
+    """
+    letter = letter.strip().lower()
+    if len(letter) != 1 or not "a" <= letter <= "z":
+        return -1
+    return ord(letter) - ord("a")
+
+
+class QuestionStore(Sequence):
+    """
+    Armazenamento imutável e compacto do banco de perguntas.
+
+    Os textos ficam em um único pool sem repetições (opções como "Todas as
+    anteriores" ou as letras das respostas são guardadas uma só vez), e cada
+    registro é um intervalo de um array de índices para esse pool. A
+    resposta correta é guardada já como índice numérico.
+    """
+
+    __slots__ = ("_strings", "_fields", "_offsets", "_answers")
+
+    def __init__(self, all_questions):
+        """
+        Constrói o armazenamento a partir das linhas do banco.
+
+        Args:
+            all_questions: As linhas [pergunta, opções..., resposta, ...].
+        """
+        pool = {}
+        fields = array("I")
+        offsets = array("I", [0])
+        answers = array("b")
+        for question in all_questions:
+            for field in question:
+                fields.append(pool.setdefault(field, len(pool)))
+            offsets.append(len(fields))
+            answers.append(letter_to_index(question[5]) if len(question) > 5 else -1)
+        self._strings = tuple(pool)
+        self._fields = fields
+        self._offsets = offsets
+        self._answers = answers
+
+    def __len__(self):
+        return len(self._answers)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        strings = self._strings
+        return tuple(
+            strings[field]
+            for field in self._fields[self._offsets[i] : self._offsets[i + 1]]
+        )
+
+    def answer_index(self, i: int) -> int:
+        """
+        Retorna o índice da opção correta de uma pergunta.
+
+        Args:
+            i (int): O índice da pergunta no banco.
+
+        Returns:
+            int: O índice da opção correta (-1 se inválida).
+        """
+        return self._answers[i]
+
+
+class QuestionSample(Sequence):
+    """
+    Visão somente leitura de um sorteio de perguntas sobre o banco
+    compartilhado. Guarda apenas os índices sorteados e uma referência
+    às linhas do banco vigente no momento do sorteio, sem copiá-las.
+    """
+
+    __slots__ = ("_rows", "_indices")
+
+    def __init__(self, rows: Sequence, indices: list):
+        """
+        Inicializa a visão do sorteio.
+
+        Args:
+            rows (Sequence): As linhas do banco no momento do sorteio.
+            indices (list): Os índices sorteados, na ordem da tentativa.
+        """
+        self._rows = rows
+        self._indices = indices
+
+    def __len__(self):
+        return len(self._indices)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return QuestionSample(self._rows, self._indices[i])
+        return self._rows[self._indices[i]]
+
+    @property
+    def rows(self):
+        """Sequence: As linhas do banco no momento do sorteio."""
+        return self._rows
+
+    @property
+    def indices(self):
+        """list: Os índices das perguntas sorteadas no banco."""
+        return self._indices
+
+    def answer_index(self, i: int) -> int:
+        """
+        Retorna o índice da opção correta da i-ésima pergunta sorteada.
+
+        Args:
+            i (int): A posição da pergunta no sorteio.
+
+        Returns:
+            int: O índice da opção correta (-1 se inválida).
+        """
+        index = self._indices[i]
+        if isinstance(self._rows, QuestionStore):
+            return self._rows.answer_index(index)
+        row = self._rows[index]
+        return letter_to_index(row[5]) if len(row) > 5 else -1
+
+
+class QuestionBank:
+    """
+    Banco de perguntas compartilhado por todas as sessões do processo.
+
+    O banco é carregado uma única vez (cache primeiro) e atualizado a
+    partir do Google Sheets por uma thread agendada. Cada atualização
+    substitui a tupla de linhas por uma nova, de modo que os sorteios já
+    feitos continuam válidos sobre a versão anterior (copy-on-write).
+    """
+
+    def __init__(
+        self,
+        spreadsheet_url: str = SPREADSHEET_URL,
+        cache_file: str = CACHE_FILE,
+        refresh_interval: int = REFRESH_INTERVAL,
+        bank_file: str = None,
+        worksheets: tuple = (),
+    ):
+        """
+        Inicializa o banco de perguntas (vazio até a chamada de load()).
+
+        Args:
+            spreadsheet_url (str): URL da planilha do Google Sheets.
+            cache_file (str): Caminho do arquivo de cache local.
+            refresh_interval (int): Intervalo entre atualizações agendadas.
+            bank_file (str): Caminho do banco binário. Se informado, o banco
+                é servido a partir dele via mmap (registros decodificados sob
+                demanda) e regravado a cada atualização.
+            worksheets (tuple): Os nomes das abas com perguntas, concatenadas
+                nessa ordem. Vazio = apenas a primeira aba.
+        """
+        self.spreadsheet_url = spreadsheet_url
+        self.worksheets = tuple(worksheets)
+        self.cache_file = cache_file
+        self.bank_file = bank_file
+        self.refresh_interval = refresh_interval
+        self.rows = ()  # QuestionStore (ou BinaryBank) do banco vigente
+        self.version = 0  # Incrementada a cada troca do banco
+        self.content_hash = None  # Hash do conteúdo do banco vigente
+        self.revision = None  # Revisão da planilha do banco vigente
+        self.topic_quotas = TOPIC_QUOTAS  # Cotas por tópico dos sorteios
+        self.sampler = None  # StratifiedSampler do banco vigente (criado no 1º sorteio)
+        self.key_index = None  # question_key -> índice no banco vigente (criado sob demanda)
+        self.rejected_files = 0  # Arquivos binários inválidos encontrados por load_binary()
+        self.cache_reader = CacheReader(cache_file)
+        self.spreadsheet = None  # Conectada sob demanda em _connect_sheets()
+        self.sheets = None  # Abas com perguntas (gspread.Worksheet)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self.refresh_thread = None
+
+    def __len__(self):
+        return len(self.rows)
+
+    def set_rows(self, all_questions: list, digest: str = None, revision=None):
+        """
+        Substitui atomicamente as linhas do banco.
+
+        Args:
+            all_questions (list): O novo banco completo de perguntas.
+            digest (str): O hash do conteúdo, se já calculado.
+            revision: A revisão da planilha de origem, se conhecida.
+        """
+        rows = QuestionStore(all_questions)
+        self._swap(rows, digest or content_hash(rows), revision)
+
+    def _swap(self, rows, digest: str, revision):
+        """Troca as linhas do banco e seus metadados sob o lock."""
+        with self._lock:
+            previous = self.rows
+            self.rows = rows
+            self.sampler = None  # As tabelas de alias são refeitas para o novo banco
+            self.key_index = None
+            self.content_hash = digest
+            self.revision = revision
+            self.version += 1
+        # Uma versão substituída é apagada quando a última tentativa que a usa
+        # terminar (o arquivo base é mantido: é o banco da próxima partida)
+        if isinstance(previous, BinaryBank) and previous.bank_file != self.bank_file:
+            previous.retire()
+
+    def _get_sampler(self):
+        """
+        Retorna as linhas vigentes e o seu sorteador estratificado,
+        construindo as tabelas de alias uma única vez por versão do banco.
+        """
+        with self._lock:
+            rows, sampler = self.rows, self.sampler
+            if sampler is None:
+                sampler = self.sampler = StratifiedSampler(rows)
+        return rows, sampler
+
+    def draw(self, k: int, recent=None) -> QuestionSample:
+        """
+        Sorteia k perguntas do banco vigente sem copiar as linhas,
+        distribuídas entre os tópicos conforme as cotas (ver sampling.py).
+
+        Args:
+            k (int): Quantidade de perguntas a sortear.
+            recent: Índices vistos recentemente, sorteados com menor
+                probabilidade (válidos para a mesma versão do banco).
+
+        Returns:
+            QuestionSample: A visão sobre as perguntas sorteadas.
+        """
+        rows, sampler = self._get_sampler()
+        if not rows:
+            return QuestionSample(rows, [])
+        return QuestionSample(rows, sampler.draw(k, self.topic_quotas, recent))
+
+    def locate(self, keys) -> QuestionSample:
+        """
+        Monta uma tentativa com as perguntas indicadas pelas suas chaves,
+        ignorando as que não existem mais no banco vigente. O índice das
+        chaves é construído uma única vez por versão do banco.
+
+        Args:
+            keys: As chaves das perguntas (ver question_key), na ordem desejada.
+
+        Returns:
+            QuestionSample: A visão sobre as perguntas encontradas.
+        """
+        with self._lock:
+            rows, key_index = self.rows, self.key_index
+            if key_index is None:
+                key_index = self.key_index = {
+                    question_key(row[0]): i for i, row in enumerate(rows)
+                }
+        indices = [key_index[key] for key in keys if key in key_index]
+        return QuestionSample(rows, indices)
+
+    def load(self, download: bool = True):
+        """
+        Carrega o banco a partir do banco binário ou do cache. Sem nenhum
+        dos dois disponível, faz um download bloqueante do Google Sheets.
+
+        Args:
+            download (bool): False = nunca baixa (modo offline); o banco
+                fica vazio se não houver binário nem cache.
+        """
+        if not (self.load_binary() or self.load_from_cache()):
+            if not download:
+                print(f"Banco indisponível offline: {self.bank_file or self.cache_file}")
+                return
+            print("Cache indisponível. Carregando do Google Sheets...")
+            self.refresh()
+
+    def load_from_cache(self) -> bool:
+        """
+        Carrega o banco a partir do arquivo de cache, se o arquivo mudou
+        desde a última leitura (ver CacheReader).
+
+        Returns:
+            bool: True se um novo conteúdo foi carregado.
+        """
+        with metrics.span("cache_load"):
+            data = self.cache_reader.poll()
+            if data is None or data["hash"] == self.content_hash:
+                return False
+            self.set_rows(data["questions"], data["hash"], data.get("revision"))
+            return True
+
+    def load_binary(self) -> bool:
+        """
+        Passa a servir o banco a partir do arquivo binário mais recente
+        (o arquivo base ou a última versão gravada por refresh()), se ele
+        existir e tiver conteúdo diferente do banco vigente.
+
+        Returns:
+            bool: True se um novo conteúdo foi carregado.
+        """
+        path = self.bank_file and latest_bank_file(self.bank_file)
+        if path is None:
+            return False
+        try:
+            with metrics.span("bank_load"):
+                bank = BinaryBank(path)
+        except (OSError, ValueError) as e:
+            self.rejected_files += 1
+            print(f"Banco binário ignorado: {e}")
+            if isinstance(e, ValueError) and path != self.bank_file:
+                # Versão truncada (gravação interrompida): apagada para não ser
+                # escolhida de novo; a próxima atualização a regrava
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            return False
+        if bank.content_hash == self.content_hash:
+            bank.close()
+            return False
+        self._swap(bank, bank.content_hash, self.revision)
+        # Apaga as versões mais antigas (deixadas por execuções anteriores ou
+        # ainda mapeadas: no Linux o mapeamento continua válido; no Windows a
+        # remoção falha e fica para BinaryBank.retire())
+        for stale in bank_versions(self.bank_file):
+            if stale != path:
+                try:
+                    os.remove(stale)
+                except OSError:
+                    pass
+        return True
+
+    def check_internet_connection(self):
+        """
+        Verifica a conexão com a internet a partir do estado mantido pela
+        sonda do processo (ver connectivity.py), sem requisição própria.
+        """
+        return get_connectivity().is_online()
+
+    def _connect_sheets(self) -> list:
+        """Abre a planilha e as suas abas com o cliente compartilhado (uma vez)."""
+        if self.sheets is None:
+            # Adiado: o gspread e o google-auth só são carregados na primeira sincronização
+            from google_api import get_sheets_client
+
+            self.spreadsheet = get_sheets_client().open_by_url(self.spreadsheet_url)
+            if self.worksheets:
+                self.sheets = [self.spreadsheet.worksheet(name) for name in self.worksheets]
+            else:
+                self.sheets = [self.spreadsheet.sheet1]
+        return self.sheets
+
+    def _sheet_revision(self):
+        """Retorna a data da última alteração da planilha, se disponível."""
+        try:
+            return self.spreadsheet.get_lastUpdateTime()
+        except Exception:
+            return None
+
+    def refresh(self, executor=None) -> bool:
+        """
+        Baixa o banco do Google Sheets e, se o conteúdo mudou, regrava o
+        cache atomicamente e troca o banco em memória. Sem conexão, apenas
+        recarrega o cache se outro processo o tiver alterado.
+
+        Args:
+            executor (Executor): Pool onde as abas são baixadas em paralelo
+                (ver bank_registry.py). None = uma aba após a outra.
+
+        Returns:
+            bool: True se o banco foi atualizado.
+        """
+        if not self.check_internet_connection():
+            return self.load_binary() or self.load_from_cache()
+        import requests  # Adiado: só é necessário quando há sincronização
+
+        try:
+            sheets = self._connect_sheets()
+            parts = (executor.map if executor else map)(download_worksheet, sheets)
+            all_questions = [row for part in parts for row in part]
+            revision = self._sheet_revision()
+            digest = write_cache(
+                self.cache_file, all_questions, revision, self.content_hash
+            )
+            if digest is None:
+                return False  # Conteúdo inalterado: nada a gravar ou trocar
+            self.cache_reader.mark_written(digest)
+            if self.bank_file is not None:
+                # Grava uma nova versão em vez de substituir o arquivo mapeado
+                path = versioned_path(self.bank_file, digest)
+                if os.path.exists(path):
+                    os.utime(path)  # Mesmo conteúdo: volta a ser a mais recente
+                else:
+                    write_bank(path, all_questions, digest)
+                self.revision = revision
+                return self.load_binary()
+            self.set_rows(all_questions, digest, revision)
+            return True
+        except requests.RequestException as e:
+            # Falha de rede: alimenta o circuit breaker e usa o cache até a volta
+            get_connectivity().report_failure()
+            print(f"Erro ao atualizar o banco de perguntas: {e}")
+            return False
+        except Exception as e:
+            print(f"Erro ao atualizar o banco de perguntas: {e}")
+            return False
+
+    def start_scheduled_refresh(self):
+        """Inicia a thread que atualiza o banco periodicamente."""
+        if self.refresh_thread is None:
+            self.refresh_thread = threading.Thread(
+                target=self._refresh_loop, daemon=True
+            )
+            self.refresh_thread.start()
+
+    def stop_scheduled_refresh(self):
+        """Interrompe a thread de atualização agendada."""
+        self._stop.set()
+
+    def _refresh_loop(self):
+        """Atualiza o banco imediatamente e, depois, a cada intervalo."""
+        while not self._stop.is_set():
+            self.refresh()
+            self._stop.wait(self.refresh_interval)
+
+
+def download_worksheet(sheet) -> list:
+    """
+    Baixa as perguntas de uma aba (todas as linhas, menos o cabeçalho).
+
+    Args:
+        sheet (gspread.Worksheet): A aba da planilha.
+
+    Returns:
+        list: As linhas de perguntas da aba.
+    """
+    with metrics.span("sheet_download"):
+        return sheet.get_all_values()[1:]
@@ -0,0 +1,153 @@
+import hashlib
+import json
+import os
+import tempfile
+
+# Versão do formato do arquivo de cache
+# (versão 1: lista de perguntas pura, sem cabeçalho)
+SCHEMA_VERSION = 2
+
+
+def content_hash(all_questions) -> str:
+    """
+    Calcula o hash do conteúdo de um banco de perguntas.
+
+    Args:
+        all_questions: O banco completo (lista de listas ou tupla de tuplas).
+
+    Returns:
+        str: O hash SHA-256 hexadecimal do conteúdo.
+    """
+    payload = json.dumps(
+        [list(question) for question in all_questions],
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf8")).hexdigest()
+
+
+def read_cache(cache_file: str) -> dict:
+    """
+    Lê o arquivo de cache, aceitando também o formato antigo
+    (lista de perguntas sem cabeçalho).
+
+    Args:
+        cache_file (str): Caminho do arquivo de cache.
+
+    Returns:
+        dict: O cabeçalho ("schema", "hash", "revision") e as perguntas
+              ("questions").
+
+    Raises:
+        FileNotFoundError: Se o arquivo não existir.
+        json.JSONDecodeError: Se o arquivo não for um JSON válido.
+    """
+    with open(cache_file, "r", encoding="utf8") as f:
+        data = json.load(f)
+    if isinstance(data, list):
+        # Formato antigo: calcula o hash para permitir comparações
+        return {
+            "schema": 1,
+            "hash": content_hash(data),
+            "revision": None,
+            "questions": data,
+        }
+    return data
+
+
+def write_cache(cache_file: str, all_questions, revision=None, previous_hash=None):
+    """
+    Grava o banco no arquivo de cache de forma atômica (arquivo temporário
+    no mesmo diretório + os.replace), apenas se o conteúdo mudou.
+
+    Args:
+        cache_file (str): Caminho do arquivo de cache.
+        all_questions: O banco completo de perguntas.
+        revision: Identificador da revisão da planilha (opcional).
+        previous_hash (str): Hash do conteúdo já gravado, se conhecido.
+
+    Returns:
+        str: O hash do conteúdo, ou None se nada foi gravado porque o
+             conteúdo não mudou.
+    """
+    digest = content_hash(all_questions)
+    if digest == previous_hash:
+        return None
+    data = {
+        "schema": SCHEMA_VERSION,
+        "hash": digest,
+        "revision": revision,
+        "questions": [list(question) for question in all_questions],
+    }
+    directory = os.path.dirname(os.path.abspath(cache_file))
+    fd, temp_path = tempfile.mkstemp(
+        prefix=".quiz_cache.", suffix=".tmp", dir=directory
+    )
+    try:
+        with os.fdopen(fd, "w", encoding="utf8") as f:
+            json.dump(data, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, cache_file)  # Troca atômica do arquivo
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+    return digest
+
+
+class CacheReader:
+    """
+    Leitor do arquivo de cache que só relê o conteúdo quando o arquivo
+    muda (mtime/tamanho) e só o entrega quando o hash do conteúdo muda.
+    """
+
+    def __init__(self, cache_file: str):
+        """
+        Inicializa o leitor.
+
+        Args:
+            cache_file (str): Caminho do arquivo de cache.
+        """
+        self.cache_file = cache_file
+        self.stat_key = None  # (mtime_ns, tamanho) da última leitura
+        self.hash = None  # Hash do último conteúdo entregue
+
+    def poll(self):
+        """
+        Relê o cache se o arquivo mudou desde a última chamada.
+
+        Returns:
+            dict: O cache lido (ver read_cache()), ou None se o arquivo não
+                  existe, não mudou ou tem o mesmo conteúdo já entregue.
+        """
+        try:
+            stat = os.stat(self.cache_file)
+        except FileNotFoundError:
+            return None
+        stat_key = (stat.st_mtime_ns, stat.st_size)
+        if stat_key == self.stat_key:
+            return None
+        try:
+            data = read_cache(self.cache_file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        self.stat_key = stat_key
+        if data["hash"] == self.hash:
+            return None
+        self.hash = data["hash"]
+        return data
+
+    def mark_written(self, digest: str):
+        """
+        Registra um conteúdo gravado por este processo, para que a
+        próxima chamada de poll() não o releia como mudança.
+
+        Args:
+            digest (str): O hash do conteúdo gravado.
+        """
+        self.hash = digest
+        try:
+            stat = os.stat(self.cache_file)
+            self.stat_key = (stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            self.stat_key = None
@@ -1,10 +1,17 @@
-import gspread
-from oauth2client.service_account import ServiceAccountCredentials
 import random
 import time
-import os
-import json
-import requests
+from collections import deque
+
+from adaptive import AdaptiveSelector, get_difficulty_index
+from app.models import Pergunta
+from bank_registry import get_question_bank
+from question_bank import QuestionBank, QuestionSample
+
+# Quantidade de perguntas sorteadas por tentativa
+QUESTIONS_PER_ATTEMPT = 40
+
+# Quantidade de perguntas preparadas antecipadamente (embaralhadas e formatadas)
+PREFETCH_SIZE = 3
 
 
 class QuizLogic:
@@ -12,30 +19,31 @@ class QuizLogic:
     Classe responsável por gerenciar a lógica do quiz.
     """
 
-    def __init__(self):
+    def __init__(self, bank: QuestionBank = None, adaptive: bool = False):
         """
-        Inicializa a lógica do quiz, carregando as perguntas
-        e inicializando variáveis de controle.
+        Inicializa a lógica do quiz e as variáveis de controle. As
+        perguntas só são sorteadas em new_attempt(), quando a tentativa
+        começa.
+
+        Args:
+            bank (QuestionBank): O banco de perguntas a usar. Por padrão,
+                o banco compartilhado do processo (get_question_bank()),
+                carregado do cache e atualizado em segundo plano.
+            adaptive (bool): Se True, cada pergunta é escolhida conforme o
+                desempenho até ali (ver adaptive.py), em vez do sorteio
+                das 40 perguntas no início da tentativa.
         """
-        self.scope = [
-            "https://spreadsheets.google.com/feeds",
-            "https://www.googleapis.com/auth/drive",
-        ]
-        self.creds = ServiceAccountCredentials.from_json_keyfile_name(
-            "credentials_sheets.json", self.scope
-        )
-        self.client = gspread.authorize(self.creds)
-        self.sheet = self.client.open_by_url(
-            "https://docs.google.com/spreadsheets/d/1Qg4BoRVHHniWdfibKovZr1x3ZuYHZ9pG9mmhNdZFmWM/edit?usp=sharing"
-        ).sheet1
-        self.cache_file = "quiz_cache.json"
-        self.questions = []  # Inicializa como lista vazia
+        self.bank = bank if bank is not None else get_question_bank()
+        self.adaptive = adaptive
+        self.selector = None  # Estado adaptativo da tentativa (modo adaptativo)
+        self.questions = QuestionSample(self.bank.rows, [])  # Sorteadas em new_attempt()
+        self.prepared = deque()  # Próximas perguntas já preparadas
+        self.prepared_until = 0  # Posição da próxima pergunta a preparar
         self.current_question = 0
         self.score = 0
         self.time_limit = 3600
         self.start_time = time.time()
         self.timer_running = False
-        self.load_questions()  # Carrega as perguntas ao iniciar
 
     def start_timer(self):
         """Inicia o cronômetro do quiz."""
@@ -58,32 +66,207 @@ class QuizLogic:
             self.time_limit = max(0, 3600 - elapsed_time)
         return self.time_limit
 
-    def load_question(self):
+    def new_attempt(self, adaptive: bool = None):
         """
-        Carrega a próxima pergunta do quiz, embaralhando
-        as alternativas a cada chamada.
+        Prepara uma nova tentativa, sorteando as perguntas a partir do
+        banco mais recente (inclusive um banco trocado em segundo plano).
+
+        Args:
+            adaptive (bool): Muda o modo da tentativa (None mantém o atual).
         """
-        if self.current_question < len(self.questions):
-            question_data = self.questions[self.current_question]
-            question_text = f"{self.current_question + 1}. {question_data[0]}"
+        if adaptive is not None:
+            self.adaptive = adaptive
+        # As perguntas já exibidas na tentativa anterior, sobre o mesmo banco,
+        # ficam menos prováveis no novo sorteio
+        previous = self.questions
+        recent = None
+        if self.current_question and previous.rows is self.bank.rows:
+            recent = set(previous.indices[: self.current_question])
+        self.current_question = 0
+        self.score = 0
+        if self.adaptive:
+            # As perguntas são escolhidas uma a uma em next_question()
+            index = get_difficulty_index(self.bank)
+            self.selector = AdaptiveSelector(index)
+            self.questions = QuestionSample(index.rows, [])
+        else:
+            self.selector = None
+            self.questions = self.bank.draw(QUESTIONS_PER_ATTEMPT, recent)
+        self.prepared.clear()
+        self.prepared_until = 0
 
-            # 1. Copia as opções e embaralha
-            options = question_data[1:5].copy()
-            random.shuffle(options)
+    def new_review(self, keys, limit: int = None):
+        """
+        Prepara uma tentativa de revisão com as perguntas indicadas (ver
+        review.py), na ordem recebida e sem o modo adaptativo.
 
-            # 2. Calcula o índice da resposta correta na lista ORIGINAL
-            correct_answer_index = ord(question_data[5].lower()) - ord("a")
+        Args:
+            keys: As chaves das perguntas a revisar (ver question_key).
+                Chaves de outros bancos são ignoradas.
+            limit (int): Quantidade máxima de perguntas (None = todas).
+        """
+        self.current_question = 0
+        self.score = 0
+        self.selector = None
+        self.questions = self.bank.locate(keys)[:limit]
+        self.prepared.clear()
+        self.prepared_until = 0
+
+    def clear(self):
+        """
+        Descarta a tentativa (sorteio e perguntas preparadas), liberando a
+        memória da sessão; a próxima tentativa começa com new_attempt().
+        """
+        self.current_question = 0
+        self.score = 0
+        self.selector = None
+        self.questions = QuestionSample(self.bank.rows, [])
+        self.prepared.clear()
+        self.prepared_until = 0
 
-            # 3. Encontra a resposta correta na lista embaralhada
-            correct_answer = question_data[1:5][correct_answer_index]
+    def restore(self, keys, shown, results, adaptive: bool = False) -> bool:
+        """
+        Retoma uma tentativa interrompida (ver checkpoint.py): as mesmas
+        perguntas, na mesma ordem, a partir da primeira não respondida. A
+        pergunta que estava na tela volta com as opções na mesma ordem.
 
-            # 4. Encontra o índice da resposta correta na lista EMBARALHADA
-            correct_answer_index = options.index(correct_answer)
+        Args:
+            keys: As chaves das perguntas sorteadas (vazio no modo adaptativo).
+            shown (list): (chave, ordem das opções) de cada pergunta já exibida.
+            results (list): O acerto de cada pergunta já respondida.
+            adaptive (bool): Se a tentativa é adaptativa.
 
-            self.current_question += 1
-            return question_text, options, correct_answer_index
+        Returns:
+            bool: False se alguma pergunta não existe mais no banco vigente.
+        """
+        if adaptive:
+            index = get_difficulty_index(self.bank)
+            sample = self.bank.locate([key for key, _ in shown])
+            if len(sample) != len(shown) or sample.rows is not index.rows:
+                return False
+            # Refaz a estimativa de habilidade com os resultados já obtidos
+            selector = AdaptiveSelector(index)
+            selector.used.update(sample.indices)
+            for question_index, correct in zip(sample.indices, results):
+                selector.last = question_index
+                selector.record(correct)
+            if len(shown) > len(results):
+                selector.last = sample.indices[len(results)]  # A pergunta que estava na tela
+            self.selector = selector
+            self.questions = QuestionSample(index.rows, list(sample.indices))
         else:
+            sample = self.bank.locate(keys)
+            if len(sample) != len(keys):
+                return False
+            self.selector = None
+            self.questions = sample
+        self.current_question = len(results)
+        self.score = sum(results)
+        self.prepared.clear()
+        self.prepared_until = self.current_question
+        if len(shown) > self.current_question:
+            order = shown[self.current_question][1]
+            self.prepared.append(self.prepare_question(self.current_question, order))
+            self.prepared_until += 1
+        return True
+
+    def prepare_question(self, position: int, order: tuple = None) -> Pergunta:
+        """
+        Prepara uma pergunta para exibição: embaralha as alternativas,
+        calcula o índice da resposta correta na ordem embaralhada e
+        formata os rótulos dos botões.
+
+        Args:
+            position (int): A posição da pergunta na tentativa.
+            order (tuple): A ordem das opções a usar, em vez de uma nova
+                (retomada de uma tentativa).
+
+        Returns:
+            Pergunta: A pergunta pronta para ser exibida.
+        """
+        question_data = self.questions[position]
+        options = question_data[1:5]
+
+        # Índice da resposta correta na ordem ORIGINAL (já numérico no banco)
+        correct_answer_index = self.questions.answer_index(position)
+
+        # Embaralha as posições, acompanhando para onde vai a resposta correta
+        if order is not None and sorted(order) == list(range(len(options))):
+            order = list(order)
+        else:
+            order = list(range(len(options)))
+            random.shuffle(order)
+        shuffled = tuple(options[i] for i in order)
+        if 0 <= correct_answer_index < len(options):
+            correct_answer_index = order.index(correct_answer_index)
+        else:
+            correct_answer_index = -1  # Sem resposta válida: nenhuma opção pontua
+
+        labels = tuple(
+            f"{chr(ord('a') + i)}) {option}" if option.strip() else ""
+            for i, option in enumerate(shuffled)
+        )
+        return Pergunta(
+            question_data[0], shuffled, correct_answer_index, labels, tuple(order)
+        )
+
+    def prefetch(self):
+        """
+        Prepara antecipadamente as próximas perguntas (até PREFETCH_SIZE à
+        frente da atual), enquanto o usuário lê a pergunta exibida.
+        """
+        limit = min(len(self.questions), self.current_question + PREFETCH_SIZE)
+        while self.prepared_until < limit:
+            self.prepared.append(self.prepare_question(self.prepared_until))
+            self.prepared_until += 1
+
+    def next_question(self) -> Pergunta:
+        """
+        Retorna a próxima pergunta preparada (preparando-a na hora se a
+        antecipação ainda não a alcançou).
+
+        Returns:
+            Pergunta: A próxima pergunta, ou None se a tentativa acabou.
+        """
+        if (
+            self.selector is not None
+            and self.current_question == len(self.questions) < QUESTIONS_PER_ATTEMPT
+        ):
+            # Modo adaptativo: escolhe a pergunta só agora, com a habilidade atualizada
+            index = self.selector.next_index()
+            if index is not None:
+                self.questions.indices.append(index)
+        if self.current_question >= len(self.questions):
+            return None
+        if not self.prepared:
+            self.prefetch()
+        self.current_question += 1
+        return self.prepared.popleft()
+
+    def record_result(self, correct: bool):
+        """
+        Informa o resultado da pergunta exibida (usado no modo adaptativo
+        para atualizar a habilidade estimada).
+
+        Args:
+            correct (bool): Se a resposta estava correta.
+        """
+        if self.selector is not None:
+            self.selector.record(correct)
+
+    def load_question(self):
+        """
+        Carrega a próxima pergunta do quiz, com as alternativas embaralhadas.
+
+        Returns:
+            tuple: O texto numerado da pergunta, as opções embaralhadas e o
+                   índice da resposta correta (ou None, None, None no fim).
+        """
+        question = self.next_question()
+        if question is None:
             return None, None, None
+        question_text = f"{self.current_question}. {question.enunciado}"
+        return question_text, question.opcoes, question.resposta_correta
 
     def check_answer(self, selected_answer: int):
         """
@@ -111,41 +294,3 @@ class QuizLogic:
             f"Sua pontuação final: {self.score}/40\n"
             f"{'Aprovado!' if self.score >= 32 else 'Reprovado.'}"
         )
-
-    def load_questions(self):
-        """Carrega as perguntas do cache ou do Google Sheets."""
-        if self.check_internet_connection():
-            self.download_and_cache_questions()
-        else:
-            self.load_questions_from_cache()
-
-    def check_internet_connection(self):
-        """Verifica a conexão com a internet."""
-        try:
-            requests.get("http://www.google.com", timeout=5)
-            return True
-        except requests.ConnectionError:
-            return False
-
-    def download_and_cache_questions(self):
-        """Baixa e armazena em cache as perguntas do Google Sheets."""
-        try:
-            all_questions = self.sheet.get_all_values()[1:]
-            random.shuffle(all_questions)
-            with open(self.cache_file, "w", encoding="utf8") as f:
-                json.dump(all_questions, f, ensure_ascii=False)
-            self.questions = random.sample(all_questions, 40)
-        except Exception as e:
-            print(f"Erro ao baixar perguntas: {e}")
-            self.load_questions_from_cache()  # Tenta carregar do cache em caso de erro
-
-    def load_questions_from_cache(self):
-        """Carrega as perguntas do arquivo de cache."""
-        try:
-            with open(self.cache_file, "r", encoding="utf8") as f:
-                self.questions = json.load(f)
-                random.shuffle(self.questions)  # Embaralha as perguntas aqui
-                self.questions = random.sample(self.questions, 40)
-        except FileNotFoundError:
-            print("Arquivo de cache não encontrado. Carregando do Google Sheets...")
-            self.download_and_cache_questions()  # Tenta baixar do Google Sheets
@@ -0,0 +1,315 @@
+"""
+Revisão espaçada das perguntas erradas, por aprendiz (algoritmo SM-2).
+
+Cada pergunta errada vira um cartão com o seu próximo vencimento. Os
+cartões de um aprendiz ficam em um heap ordenado pelo vencimento, de modo
+que obter o próximo cartão vencido custa O(log n), mesmo com históricos
+grandes. Reagendar um cartão apenas insere uma nova entrada no heap; a
+entrada antiga é descartada quando chega ao topo (remoção preguiçosa). Se
+as entradas antigas passarem de STALE_FACTOR vezes o número de cartões, o
+heap é refeito só com os vencimentos atuais.
+
+Os baralhos carregados são compartilhados pelas sessões do mesmo aprendiz
+e liberados quando a última delas deixa de usá-los (ver get_review_deck()).
+
+O estado de cada aprendiz é gravado em um arquivo binário próprio
+(REVIEW_DIR/<id>.bin), com 32 bytes por cartão:
+
+    cabeçalho   magic "QZR1", número de cartões (u32)
+    cartões     chave da pergunta (SHA-1, 20 bytes), repetições (u8),
+                lapsos (u8), facilidade x100 (u16), intervalo em
+                segundos (u32), vencimento em segundos desde 1970 (u32)
+"""
+
+import heapq
+import os
+import re
+import struct
+import tempfile
+import threading
+import time
+import weakref
+
+# Diretório dos arquivos de revisão (um por aprendiz)
+REVIEW_DIR = "review_state"
+
+# Quantidade máxima de perguntas em uma sessão de revisão
+REVIEW_SIZE = 20
+
+# Intervalos do SM-2 (em segundos)
+RELEARN_INTERVAL = 10 * 60  # Após um erro: revê em 10 minutos
+FIRST_INTERVAL = 24 * 3600  # Primeiro acerto: 1 dia
+SECOND_INTERVAL = 6 * 24 * 3600  # Segundo acerto seguido: 6 dias
+
+# Facilidade inicial e mínima do SM-2
+INITIAL_EASE = 2.5
+MIN_EASE = 1.3
+
+# Notas do SM-2 (0 a 5) atribuídas a um acerto e a um erro
+CORRECT_QUALITY = 4
+WRONG_QUALITY = 1
+
+# Entradas antigas toleradas no heap, em múltiplos do número de cartões
+STALE_FACTOR = 2
+
+MAGIC = b"QZR1"
+_HEADER = struct.Struct("<4sI")
+_CARD = struct.Struct("<20sBBHII")
+
+# Identificador de aprendiz válido (também usado como nome de arquivo)
+LEARNER_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+
+
+class Card:
+    """Estado SM-2 de uma pergunta para um aprendiz."""
+
+    __slots__ = ("key", "repetitions", "lapses", "ease", "interval", "due")
+
+    def __init__(self, key: bytes, due: int):
+        """
+        Inicializa um cartão novo.
+
+        Args:
+            key (bytes): A chave da pergunta (SHA-1 binário, ver question_key).
+            due (int): O vencimento, em segundos desde 1970.
+        """
+        self.key = key
+        self.repetitions = 0  # Acertos seguidos
+        self.lapses = 0  # Erros acumulados
+        self.ease = INITIAL_EASE
+        self.interval = 0  # Intervalo atual, em segundos
+        self.due = due
+
+    def grade(self, quality: int, now: int):
+        """
+        Aplica uma resposta ao cartão (SM-2) e calcula o novo vencimento.
+
+        Args:
+            quality (int): A nota da resposta (0 a 5; 3 ou mais é acerto).
+            now (int): O instante da resposta, em segundos desde 1970.
+        """
+        if quality < 3:
+            self.repetitions = 0
+            self.lapses = min(self.lapses + 1, 255)
+            self.interval = RELEARN_INTERVAL
+        else:
+            self.repetitions = min(self.repetitions + 1, 255)
+            if self.repetitions == 1:
+                self.interval = FIRST_INTERVAL
+            elif self.repetitions == 2:
+                self.interval = SECOND_INTERVAL
+            else:
+                self.interval = min(int(self.interval * self.ease), 0xFFFFFFFF)
+        self.ease = max(
+            MIN_EASE, self.ease + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02)
+        )
+        self.due = now + self.interval
+
+
+class ReviewDeck:
+    """
+    Cartões de revisão de um aprendiz, com um heap pelo vencimento.
+    """
+
+    def __init__(self, path: str):
+        """
+        Inicializa um baralho vazio.
+
+        Args:
+            path (str): O arquivo onde o baralho é gravado.
+        """
+        self.path = path
+        self.cards = {}  # Chave -> Card
+        self._heap = []  # (vencimento, chave); entradas antigas são ignoradas
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.cards)
+
+    def _schedule(self, card: Card):
+        """Insere o vencimento atual do cartão no heap."""
+        heapq.heappush(self._heap, (card.due, card.key))
+        # Um cartão revisto muitas vezes deixaria uma entrada antiga por resposta
+        if len(self._heap) - len(self.cards) > STALE_FACTOR * len(self.cards):
+            self._rebuild()
+
+    def _rebuild(self):
+        """Refaz o heap apenas com o vencimento atual de cada cartão."""
+        self._heap = [(card.due, card.key) for card in self.cards.values()]
+        heapq.heapify(self._heap)  # O(n), em vez de n inserções
+
+    def record_miss(self, key: str, now: float = None):
+        """
+        Registra um erro fora da revisão (ex.: em uma tentativa normal).
+        Uma pergunta nova entra no baralho já vencida.
+
+        Args:
+            key (str): A chave hexadecimal da pergunta (question_key).
+            now (float): O instante do erro (time.time() por padrão).
+        """
+        now = int(time.time() if now is None else now)
+        key = bytes.fromhex(key)
+        with self._lock:
+            card = self.cards.get(key)
+            if card is None:
+                card = self.cards[key] = Card(key, now)
+            else:
+                card.grade(WRONG_QUALITY, now)
+            self._schedule(card)
+
+    def review(self, key: str, correct: bool, now: float = None):
+        """
+        Registra a resposta de uma pergunta durante a revisão.
+
+        Args:
+            key (str): A chave hexadecimal da pergunta.
+            correct (bool): Se a resposta estava correta.
+            now (float): O instante da resposta (time.time() por padrão).
+        """
+        now = int(time.time() if now is None else now)
+        key = bytes.fromhex(key)
+        with self._lock:
+            card = self.cards.get(key)
+            if card is None:
+                card = self.cards[key] = Card(key, now)
+            card.grade(CORRECT_QUALITY if correct else WRONG_QUALITY, now)
+            self._schedule(card)
+
+    def _pop_stale(self):
+        """Descarta do topo do heap as entradas que não são mais o vencimento do cartão."""
+        heap = self._heap
+        while heap and self.cards[heap[0][1]].due != heap[0][0]:
+            heapq.heappop(heap)
+
+    def next_due(self):
+        """
+        Retorna o próximo cartão a vencer (O(log n) amortizado).
+
+        Returns:
+            tuple: (vencimento, chave hexadecimal), ou None se o baralho estiver vazio.
+        """
+        with self._lock:
+            self._pop_stale()
+            if not self._heap:
+                return None
+            due, key = self._heap[0]
+            return due, key.hex()
+
+    def due_keys(self, now: float = None, limit: int = REVIEW_SIZE) -> list:
+        """
+        Retorna as chaves dos cartões vencidos, do mais antigo ao mais novo.
+        Os cartões continuam agendados até serem respondidos.
+
+        Args:
+            now (float): O instante de referência (time.time() por padrão).
+            limit (int): A quantidade máxima de chaves.
+
+        Returns:
+            list: As chaves hexadecimais das perguntas vencidas.
+        """
+        now = time.time() if now is None else now
+        taken = []
+        with self._lock:
+            self._pop_stale()
+            while self._heap and len(taken) < limit and self._heap[0][0] <= now:
+                taken.append(heapq.heappop(self._heap))
+                self._pop_stale()
+            for entry in taken:
+                heapq.heappush(self._heap, entry)  # Continuam no heap até a resposta
+        return [key.hex() for _, key in taken]
+
+    def save(self):
+        """Grava o baralho de forma atômica (arquivo temporário + os.replace)."""
+        with self._lock:
+            cards = list(self.cards.values())
+        data = [_HEADER.pack(MAGIC, len(cards))]
+        data.extend(
+            _CARD.pack(
+                card.key,
+                card.repetitions,
+                card.lapses,
+                round(card.ease * 100),
+                min(card.interval, 0xFFFFFFFF),
+                min(card.due, 0xFFFFFFFF),
+            )
+            for card in cards
+        )
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(prefix=".review.", suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.writelines(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    @classmethod
+    def load(cls, path: str) -> "ReviewDeck":
+        """
+        Carrega o baralho gravado por save() (vazio se o arquivo não existir
+        ou for inválido).
+
+        Args:
+            path (str): O arquivo do baralho.
+
+        Returns:
+            ReviewDeck: O baralho carregado.
+        """
+        deck = cls(path)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            magic, count = _HEADER.unpack_from(data)
+        except (OSError, struct.error):
+            return deck
+        if magic != MAGIC or len(data) != _HEADER.size + count * _CARD.size:
+            print(f"Arquivo de revisão inválido ignorado: {path}")
+            return deck
+        for key, repetitions, lapses, ease, interval, due in _CARD.iter_unpack(
+            data[_HEADER.size :]
+        ):
+            card = Card(key, due)
+            card.repetitions = repetitions
+            card.lapses = lapses
+            card.ease = ease / 100
+            card.interval = interval
+            deck.cards[key] = card
+        deck._rebuild()
+        return deck
+
+
+# Baralhos carregados, por aprendiz: cada um sai do dicionário quando a
+# última sessão do aprendiz deixa de referenciá-lo (já gravado por ela)
+_decks = weakref.WeakValueDictionary()
+_decks_lock = threading.Lock()
+
+
+def get_review_deck(learner_id: str, directory: str = None) -> ReviewDeck:
+    """
+    Retorna o baralho de revisão de um aprendiz, carregando-o do disco
+    apenas se nenhuma sessão o estiver usando (várias sessões do mesmo
+    aprendiz o compartilham).
+
+    Args:
+        learner_id (str): O identificador do aprendiz (32 dígitos hexadecimais).
+        directory (str): O diretório dos arquivos de revisão (padrão: REVIEW_DIR).
+
+    Returns:
+        ReviewDeck: O baralho do aprendiz.
+
+    Raises:
+        ValueError: Se o identificador não tiver o formato esperado.
+    """
+    if not LEARNER_ID_PATTERN.match(learner_id or ""):
+        raise ValueError(f"identificador de aprendiz inválido: {learner_id!r}")
+    with _decks_lock:
+        deck = _decks.get(learner_id)
+        if deck is None:
+            deck = _decks[learner_id] = ReviewDeck.load(
+                os.path.join(directory or REVIEW_DIR, f"{learner_id}.bin")
+            )
+    return deck
@@ -0,0 +1,193 @@
+"""
+Amostragem estratificada por tópico com tabelas de alias (método de Vose).
+
+As perguntas são agrupadas pelo tópico (coluna G da planilha; ver
+docs_parser) e, para cada tópico, é montada uma tabela de alias sobre os
+pesos das suas perguntas. As tabelas são construídas uma única vez por
+versão do banco, em O(n); depois disso, cada sorteio custa O(1),
+independentemente do tamanho do banco.
+
+Um sorteio de k perguntas reparte k entre os tópicos conforme as cotas
+(por padrão, proporcionais ao peso total de cada tópico) e sorteia cada
+parte na tabela do tópico. Repetições e perguntas vistas recentemente são
+tratadas por rejeição: uma pergunta recente só é aceita com probabilidade
+RECENT_WEIGHT, o que equivale a multiplicar o seu peso por esse fator sem
+reconstruir as tabelas.
+"""
+
+import random
+from array import array
+
+# Tópico atribuído às perguntas sem tópico
+DEFAULT_TOPIC = "Geral"
+
+# Fator aplicado ao peso das perguntas vistas recentemente
+RECENT_WEIGHT = 0.2
+
+# Tentativas de sorteio por pergunta antes de completar a parte do tópico
+# sem a tabela de alias (tópicos quase esgotados)
+MAX_TRIES = 32
+
+
+def question_topic(row) -> str:
+    """
+    Retorna o tópico de uma linha do banco.
+
+    Args:
+        row: A linha [pergunta, opções..., resposta, tópico].
+
+    Returns:
+        str: O tópico, ou DEFAULT_TOPIC se a linha não tiver tópico.
+    """
+    topic = row[6].strip() if len(row) > 6 else ""
+    return topic or DEFAULT_TOPIC
+
+
+class AliasTable:
+    """
+    Tabela de alias de Vose: sorteia um índice de 0 a n-1 com probabilidade
+    proporcional ao seu peso, em tempo constante.
+    """
+
+    __slots__ = ("probability", "alias")
+
+    def __init__(self, weights):
+        """
+        Constrói a tabela em O(n).
+
+        Args:
+            weights: Os pesos (não negativos, com soma positiva).
+        """
+        n = len(weights)
+        total = float(sum(weights))
+        scaled = [weight * n / total for weight in weights]
+        self.probability = array("d", [1.0]) * n
+        self.alias = array("I", range(n))
+        small = [i for i, value in enumerate(scaled) if value < 1.0]
+        large = [i for i, value in enumerate(scaled) if value >= 1.0]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            self.probability[less] = scaled[less]
+            self.alias[less] = more
+            scaled[more] -= 1.0 - scaled[less]
+            (small if scaled[more] < 1.0 else large).append(more)
+        # Os que sobraram têm probabilidade 1 (diferenças de arredondamento)
+
+    def __len__(self):
+        return len(self.alias)
+
+    def sample(self) -> int:
+        """
+        Sorteia um índice.
+
+        Returns:
+            int: O índice sorteado.
+        """
+        i = random.randrange(len(self.alias))
+        return i if random.random() < self.probability[i] else self.alias[i]
+
+
+class StratifiedSampler:
+    """
+    Sorteador estratificado por tópico sobre uma versão do banco.
+    """
+
+    __slots__ = ("topics", "members", "tables", "topic_weights")
+
+    def __init__(self, rows, weights=None):
+        """
+        Agrupa as perguntas por tópico e constrói as tabelas de alias.
+
+        Args:
+            rows: As linhas do banco.
+            weights: O peso de cada pergunta (None = todas com peso 1).
+        """
+        groups = {}
+        for index, row in enumerate(rows):
+            groups.setdefault(question_topic(row), []).append(index)
+        self.topics = sorted(groups)
+        self.members = [array("I", groups[topic]) for topic in self.topics]
+        self.tables = []
+        self.topic_weights = []
+        for members in self.members:
+            member_weights = [1.0] * len(members) if weights is None else [weights[i] for i in members]
+            if sum(member_weights) <= 0:
+                member_weights = [1.0] * len(members)  # Tópico sem peso: sorteio uniforme
+            self.tables.append(AliasTable(member_weights))
+            self.topic_weights.append(float(sum(member_weights)))
+
+    def allocate(self, k: int, quotas: dict = None) -> list:
+        """
+        Reparte k perguntas entre os tópicos (maiores restos), sem exceder
+        a quantidade de perguntas de cada tópico.
+
+        Args:
+            k (int): O total de perguntas.
+            quotas (dict): Peso relativo de cada tópico (tópicos ausentes
+                ficam de fora). None ou vazio = proporcional ao peso total
+                das perguntas de cada tópico.
+
+        Returns:
+            list: A quantidade de perguntas de cada tópico (ordem de self.topics).
+        """
+        shares = [float(quotas.get(topic, 0)) for topic in self.topics] if quotas else []
+        if sum(shares) <= 0:
+            shares = list(self.topic_weights)
+        capacity = [len(members) for members in self.members]
+        counts = [0] * len(self.topics)
+        remaining = min(k, sum(c for c, share in zip(capacity, shares) if share > 0))
+        while remaining > 0:
+            # Tópicos que ainda podem receber perguntas
+            open_topics = [t for t in range(len(counts)) if shares[t] > 0 and counts[t] < capacity[t]]
+            total = sum(shares[t] for t in open_topics)
+            exact = {t: remaining * shares[t] / total for t in open_topics}
+            given = 0
+            for t in open_topics:
+                extra = min(int(exact[t]), capacity[t] - counts[t])
+                counts[t] += extra
+                given += extra
+            # Distribui o que sobrou pelos maiores restos
+            for t in sorted(open_topics, key=lambda t: exact[t] - int(exact[t]), reverse=True):
+                if given >= remaining:
+                    break
+                if counts[t] < capacity[t]:
+                    counts[t] += 1
+                    given += 1
+            remaining -= given
+        return counts
+
+    def draw(self, k: int, quotas: dict = None, recent=None) -> list:
+        """
+        Sorteia k perguntas distintas, respeitando as cotas por tópico.
+
+        Args:
+            k (int): Quantidade de perguntas.
+            quotas (dict): Peso relativo de cada tópico (ver allocate()).
+            recent: Conjunto de índices vistos recentemente (menos prováveis).
+
+        Returns:
+            list: Os índices sorteados, em ordem aleatória.
+        """
+        recent = recent or ()
+        chosen = []
+        for topic, count in enumerate(self.allocate(k, quotas)):
+            if count == 0:
+                continue
+            table, members = self.tables[topic], self.members[topic]
+            picked = set()
+            tries = 0
+            while len(picked) < count and tries < count * MAX_TRIES:
+                tries += 1
+                index = members[table.sample()]
+                if index in picked:
+                    continue
+                if index in recent and random.random() >= RECENT_WEIGHT:
+                    continue
+                picked.add(index)
+            if len(picked) < count:
+                # Tópico quase todo sorteado: completa com as que restaram
+                rest = [i for i in members if i not in picked]
+                picked.update(random.sample(rest, count - len(picked)))
+            chosen.extend(picked)
+        random.shuffle(chosen)  # Intercala os tópicos ao longo da tentativa
+        return chosen
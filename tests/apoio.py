@@ -0,0 +1,143 @@
+"""
+Objetos falsos e construtores compartilhados pelos testes.
+"""
+
+import re
+import threading
+import types
+
+import flet as ft
+
+from bank_registry import BankRegistry, BankSource
+from fake_flet import criar_pagina
+from question_bank import QuestionBank
+
+
+class AbaFalsa:
+    """Aba do Google Sheets com as linhas em memória."""
+
+    def __init__(self, linhas: list):
+        self.linhas = linhas
+
+    def get_all_values(self) -> list:
+        return [["Pergunta", "a", "b", "c", "d", "Resposta", "Tópico"]] + self.linhas
+
+
+class PlanilhaFalsa:
+    """
+    Aba do Google Sheets em memória, com as escritas usadas pela
+    sincronização (batch_update por intervalos e delete_rows).
+    """
+
+    def __init__(self, linhas: list):
+        self.linhas = [list(linha) for linha in linhas]  # Inclui o cabeçalho
+        self.escritas = []  # Intervalos de cada batch_update
+        self.remocoes = []  # (primeira, última) de cada delete_rows, na ordem
+
+    def get_all_values(self) -> list:
+        return [list(linha) for linha in self.linhas]
+
+    def batch_update(self, dados: list):
+        for item in dados:
+            self.escritas.append(item["range"])
+            primeira = int(re.match(r"[A-Z]+(\d+)", item["range"]).group(1))
+            for deslocamento, linha in enumerate(item["values"]):
+                indice = primeira - 1 + deslocamento
+                while len(self.linhas) <= indice:
+                    self.linhas.append([])
+                self.linhas[indice] = list(linha)
+
+    def delete_rows(self, primeira: int, ultima: int = None):
+        self.remocoes.append((primeira, ultima or primeira))
+        del self.linhas[primeira - 1 : ultima or primeira]
+
+
+def perguntas(versao: int, quantidade: int = 10, texto: str = "") -> list:
+    return [
+        [f"Pergunta {i} (v{versao}){texto}", "1", "2", "3", "4", "a", "Geral"]
+        for i in range(quantidade)
+    ]
+
+
+def paragrafo(texto: str, negrito: bool = False, estilo: str = None) -> dict:
+    """Parágrafo no formato da API do Google Docs (um único trecho de texto)."""
+    item = {
+        "paragraph": {
+            "elements": [{"textRun": {"content": texto + "\n", "textStyle": {"bold": True} if negrito else {}}}]
+        }
+    }
+    if estilo:
+        item["paragraph"]["paragraphStyle"] = {"namedStyleType": estilo}
+    return item
+
+
+def documento(questoes: list, revisao: str = "rev-1") -> dict:
+    """
+    Documento do Google Docs com as perguntas (enunciado, 4 opções e o
+    índice da correta, marcada em negrito).
+    """
+    conteudo = []
+    for enunciado, opcoes, correta in questoes:
+        conteudo.append(paragrafo(enunciado))
+        for i, opcao in enumerate(opcoes):
+            conteudo.append(paragrafo(f"{'abcd'[i]}) {opcao}", negrito=i == correta))
+        conteudo.append(paragrafo(""))
+    return {"revisionId": revisao, "body": {"content": conteudo}}
+
+
+def criar_banco(diretorio, aba: AbaFalsa, binario: bool = True) -> QuestionBank:
+    """Banco que baixa as linhas da aba falsa (sem rede)."""
+    banco = QuestionBank(
+        cache_file=str(diretorio / "quiz_cache.json"),
+        bank_file=str(diretorio / "quiz_bank.bin") if binario else None,
+    )
+    banco.check_internet_connection = lambda: True
+    banco._connect_sheets = lambda: [aba]
+    banco._sheet_revision = lambda: None
+    return banco
+
+
+def registrar_banco(monkeypatch, banco: QuestionBank) -> BankRegistry:
+    """Torna o banco o único do registro do processo."""
+    import bank_registry
+
+    registro = BankRegistry(offline=True)
+    registro.add(BankSource(name="sfpc", title="SFPC", spreadsheet_url=""), banco)
+    monkeypatch.setattr(bank_registry, "_registry", registro)
+    return registro
+
+
+def nova_sessao(armazenamento: dict = None, atraso_leitura: float = 0, esperar: bool = True):
+    """
+    Cria uma sessão em uma conexão falsa e aguarda a identificação do aprendiz.
+
+    Args:
+        armazenamento (dict): O client_storage do navegador (ex.: de outra sessão).
+        atraso_leitura (float): Atraso da resposta do navegador a client_storage.get.
+        esperar (bool): Aguarda a identificação do aprendiz.
+    """
+    import app.controllers as controllers
+
+    page = criar_pagina()
+    conexao = page.conexao_falsa
+    if armazenamento is not None:
+        conexao.armazenamento = armazenamento
+    if atraso_leitura:
+        responder = conexao._responder_metodo
+
+        def responder_com_atraso(metodo_id, metodo, argumentos):
+            if metodo == "clientStorage:get":
+                threading.Timer(atraso_leitura, responder, (metodo_id, metodo, argumentos)).start()
+            else:
+                responder(metodo_id, metodo, argumentos)
+
+        conexao._responder_metodo = responder_com_atraso
+    sessao = controllers.QuizController(page, ft.Switch(), False)
+    if esperar:
+        sessao.revisao_carregada.wait(5)
+    return sessao
+
+
+def clicar(sessao, opcao: int = 0):
+    """Responde a pergunta na tela com a opção indicada."""
+    sessao.verificar_resposta(types.SimpleNamespace(control=sessao.tela_pergunta.botoes[opcao]))
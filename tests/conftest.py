@@ -0,0 +1,36 @@
+"""
+Configuração comum dos testes: caminhos de importação e isolamento dos
+arquivos e dos objetos únicos do processo em um diretório temporário.
+"""
+
+import os
+import sys
+import weakref
+
+import pytest
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+sys.path[:0] = [RAIZ, os.path.join(RAIZ, "benchmarks")]
+
+import attempt_store  # noqa: E402
+import bank_registry  # noqa: E402
+import checkpoint  # noqa: E402
+import review  # noqa: E402
+
+
+@pytest.fixture
+def ambiente(tmp_path, monkeypatch):
+    """
+    Diretório de trabalho temporário, no modo offline, com histórico,
+    baralhos de revisão e pontos de retomada próprios do teste.
+    """
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("QUIZ_OFFLINE", "1")
+    monkeypatch.setattr(checkpoint, "CHECKPOINT_DIR", str(tmp_path / "attempt_state"))
+    monkeypatch.setattr(review, "REVIEW_DIR", str(tmp_path / "review_state"))
+    monkeypatch.setattr(review, "_decks", weakref.WeakValueDictionary())
+    monkeypatch.setattr(bank_registry, "_registry", None)
+    store = attempt_store.AttemptStore(str(tmp_path / "quiz_attempts.db"))
+    monkeypatch.setattr(attempt_store, "_store", store)
+    yield tmp_path
+    store.flush(5)
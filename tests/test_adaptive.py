@@ -0,0 +1,90 @@
+"""
+Testes da seleção adaptativa (adaptive.py) e dos seus índices de dificuldade.
+
+Uso:
+    python -m pytest tests
+"""
+
+import os
+
+import adaptive
+import analytics
+from docs_parser import question_key
+
+
+class Banco:
+    """Banco mínimo: o índice só usa as linhas vigentes."""
+
+    def __init__(self, linhas):
+        self.rows = linhas
+
+
+def linhas(quantidade: int) -> tuple:
+    return tuple([f"Pergunta {i}", "a", "b", "c", "d", "a", ""] for i in range(quantidade))
+
+
+def indice(p_values: list) -> adaptive.DifficultyIndex:
+    banco = linhas(len(p_values))
+    return adaptive.DifficultyIndex(
+        banco, {question_key(linha[0]): p for linha, p in zip(banco, p_values)}
+    )
+
+
+def test_habilidade_sobe_com_acertos_e_desce_com_erros():
+    faixas = indice([0.9, 0.5, 0.1])
+    facil, dificil = faixas.buckets[0][0], faixas.buckets[-1][0]
+    variacoes = {}
+    for pergunta in (facil, dificil):
+        for correta in (True, False):
+            seletor = adaptive.AdaptiveSelector(faixas)
+            seletor.last = pergunta
+            seletor.record(correta)
+            variacoes[pergunta, correta] = seletor.ability
+            assert seletor.last is None
+    assert variacoes[facil, True] > 0 and variacoes[dificil, True] > 0
+    assert variacoes[facil, False] < 0 and variacoes[dificil, False] < 0
+    # Resultados inesperados movem mais a habilidade
+    assert variacoes[dificil, True] > variacoes[facil, True]
+    assert variacoes[facil, False] < variacoes[dificil, False]
+
+
+def test_faixas_ordenadas_e_sorteio_sem_repeticoes():
+    p_values = [i / 70 for i in range(1, 70)]
+    faixas = indice(p_values)
+    assert faixas.centers == sorted(faixas.centers)
+    assert len(faixas.buckets) == adaptive.BUCKETS
+    # Habilidade alta: perguntas da faixa mais difícil (menor p-value)
+    assert faixas.pick(10.0, set()) in faixas.buckets[-1]
+    assert faixas.pick(-10.0, set()) in faixas.buckets[0]
+
+    seletor = adaptive.AdaptiveSelector(faixas, ability=10.0)
+    sorteadas = [seletor.next_index() for _ in range(len(p_values))]
+    assert sorted(sorteadas) == list(range(len(p_values)))
+    assert seletor.next_index() is None
+
+
+def test_indice_refeito_quando_as_estatisticas_mudam(ambiente):
+    banco = Banco(linhas(30))
+    primeiro = adaptive.get_difficulty_index(banco)
+    assert adaptive.get_difficulty_index(banco) is primeiro  # Nada mudou
+    assert len(primeiro.buckets) == 1  # Sem estatísticas: todas com a dificuldade padrão
+
+    # O analytics.py grava as somas: a pergunta 0 foi sempre errada
+    estatisticas = analytics.ItemStatistics()
+    respostas = adaptive.MIN_ANSWERS
+    estatisticas.add(
+        [question_key("Pergunta 0")] * respostas, [1] * respostas, [0] * respostas,
+        [5.0] * respostas, [0.5] * respostas,
+    )
+    estatisticas.save(analytics.STATE_FILE)
+    segundo = adaptive.get_difficulty_index(banco)
+    assert segundo is not primeiro
+    assert segundo.difficulties[0] == max(segundo.difficulties)
+    assert 0 in segundo.buckets[-1]
+
+    # Regravação (outra marca de tempo) e troca das linhas também refazem o índice
+    os.utime(analytics.STATE_FILE, ns=(1, 1))
+    terceiro = adaptive.get_difficulty_index(banco)
+    assert terceiro is not segundo
+    banco.rows = linhas(30)
+    assert adaptive.get_difficulty_index(banco) is not terceiro
@@ -0,0 +1,76 @@
+"""
+Testes das estatísticas por pergunta (analytics.py) sobre o histórico de
+tentativas gravado pelo attempt_store.
+
+Uso:
+    python -m pytest tests
+"""
+
+import time
+
+import analytics
+from attempt_store import AttemptStore
+from docs_parser import question_key
+
+PERGUNTAS = ["Pergunta 1", "Pergunta 2", "Pergunta 3"]
+
+# Opção escolhida em cada pergunta (a correta é sempre a 0; -1 = em branco)
+TENTATIVAS = [
+    [0, 0, 0],
+    [0, 0, 1],
+    [1, 0, 1],
+    [1, -1, 1],
+]
+
+
+def gravar(historico: AttemptStore, tentativas: list, finalizar: bool = True):
+    for escolhas in tentativas:
+        tentativa = historico.begin_attempt()
+        for posicao, escolha in enumerate(escolhas):
+            historico.record_answer(tentativa, posicao, PERGUNTAS[posicao], escolha, 0, 10.0 * (posicao + 1))
+        if finalizar:
+            historico.finish_attempt(tentativa, escolhas.count(0), len(escolhas))
+    assert historico.flush(5)
+
+
+def atualizar(estatisticas, historico) -> int:
+    # Sem a espera de WATERMARK_LAG: tudo o que já foi finalizado entra
+    with historico.read_connection() as conexao:
+        return analytics.update(estatisticas, conexao, now=time.time() + analytics.WATERMARK_LAG)
+
+
+def test_estatisticas_por_pergunta(tmp_path):
+    historico = AttemptStore(str(tmp_path / "tentativas.db"), batch_interval=0.01)
+    gravar(historico, TENTATIVAS)
+    gravar(historico, [[1, 1, 1]], finalizar=False)  # Abandonada: não entra nas contas
+    estatisticas = analytics.ItemStatistics()
+    assert atualizar(estatisticas, historico) == 12
+
+    resultado = estatisticas.statistics()
+    primeira, segunda, terceira = (resultado[question_key(texto)] for texto in PERGUNTAS)
+    assert primeira["answers"] == 4
+    assert primeira["p_value"] == 0.5
+    assert primeira["option_rates"] == [0.5, 0.5, 0.0, 0.0]
+    assert primeira["discrimination"] > 0  # Quem acerta vai melhor no resto da prova
+    assert segunda["p_value"] == 0.75 and segunda["blank_rate"] == 0.25
+    assert terceira["p_value"] == 0.25
+    assert 25 < terceira["median_time"] < 35
+
+
+def test_atualizacao_incremental_igual_a_completa(tmp_path):
+    historico = AttemptStore(str(tmp_path / "tentativas.db"), batch_interval=0.01)
+    incremental = analytics.ItemStatistics()
+    gravar(historico, TENTATIVAS[:2])
+    assert atualizar(incremental, historico) == 6
+    assert atualizar(incremental, historico) == 0  # Nada novo desde a marca d'água
+    time.sleep(0.01)
+    gravar(historico, TENTATIVAS[2:])
+    assert atualizar(incremental, historico) == 6
+
+    # As somas gravadas e recarregadas continuam de onde pararam
+    incremental.save(str(tmp_path / "analytics.npz"))
+    recarregada = analytics.ItemStatistics.load(str(tmp_path / "analytics.npz"))
+    completa = analytics.ItemStatistics()
+    atualizar(completa, historico)
+    assert recarregada.statistics() == completa.statistics() == incremental.statistics()
+    assert recarregada.watermark == incremental.watermark
@@ -0,0 +1,61 @@
+"""
+Testes do histórico de tentativas (attempt_store.py).
+
+Uso:
+    python -m pytest tests
+"""
+
+import threading
+
+from attempt_store import AttemptStore
+from docs_parser import question_key
+
+
+def test_flush_grava_tudo_o_que_foi_enfileirado(tmp_path):
+    historico = AttemptStore(str(tmp_path / "tentativas.db"), batch_interval=0.05)
+    tentativa = historico.begin_attempt("sessao-1", "hash-1")
+    historico.record_answer(tentativa, 0, "Quem prioriza o <b>backlog</b>?", 0, 0, 3.5)
+    historico.record_answer(tentativa, 1, "Qual a duração da Daily?", 2, 1, 7.0)
+    historico.record_answer(tentativa, 2, "Quem remove impedimentos?", -1, 1, 60.0)
+    historico.finish_attempt(tentativa, 1, 3)
+    assert historico.flush(5)
+
+    with historico.read_connection() as conexao:
+        assert conexao.execute(
+            "SELECT session_id, bank_hash, score, total, finished_at IS NOT NULL FROM attempts"
+        ).fetchall() == [("sessao-1", "hash-1", 1, 3, 1)]
+        assert conexao.execute(
+            "SELECT position, chosen, correct_option, is_correct FROM answers ORDER BY position"
+        ).fetchall() == [(0, 0, 0, 1), (1, 2, 1, 0), (2, -1, 1, 0)]
+        chave, texto = conexao.execute(
+            "SELECT question_key, text FROM answers JOIN questions ON key = question_key "
+            "WHERE position = 0"
+        ).fetchone()
+    assert chave == question_key("Quem prioriza o backlog?")
+    assert texto == "Quem prioriza o <b>backlog</b>?"
+
+
+def test_sessoes_simultaneas_viram_poucas_transacoes(tmp_path):
+    historico = AttemptStore(str(tmp_path / "tentativas.db"), batch_interval=0.2)
+    largada = threading.Barrier(20)
+
+    def sessao(numero):
+        largada.wait()
+        tentativa = historico.begin_attempt(f"sessao-{numero}")
+        for posicao in range(10):
+            historico.record_answer(tentativa, posicao, f"Pergunta {posicao}", 1, 1, 1.0)
+        historico.finish_attempt(tentativa, 10, 10)
+
+    threads = [threading.Thread(target=sessao, args=(numero,)) for numero in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert historico.flush(5)
+    assert historico.transactions <= 3  # 240 registros, não 240 transações
+    with historico.read_connection() as conexao:
+        assert conexao.execute("SELECT COUNT(*) FROM answers").fetchone() == (200,)
+        assert conexao.execute("SELECT COUNT(*) FROM questions").fetchone() == (10,)
+        assert conexao.execute(
+            "SELECT COUNT(*) FROM attempts WHERE score = 10"
+        ).fetchone() == (20,)
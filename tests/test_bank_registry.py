@@ -0,0 +1,61 @@
+"""
+Testes da configuração dos bancos de perguntas (bank_registry.py).
+
+Uso:
+    python -m pytest tests
+"""
+
+import json
+
+import pytest
+
+import bank_registry
+from bank_format import BinaryBank
+
+
+def escrever_bancos(diretorio, bancos: list) -> str:
+    caminho = diretorio / "banks.json"
+    caminho.write_text(json.dumps(bancos), encoding="utf-8")
+    return str(caminho)
+
+
+def test_documento_sincroniza_a_aba_do_banco(ambiente):
+    caminho = escrever_bancos(ambiente, [
+        {"name": "csm", "title": "Scrum Master", "spreadsheet_url": "url",
+         "document_id": "doc-1", "worksheets": ["Perguntas"]},
+        {"name": "pspo", "title": "Product Owner", "spreadsheet_url": "url",
+         "document_id": "doc-2"},
+    ])
+    csm, pspo = bank_registry.load_sources(caminho)
+    assert csm.sync_worksheet == "Perguntas"
+    assert pspo.sync_worksheet is None
+
+
+def test_documento_com_varias_abas_e_rejeitado(ambiente):
+    caminho = escrever_bancos(ambiente, [
+        {"name": "kmp", "title": "Kanban", "spreadsheet_url": "url",
+         "document_id": "doc-1", "worksheets": ["Fundamentos", "Métricas"]},
+    ])
+    with pytest.raises(ValueError, match="única aba"):
+        bank_registry.load_sources(caminho)
+    # Sem documento, o banco pode reunir várias abas
+    assert bank_registry.BankSource("kmp", "Kanban", "url", ("Fundamentos", "Métricas"))
+
+
+def test_offline_sem_cache_usa_o_banco_empacotado(ambiente):
+    # Checkout novo: nenhum arquivo local, QUIZ_OFFLINE=1 (ver conftest.py)
+    assert bank_registry.offline_mode()
+    banco = bank_registry.get_question_bank()
+    # O binário é compilado no diretório local a partir do quiz_cache.json
+    # empacotado e servido via mmap
+    assert (ambiente / "quiz_bank.bin").exists()
+    assert isinstance(banco.rows, BinaryBank)
+    assert len(banco) > 0
+    assert len(banco.draw(10)) == 10
+    # Sem download nem atualização agendada
+    assert bank_registry.get_bank_registry().refresh_thread is None
+
+
+def test_documento_padrao_vem_do_registro():
+    (padrao,) = bank_registry.DEFAULT_SOURCES
+    assert padrao.document_id == bank_registry.DOCUMENT_ID
@@ -0,0 +1,83 @@
+"""
+Testes dos pontos de retomada das tentativas (checkpoint.py).
+
+Uso:
+    python -m pytest tests
+"""
+
+import pytest
+
+from checkpoint import AttemptCheckpoint, checkpoint_path, pack_order, unpack_order
+
+CHAVES = [f"{i:040x}" for i in range(1, 4)]
+TENTATIVA = "0123456789abcdef0123456789abcdef"
+
+
+def gravar(caminho) -> AttemptCheckpoint:
+    """Tentativa com duas perguntas exibidas e a primeira respondida."""
+    ponto = AttemptCheckpoint(str(caminho))
+    ponto.begin("csm", 1_700_000_000.5, CHAVES, TENTATIVA, review=True)
+    ponto.shown(0, CHAVES[0], (2, 0, 3, 1))
+    ponto.answer(0, 1, True)
+    ponto.shown(1, CHAVES[1])
+    return ponto
+
+
+def test_ida_e_volta(tmp_path):
+    ponto = gravar(tmp_path / "retomada.bin")
+    tentativa = ponto.load()
+    assert (tentativa.bank, tentativa.review, tentativa.adaptive) == ("csm", True, False)
+    assert tentativa.deadline == 1_700_000_000.5
+    assert tentativa.attempt_id == TENTATIVA
+    assert tentativa.keys == CHAVES
+    assert tentativa.shown == [(CHAVES[0], (2, 0, 3, 1)), (CHAVES[1], None)]
+    assert tentativa.answers == [(1, True)]
+    assert not tentativa.finished
+
+    # A tentativa continua no mesmo arquivo após a retomada
+    ponto.close()
+    ponto.resume()
+    ponto.answer(1, 3, False)
+    ponto.finish()
+    tentativa = ponto.load()
+    assert tentativa.answers == [(1, True), (3, False)]
+    assert tentativa.finished
+
+
+@pytest.mark.parametrize("cortados", range(1, 5))
+def test_registro_final_incompleto_e_ignorado(tmp_path, cortados):
+    caminho = tmp_path / "retomada.bin"
+    ponto = gravar(caminho)
+    ponto.answer(1, 2, False)
+    ponto.close()
+    # Gravação interrompida no meio do último registro de resposta (6 bytes)
+    caminho.write_bytes(caminho.read_bytes()[:-cortados])
+    tentativa = ponto.load()
+    assert len(tentativa.shown) == 2
+    assert tentativa.answers == [(1, True)]
+    assert not tentativa.finished
+
+
+def test_inicio_incompleto_ou_invalido(tmp_path):
+    caminho = tmp_path / "retomada.bin"
+    ponto = gravar(caminho)
+    ponto.close()
+    dados = caminho.read_bytes()
+    caminho.write_bytes(dados[:40])  # As chaves sorteadas estão incompletas
+    assert ponto.load() is None
+    caminho.write_bytes(b"XXXX" + dados[4:])
+    assert ponto.load() is None
+    assert AttemptCheckpoint(str(tmp_path / "inexistente.bin")).load() is None
+
+
+def test_ordem_das_opcoes_em_um_byte():
+    for ordem in [(0, 1, 2, 3), (3, 2, 1, 0), (1, 3, 0, 2)]:
+        assert unpack_order(pack_order(ordem)) == ordem
+    assert unpack_order(pack_order((0, 1, 2))) is None
+    assert unpack_order(pack_order(None)) is None
+
+
+def test_identificador_do_aprendiz_e_validado(tmp_path):
+    assert checkpoint_path(TENTATIVA, str(tmp_path)).endswith(f"{TENTATIVA}.bin")
+    with pytest.raises(ValueError):
+        checkpoint_path("../fora", str(tmp_path))
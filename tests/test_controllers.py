@@ -0,0 +1,72 @@
+"""
+Testes do QuizController (app/controllers.py) em uma conexão Flet falsa.
+
+Uso:
+    python -m pytest tests
+"""
+
+import threading
+import time
+
+import pytest
+
+from apoio import AbaFalsa, criar_banco, nova_sessao, perguntas, registrar_banco
+
+
+@pytest.fixture
+def banco(ambiente, monkeypatch):
+    banco = criar_banco(ambiente, AbaFalsa(perguntas(1, 60)))
+    assert banco.refresh()
+    registrar_banco(monkeypatch, banco)
+    return banco
+
+
+def test_inicio_habilitado_apos_identificar_o_aprendiz(banco):
+    sessao = nova_sessao(atraso_leitura=0.3, esperar=False)
+    assert sessao.botao_iniciar.disabled
+
+    # Um clique (ex.: enviado antes de o botão ser desabilitado) não bloqueia
+    inicio = time.monotonic()
+    sessao.iniciar_quiz(None)
+    assert time.monotonic() - inicio < 0.1
+    assert not sessao.estado_quiz.quiz_iniciado
+
+    assert sessao.revisao_carregada.wait(5)
+    assert not sessao.botao_iniciar.disabled
+    sessao.iniciar_quiz(None)
+    assert sessao.estado_quiz.quiz_iniciado
+    assert sessao.checkpoint.load().keys  # A tentativa pode ser retomada
+
+
+def test_fim_do_tempo_finaliza_uma_unica_vez(banco):
+    sessao = nova_sessao()
+    sessao.iniciar_quiz(None)
+    sessao.parar_timer()  # Os ticks são chamados pelo teste
+    audios, finalizacoes = [], []
+    finalizar = sessao.finalizar_quiz
+
+    def reproduzir(pasta):
+        audios.append(pasta)
+        time.sleep(0.05)  # Alarga a janela entre a verificação e a finalização
+
+    def finalizar_contando(e):
+        finalizacoes.append(e)
+        finalizar(e)
+
+    sessao.reproduzir_audio = reproduzir
+    sessao.finalizar_quiz = finalizar_contando
+    sessao.estado_quiz.iniciar_prazo(0)  # O prazo acabou
+    largada = threading.Barrier(4)
+
+    def tick():
+        largada.wait()
+        sessao.tick()
+
+    threads = [threading.Thread(target=tick) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert audios.count("acabar") == 1
+    assert len(finalizacoes) == 1
+    assert sessao.estado_quiz.quiz_finalizado
@@ -0,0 +1,85 @@
+"""
+Testes da extração das perguntas do Google Docs (docs_parser.py).
+
+Uso:
+    python -m pytest tests
+"""
+
+from apoio import documento, paragrafo
+from docs_parser import parse_document
+
+
+def mensagens(relatorio) -> list:
+    return [mensagem for _, _, mensagem in relatorio.diagnostics]
+
+
+def test_titulos_viram_topicos():
+    corpo = documento([("Quem prioriza o backlog?", ["PO", "SM", "Time", "Cliente"], 0)])
+    conteudo = [
+        paragrafo("Guia de estudo", estilo="TITLE"),
+        paragrafo("Papéis", estilo="HEADING_1"),
+        *corpo["body"]["content"],
+        paragrafo("Eventos", estilo="HEADING_2"),
+        *documento([("Qual a duração da Daily?", ["5", "15", "30", "60"], 1)])["body"]["content"],
+    ]
+    linhas, relatorio = parse_document({"body": {"content": conteudo}})
+    assert [linha[6] for linha in linhas] == ["Papéis", "Eventos"]
+    assert [linha[5] for linha in linhas] == ["a", "b"]
+    assert relatorio.diagnostics == []
+
+
+def test_negrito_em_um_trecho_posterior_da_opcao():
+    opcao = paragrafo("b) ")
+    opcao["paragraph"]["elements"].append(
+        {"textRun": {"content": "Scrum Master\n", "textStyle": {"bold": True}}}
+    )
+    conteudo = [paragrafo("Quem remove impedimentos?"), paragrafo("a) PO"), opcao,
+                paragrafo("c) Time"), paragrafo("d) Cliente")]
+    linhas, relatorio = parse_document({"body": {"content": conteudo}})
+    assert linhas == [["Quem remove impedimentos?", "PO", "Scrum Master", "Time", "Cliente", "b", ""]]
+    assert relatorio.diagnostics == []
+
+
+def test_negrito_so_em_espacos_nao_marca_a_resposta():
+    opcao = paragrafo("a) PO")
+    opcao["paragraph"]["elements"].append({"textRun": {"content": " \n", "textStyle": {"bold": True}}})
+    conteudo = [paragrafo("Quem remove impedimentos?"), opcao, paragrafo("b) SM"),
+                paragrafo("c) Time"), paragrafo("d) Cliente")]
+    linhas, relatorio = parse_document({"body": {"content": conteudo}})
+    assert linhas[0][5] == ""
+    assert mensagens(relatorio) == ["nenhuma opção em negrito"]
+
+
+def test_opcao_vazia_e_relatada():
+    conteudo = [paragrafo("Quem remove impedimentos?"), paragrafo("a)"), paragrafo("b) SM", negrito=True),
+                paragrafo("(c)   "), paragrafo("d) Cliente")]
+    linhas, relatorio = parse_document({"body": {"content": conteudo}})
+    # As opções vazias mantêm a posição das seguintes (e a letra da resposta)
+    assert linhas == [["Quem remove impedimentos?", "", "SM", "", "Cliente", "b", ""]]
+    assert mensagens(relatorio) == ["opção 'a)' sem texto", "opção 'c)' sem texto"]
+
+
+def test_opcoes_malformadas_sao_relatadas():
+    conteudo = [
+        paragrafo("a) Opção sem enunciado"),
+        paragrafo("Quem remove impedimentos?"),
+        paragrafo("a) PO"),
+        paragrafo("c) SM", negrito=True),
+        paragrafo("b) Time", negrito=True),
+        {"paragraph": {"elements": [None]}},
+        paragrafo("Pergunta com poucas opções"),
+        paragrafo("a) Sim", negrito=True),
+    ]
+    linhas, relatorio = parse_document({"body": {"content": conteudo}})
+    assert [linha[0] for linha in linhas] == ["Quem remove impedimentos?", "Pergunta com poucas opções"]
+    assert linhas[0][5] == "b"  # A posição da primeira opção em negrito
+    assert mensagens(relatorio) == [
+        "opção sem enunciado ignorada: 'a) Opção sem enunciado'",
+        "opção 'c)' fora de ordem (esperada 'b)')",
+        "opção 'b)' fora de ordem (esperada 'c)')",
+        "elemento com estrutura inesperada ignorado",
+        "3 opções em vez de 4",
+        "2 opções em negrito; usando a primeira",
+        "1 opções em vez de 4",
+    ]
+    assert relatorio.questions == 2
@@ -0,0 +1,205 @@
+"""
+Testes da camada de acesso às APIs do Google (google_api.py) e da
+sincronização do Google Docs com a planilha (automate_spreadsheet.py)
+contra o servidor falso local (benchmarks/fake_google.py).
+
+Uso:
+    python -m pytest tests
+"""
+
+import threading
+from types import SimpleNamespace
+
+import pytest
+import requests
+
+import automate_spreadsheet
+import google_api
+from apoio import documento
+from fake_google import EstadoFalso, iniciar
+
+PLANILHA = "https://docs.google.com/spreadsheets/d/planilha-falsa/edit"
+
+
+@pytest.fixture
+def servidor(monkeypatch):
+    """Servidor falso com sessões, cliente e abas novos a cada teste."""
+    estado = EstadoFalso([], documento([("Qual é o papel do PO?", ["A", "B", "C", "D"], 1)]))
+    servidor, endereco = iniciar(estado)
+    monkeypatch.setattr(google_api, "GOOGLE_API_ENDPOINT", endereco)
+    monkeypatch.setattr(google_api, "BACKOFF_BASE", 0.01)
+    monkeypatch.setattr(google_api, "_sessions", {})
+    monkeypatch.setattr(google_api, "_sheets_client", None)
+    monkeypatch.setattr(automate_spreadsheet, "_sheets", {})
+    yield estado
+    servidor.shutdown()
+    servidor.server_close()
+
+
+def sessao_docs() -> google_api.GoogleSession:
+    return google_api.get_session(google_api.DOCS_CREDENTIALS_FILE, google_api.DOCS_SCOPES)
+
+
+def test_get_document_baixa_o_documento_inteiro(servidor):
+    assert google_api.get_document("doc-1") == servidor.documento
+    assert servidor.caminhos == ["GET /v1/documents/doc-1"]
+    assert servidor.consultas == [{}]
+
+
+def test_get_revision_id_pede_so_a_revisao(servidor):
+    servidor.documento["revisionId"] = "rev-7"
+    assert automate_spreadsheet.get_revision_id("doc-1") == "rev-7"
+    assert servidor.consultas == [{"fields": ["revisionId"]}]
+
+
+def test_repete_apos_429_e_503(servidor):
+    servidor.falhas = [429, 503]
+    assert google_api.get_document("doc-1")["revisionId"] == "rev-1"
+    assert servidor.requisicoes == 3
+    assert sessao_docs().retries == 2
+
+
+def test_desiste_apos_max_retries(servidor):
+    sessao_docs().max_retries = 2
+    servidor.falhas = [503] * 5
+    with pytest.raises(requests.HTTPError):
+        google_api.get_document("doc-1")
+    assert servidor.requisicoes == 3  # A original e 2 repetições
+
+
+def test_post_nao_e_repetido_apos_5xx(servidor):
+    servidor.falhas = [503]
+    resposta = sessao_docs().post(f"{google_api.DOCS_API_URL}/doc-1:batchUpdate", json={})
+    assert resposta.status_code == 503
+    assert servidor.requisicoes == 1
+
+
+def test_leituras_simultaneas_viram_uma_requisicao(servidor):
+    servidor.latencia = 0.2
+    threads = 10
+    barreira = threading.Barrier(threads)
+    resultados = []
+
+    def ler():
+        barreira.wait()
+        resultados.append(google_api.get_document("doc-1"))
+
+    leitores = [threading.Thread(target=ler) for _ in range(threads)]
+    for leitor in leitores:
+        leitor.start()
+    for leitor in leitores:
+        leitor.join()
+    assert len(resultados) == threads
+    assert all(resultado == servidor.documento for resultado in resultados)
+    assert servidor.requisicoes == 1
+    assert sessao_docs().coalesced == threads - 1
+
+
+def test_leituras_diferentes_nao_sao_agrupadas(servidor):
+    google_api.get_document("doc-1")
+    google_api.get_document("doc-1", fields="revisionId")
+    assert servidor.requisicoes == 2
+
+
+def test_sincroniza_o_documento_com_a_planilha(servidor):
+    servidor.linhas += [
+        ["Pergunta removida", "1", "2", "3", "4", "a", ""],
+        ["Qual é o papel do PO?", "A", "B", "C", "D", "a", ""],
+    ]
+    questoes = automate_spreadsheet.extract_questions_from_doc("doc-1")
+    delta = automate_spreadsheet.write_to_spreadsheet(questoes, PLANILHA)
+    assert len(delta["updates"]) == 1 and len(delta["deletes"]) == 1
+    assert servidor.linhas == [
+        automate_spreadsheet.SHEET_HEADER,
+        ["Qual é o papel do PO?", "A", "B", "C", "D", "b", ""],
+    ]
+
+
+def test_sincroniza_na_aba_configurada(servidor):
+    questoes = automate_spreadsheet.extract_questions_from_doc("doc-1")
+    assert automate_spreadsheet.write_to_spreadsheet(questoes, PLANILHA, "Perguntas") is not None
+    assert servidor.linhas[1][0] == "Qual é o papel do PO?"
+    # Uma aba inexistente não cai na primeira aba
+    servidor.linhas[1:] = []
+    assert automate_spreadsheet.write_to_spreadsheet(questoes, PLANILHA, "Métricas") is None
+    assert servidor.linhas[1:] == []
+
+
+class Parar(BaseException):
+    """Interrompe o laço de monitor_google_docs() (não é capturada por ele)."""
+
+
+def test_revisao_so_avanca_apos_escrita(servidor, monkeypatch):
+    escritas = []
+    resultados = [None, {"inserts": []}]  # A primeira escrita falha
+
+    def escrever(questoes, url, aba=None):
+        escritas.append(aba)
+        return resultados.pop(0)
+
+    esperas = []
+
+    def esperar(segundos):
+        esperas.append(segundos)
+        if len(esperas) == 3:
+            raise Parar
+
+    monkeypatch.setattr(automate_spreadsheet, "write_to_spreadsheet", escrever)
+    monkeypatch.setattr(automate_spreadsheet, "get_connectivity", lambda: SimpleNamespace(is_online=lambda: True))
+    monkeypatch.setattr(automate_spreadsheet, "time", SimpleNamespace(sleep=esperar))
+    with pytest.raises(Parar):
+        automate_spreadsheet.monitor_google_docs("doc-1", PLANILHA, worksheet="Perguntas")
+    # A revisão com escrita falha é sincronizada de novo; depois, só verificada
+    assert escritas == ["Perguntas", "Perguntas"]
+    assert servidor.caminhos.count("GET /v1/documents/doc-1") == 5
+    assert servidor.consultas.count({}) == 2
+
+
+def test_sync_document_falha_sem_revisao(servidor, monkeypatch):
+    assert automate_spreadsheet.sync_document("doc-1", PLANILHA) == "rev-1"
+    monkeypatch.setattr(automate_spreadsheet, "extract_questions_from_doc", lambda *args: None)
+    assert automate_spreadsheet.sync_document("doc-1", PLANILHA) is None
+
+
+def test_backoff_com_jitter_e_retry_after(monkeypatch):
+    monkeypatch.setattr(google_api.random, "uniform", lambda inicio, fim: fim)  # O limite do jitter
+    assert [google_api.backoff_delay(tentativa) for tentativa in range(8)] == [
+        0.5, 1.0, 2.0, 4.0, 8.0, 16.0, 32.0, 32.0
+    ]
+    assert google_api.backoff_delay(0, "10") == 10.0  # O servidor pede mais espera
+    assert google_api.backoff_delay(3, "1") == 4.0  # O backoff já é maior
+    assert google_api.backoff_delay(0, "3600") == google_api.BACKOFF_MAX
+    assert google_api.backoff_delay(0, "Wed, 21 Oct 2026 07:28:00 GMT") == 0.5  # Data: ignorada
+    monkeypatch.setattr(google_api.random, "uniform", lambda inicio, fim: inicio)
+    assert google_api.backoff_delay(4) == 0.0
+
+
+def test_chave_das_leituras_ignora_a_ordem_dos_parametros():
+    assert google_api._freeze({"b": 2, "a": "1"}) == google_api._freeze({"a": 1, "b": "2"})
+    assert google_api._freeze([("a", 1)]) == (("a", 1),)
+    assert google_api._freeze(None) is None
+    assert google_api._freeze("fields=revisionId") == "fields=revisionId"
+
+
+def test_falha_da_leitura_agrupada_chega_a_todos(servidor):
+    sessao_docs().max_retries = 0
+    servidor.latencia = 0.2
+    servidor.falhas = [503] * 10
+    threads = 5
+    barreira = threading.Barrier(threads)
+    erros = []
+
+    def ler():
+        barreira.wait()
+        try:
+            google_api.get_document("doc-1")
+        except requests.HTTPError as e:
+            erros.append(e.response.status_code)
+
+    leitores = [threading.Thread(target=ler) for _ in range(threads)]
+    for leitor in leitores:
+        leitor.start()
+    for leitor in leitores:
+        leitor.join()
+    assert erros == [503] * threads
+    assert servidor.requisicoes == 1
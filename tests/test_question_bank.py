@@ -0,0 +1,96 @@
+"""
+Testes do banco binário (bank_format.py) e da sua troca em QuestionBank.refresh().
+
+Uso:
+    python -m pytest tests
+"""
+
+import gc
+import os
+
+import pytest
+
+from apoio import AbaFalsa, criar_banco, perguntas
+from bank_format import BinaryBank, bank_versions
+from question_bank import QuestionBank
+
+
+def test_refresh_libera_o_mapeamento_anterior(tmp_path):
+    aba = AbaFalsa(perguntas(1))
+    banco = criar_banco(tmp_path, aba)
+    assert banco.refresh()
+    primeiro = banco.rows
+    mapa, arquivo = primeiro._mm, primeiro.bank_file
+    tentativa = banco.draw(5)  # Uma tentativa em andamento sobre o primeiro banco
+    del primeiro
+
+    aba.linhas = perguntas(2)
+    assert banco.refresh()
+    segundo = banco.rows
+    assert segundo.bank_file != arquivo  # Nova versão: o arquivo mapeado não é substituído
+    assert not mapa.closed  # Ainda usado pela tentativa
+    assert tentativa[0][0].endswith("(v1)")
+
+    del tentativa
+    gc.collect()
+    assert mapa.closed
+    assert not os.path.exists(arquivo)
+
+    aba.linhas = perguntas(3)
+    assert banco.refresh()
+    mapa = segundo._mm
+    del segundo
+    gc.collect()
+    assert mapa.closed
+    assert bank_versions(str(tmp_path / "quiz_bank.bin")) == [banco.rows.bank_file]
+    assert banco.rows[0][0] == "Pergunta 0 (v3)"
+
+
+def test_load_usa_a_versao_mais_recente(tmp_path):
+    aba = AbaFalsa(perguntas(1))
+    banco = criar_banco(tmp_path, aba)
+    assert banco.refresh()
+    aba.linhas = perguntas(2)
+    assert banco.refresh()
+
+    # Nova partida do processo: serve a última versão, sem baixar
+    outro = QuestionBank(
+        cache_file=str(tmp_path / "quiz_cache.json"),
+        bank_file=str(tmp_path / "quiz_bank.bin"),
+    )
+    outro.load(download=False)
+    assert outro.rows[0][0] == "Pergunta 0 (v2)"
+    assert outro.content_hash == banco.content_hash
+
+
+@pytest.mark.parametrize("tamanho", [0, 10, 50, 60, -1])
+def test_arquivo_truncado_e_rejeitado(tmp_path, tamanho):
+    banco = criar_banco(tmp_path, AbaFalsa(perguntas(1)))
+    assert banco.refresh()
+    completo = banco.rows.bank_file
+    with open(completo, "rb") as f:
+        dados = f.read()
+    truncado = str(tmp_path / "truncado.bin")
+    with open(truncado, "wb") as f:
+        f.write(dados[:tamanho])
+    with pytest.raises(ValueError):
+        BinaryBank(truncado)
+    os.remove(truncado)  # Nenhum mapeamento ficou aberto
+
+
+def test_load_ignora_a_versao_truncada(tmp_path):
+    banco = criar_banco(tmp_path, AbaFalsa(perguntas(1)))
+    assert banco.refresh()
+    arquivo = banco.rows.bank_file
+    banco.rows.close()
+    with open(arquivo, "r+b") as f:
+        f.truncate(100)  # Gravação interrompida
+
+    outro = QuestionBank(
+        cache_file=str(tmp_path / "quiz_cache.json"),
+        bank_file=str(tmp_path / "quiz_bank.bin"),
+    )
+    outro.load(download=False)
+    assert outro.rejected_files == 1
+    assert not os.path.exists(arquivo)  # Não é escolhida de novo
+    assert outro.rows[0][0] == "Pergunta 0 (v1)"  # Servido do cache JSON
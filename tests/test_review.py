@@ -0,0 +1,39 @@
+"""
+Testes da revisão espaçada (review.py).
+
+Uso:
+    python -m pytest tests
+"""
+
+import gc
+
+import review
+
+APRENDIZ = "0123456789abcdef0123456789abcdef"
+CHAVE = "ab" * 20
+
+
+def test_heap_e_refeito_com_muitas_entradas_antigas(tmp_path):
+    baralho = review.ReviewDeck(str(tmp_path / "baralho.bin"))
+    outras = [f"{i:040x}" for i in range(5)]
+    for chave in outras:
+        baralho.record_miss(chave, now=1000)
+    for resposta in range(1000):
+        baralho.review(CHAVE, correct=resposta % 2 == 0, now=1000 + resposta)
+        assert len(baralho._heap) <= (review.STALE_FACTOR + 1) * len(baralho) + 1
+    # Sem entradas antigas no caminho: os vencimentos continuam corretos
+    assert baralho.next_due() == (1000, outras[0])
+    assert baralho.due_keys(now=1000) == sorted(outras)
+    assert CHAVE in baralho.due_keys(now=10**9)
+
+
+def test_baralho_e_liberado_apos_a_ultima_sessao(ambiente):
+    baralho = review.get_review_deck(APRENDIZ)
+    assert review.get_review_deck(APRENDIZ) is baralho  # Compartilhado entre sessões
+    baralho.record_miss(CHAVE)
+    baralho.save()
+    del baralho
+    gc.collect()
+    assert APRENDIZ not in review._decks
+    # Recarregado do disco na próxima sessão
+    assert len(review.get_review_deck(APRENDIZ)) == 1
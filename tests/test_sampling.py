@@ -0,0 +1,80 @@
+"""
+Testes da amostragem estratificada por tópico (sampling.py).
+
+Uso:
+    python -m pytest tests
+"""
+
+import random
+from collections import Counter
+
+import pytest
+
+from sampling import RECENT_WEIGHT, AliasTable, StratifiedSampler
+
+
+def linhas(topicos: dict) -> list:
+    """Banco com a quantidade de perguntas indicada para cada tópico."""
+    return [
+        [f"{topico} {i}", "a", "b", "c", "d", "a", topico]
+        for topico, quantidade in topicos.items()
+        for i in range(quantidade)
+    ]
+
+
+def probabilidades(tabela: AliasTable) -> list:
+    """Probabilidade exata de cada índice, a partir da tabela montada."""
+    n = len(tabela)
+    resultado = [tabela.probability[i] / n for i in range(n)]
+    for i in range(n):
+        resultado[tabela.alias[i]] += (1 - tabela.probability[i]) / n
+    return resultado
+
+
+@pytest.mark.parametrize("pesos", [[1, 2, 3, 4, 0], [5], [1] * 7, [0.1, 100, 3.3]])
+def test_tabela_de_alias_respeita_os_pesos(pesos):
+    total = sum(pesos)
+    assert probabilidades(AliasTable(pesos)) == pytest.approx([peso / total for peso in pesos])
+
+
+def test_reparticao_proporcional_aos_topicos():
+    sorteador = StratifiedSampler(linhas({"Papéis": 50, "Eventos": 30, "Artefatos": 20}))
+    assert sorteador.topics == ["Artefatos", "Eventos", "Papéis"]
+    assert sorteador.allocate(10) == [2, 3, 5]
+    assert sorteador.allocate(10, {"Papéis": 1, "Eventos": 1}) == [0, 5, 5]
+    assert sorteador.allocate(1000) == [20, 30, 50]  # Limitado ao banco
+
+
+def test_reparticao_soma_k_sem_exceder_os_topicos():
+    gerador = random.Random(7)
+    for _ in range(200):
+        tamanhos = {f"T{t}": gerador.randint(1, 30) for t in range(gerador.randint(1, 6))}
+        cotas = {topico: gerador.choice([0, 1, 2.5]) for topico in tamanhos}
+        sorteador = StratifiedSampler(linhas(tamanhos))
+        k = gerador.randint(0, 120)
+        contagens = sorteador.allocate(k, cotas)
+        capacidade = [tamanhos[topico] for topico in sorteador.topics]
+        com_cota = [c for c, topico in zip(capacidade, sorteador.topics) if cotas[topico] > 0]
+        # Sem nenhuma cota positiva, a repartição volta a ser proporcional
+        assert sum(contagens) == min(k, sum(com_cota) if com_cota else sum(capacidade))
+        assert all(0 <= c <= limite for c, limite in zip(contagens, capacidade))
+
+
+def test_sorteio_sem_repeticoes_e_por_topico():
+    banco = linhas({"Papéis": 50, "Eventos": 30, "Artefatos": 20})
+    sorteador = StratifiedSampler(banco)
+    indices = sorteador.draw(40)
+    assert len(set(indices)) == 40
+    assert Counter(banco[i][6] for i in indices) == {"Papéis": 20, "Eventos": 12, "Artefatos": 8}
+    assert sorted(sorteador.draw(100)) == list(range(100))  # O banco inteiro
+
+
+def test_recentes_sao_menos_sorteados():
+    random.seed(3)
+    sorteador = StratifiedSampler(linhas({"Geral": 10}))
+    recentes = set(range(5))
+    sorteios = 20000
+    vistos = sum(sorteador.draw(1, recent=recentes)[0] in recentes for _ in range(sorteios))
+    # Peso RECENT_WEIGHT para 5 perguntas recentes contra peso 1 para 5 novas
+    esperado = 5 * RECENT_WEIGHT / (5 * RECENT_WEIGHT + 5)
+    assert vistos / sorteios == pytest.approx(esperado, abs=0.02)
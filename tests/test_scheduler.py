@@ -0,0 +1,77 @@
+"""
+Testes do agendador de ticks compartilhado (app/scheduler.py).
+
+Uso:
+    python -m pytest tests
+"""
+
+import threading
+import time
+
+from app.scheduler import TickScheduler
+
+
+def test_callback_lento_nao_atrasa_os_demais():
+    agendador = TickScheduler(intervalo=0.02, trabalhadores=4)
+    liberar = threading.Event()
+    chamadas_lento = []
+    chamadas_rapido = []
+
+    def lento():
+        chamadas_lento.append(time.monotonic())
+        liberar.wait(5)  # Cliente com o websocket bloqueado
+
+    def rapido():
+        chamadas_rapido.append(time.monotonic())
+
+    agendador.inscrever(lento)
+    agendador.inscrever(rapido)
+    try:
+        time.sleep(0.05)
+        assert chamadas_lento  # O lento já está bloqueado
+        agendado = threading.Event()
+        inicio = time.monotonic()
+        agendador.agendar(0.01, agendado.set)
+        assert agendado.wait(1)
+        assert time.monotonic() - inicio < 0.5
+        time.sleep(0.3)
+        assert len(chamadas_rapido) >= 10
+        # Os ticks do lento não se acumulam enquanto o anterior não termina
+        assert len(chamadas_lento) == 1
+        assert agendador.ticks_descartados >= 10
+    finally:
+        liberar.set()
+    time.sleep(0.1)
+    assert len(chamadas_lento) >= 2  # Volta a receber ticks
+    agendador.cancelar(lento)
+    agendador.cancelar(rapido)
+
+
+def test_agendar_respeita_a_ordem_dos_instantes():
+    agendador = TickScheduler(intervalo=10)
+    ordem = []
+    terminou = threading.Event()
+    agendador.agendar(0.10, lambda: (ordem.append("c"), terminou.set()))
+    agendador.agendar(0.05, ordem.append, "b")
+    agendador.agendar(0.0, ordem.append, "a")
+    assert terminou.wait(2)
+    assert ordem == ["a", "b", "c"]
+
+
+def test_erro_em_um_callback_nao_interrompe_o_agendador(capsys):
+    agendador = TickScheduler(intervalo=0.02)
+    chamadas = []
+
+    def falha():
+        raise RuntimeError("sessão com erro")
+
+    def conta():
+        chamadas.append(1)
+
+    agendador.inscrever(falha)
+    agendador.inscrever(conta)
+    time.sleep(0.15)
+    agendador.cancelar(falha)
+    agendador.cancelar(conta)
+    assert len(chamadas) >= 3
+    assert "sessão com erro" in capsys.readouterr().err
@@ -0,0 +1,55 @@
+"""
+Testes do registro de sessões (app/sessions.py).
+
+Uso:
+    python -m pytest tests
+"""
+
+from apoio import AbaFalsa, criar_banco, nova_sessao, perguntas, registrar_banco
+from app.sessions import LIMITE_BYTES_SESSAO, SessionRegistry
+
+
+def test_tentativa_sobrevive_a_atualizacao_do_banco(ambiente, monkeypatch):
+    # Banco em memória maior que o limite de uma sessão
+    texto = " " + "x" * 600
+    aba = AbaFalsa(perguntas(1, 8000, texto))
+    banco = criar_banco(ambiente, aba, binario=False)
+    assert banco.refresh()
+    registrar_banco(monkeypatch, banco)
+    sessao = nova_sessao()
+    sessao.iniciar_quiz(None)
+    anterior = sessao.quiz_logic.questions.rows
+
+    aba.linhas = perguntas(2, 8000, texto)
+    assert banco.refresh()
+    assert banco.rows is not anterior
+    assert sessao.quiz_logic.questions.rows is anterior  # A tentativa continua no banco antigo
+
+    sessoes = SessionRegistry()
+    sessoes.registrar(sessao)
+    assert sessoes.medir(sessao) < LIMITE_BYTES_SESSAO / 4
+    sessoes.varrer()
+    assert sessoes.total == 1
+    assert not sessao.encerrada
+    assert sessao.estado_quiz.quiz_iniciado
+
+
+def test_tentativa_longa_nao_e_ociosa(ambiente, monkeypatch):
+    banco = criar_banco(ambiente, AbaFalsa(perguntas(1, 50)))
+    assert banco.refresh()
+    registrar_banco(monkeypatch, banco)
+    sessao = nova_sessao()
+    sessao.iniciar_quiz(None)
+    sessoes = SessionRegistry(tempo_ocioso=60)
+    sessoes.registrar(sessao)
+
+    # Mais que tempo_ocioso na mesma pergunta, dentro do prazo da tentativa
+    sessoes.varrer(sessao.ultima_atividade + 120)
+    assert not sessao.encerrada
+
+    sessao.finalizar_quiz(None)
+    sessoes.varrer(sessao.ultima_atividade + 30)
+    assert not sessao.encerrada  # Os resultados acabaram de aparecer
+    sessoes.varrer(sessao.ultima_atividade + 120)
+    assert sessao.encerrada
+    assert sessoes.encerradas["ociosa"] == 1
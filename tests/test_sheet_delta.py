@@ -0,0 +1,111 @@
+"""
+Testes da sincronização incremental da planilha (compute_sheet_delta e
+apply_sheet_delta em automate_spreadsheet.py), aplicada a uma planilha
+em memória.
+
+Uso:
+    python -m pytest tests
+"""
+
+import random
+
+import pytest
+
+import automate_spreadsheet
+from apoio import PlanilhaFalsa
+from automate_spreadsheet import SHEET_HEADER, apply_sheet_delta, compute_sheet_delta
+
+
+def linha(n: int, resposta: str = "a", topico: str = "") -> list:
+    return [f"Pergunta {n}", f"{n}a", f"{n}b", f"{n}c", f"{n}d", resposta, topico]
+
+
+def sincronizar(questoes: list, linhas: list) -> PlanilhaFalsa:
+    """Aplica o delta das perguntas às linhas (sem o cabeçalho) e retorna a planilha."""
+    planilha = PlanilhaFalsa([SHEET_HEADER] + linhas)
+    delta = compute_sheet_delta(questoes, linhas)
+    apply_sheet_delta(planilha, delta, len(linhas))
+    assert planilha.linhas[0] == SHEET_HEADER
+    return planilha
+
+
+def test_nada_a_fazer_com_as_linhas_em_outra_ordem():
+    linhas = [linha(3), linha(1), linha(2)]
+    delta = compute_sheet_delta([linha(1), linha(2), linha(3)], linhas)
+    assert delta == {"inserts": [], "updates": [], "deletes": []}
+
+
+def test_atualiza_so_as_linhas_alteradas_em_intervalos():
+    linhas = [linha(n) for n in range(6)]
+    questoes = [linha(n, "b" if n in (1, 2, 4) else "a") for n in range(6)]
+    planilha = sincronizar(questoes, linhas)
+    assert planilha.linhas[1:] == questoes
+    assert planilha.escritas == ["A3:G4", "A6:G6"]
+    assert planilha.remocoes == []
+
+
+def test_remove_intervalos_de_baixo_para_cima():
+    linhas = [linha(n) for n in range(10)]
+    mantidas = [linha(n) for n in (2, 3, 6, 9)]
+    planilha = sincronizar(mantidas, linhas)
+    assert planilha.linhas[1:] == mantidas
+    # Linhas 2-3, 6-7 e 9-10 da planilha, removidas da última para a primeira
+    assert planilha.remocoes == [(9, 10), (6, 7), (2, 3)]
+    assert planilha.escritas == []
+
+
+def test_insercoes_reaproveitam_as_linhas_removidas():
+    linhas = [linha(1), linha(2), linha(3)]
+    questoes = [linha(1), linha(3), linha(4), linha(5)]
+    planilha = sincronizar(questoes, linhas)
+    assert planilha.linhas[1:] == [linha(1), linha(4), linha(3), linha(5)]
+    assert planilha.remocoes == []
+
+
+def test_chaves_duplicadas():
+    # Na planilha, a segunda ocorrência é removida; no documento, a primeira vence
+    linhas = [linha(1), linha(2), linha(1, "c"), linha(2)]
+    questoes = [linha(1, "b"), linha(2), linha(1, "d")]
+    planilha = sincronizar(questoes, linhas)
+    assert planilha.linhas[1:] == [linha(1, "b"), linha(2)]
+
+
+def test_chave_ignora_espacos_e_negrito():
+    linhas = [linha(1)]
+    questoes = [["  <b>Pergunta 1</b> "] + linha(1)[1:]]
+    delta = compute_sheet_delta(questoes, linhas)
+    assert delta["inserts"] == [] and delta["deletes"] == []
+
+
+def test_linhas_vazias_e_curtas_na_planilha():
+    linhas = [[], linha(1)[:3], [""] * 7]
+    planilha = sincronizar([linha(1)], linhas)
+    assert planilha.linhas[1:] == [linha(1)]
+
+
+@pytest.mark.parametrize("semente", range(30))
+def test_resultado_igual_ao_documento(semente):
+    aleatorio = random.Random(semente)
+    linhas = [linha(aleatorio.randrange(40), aleatorio.choice("abcd")) for _ in range(aleatorio.randrange(30))]
+    questoes = [linha(aleatorio.randrange(40), aleatorio.choice("abcd")) for _ in range(aleatorio.randrange(30))]
+    planilha = sincronizar(questoes, linhas)
+    esperado = {}
+    for questao in questoes:
+        esperado.setdefault(questao[0], questao)
+    assert sorted(planilha.linhas[1:]) == sorted(esperado.values())
+
+
+def test_reescreve_o_cabecalho_diferente(monkeypatch, capsys):
+    planilha = PlanilhaFalsa([["Pergunta", "a", "b", "c", "d", "Resposta"], linha(1)[:6]])
+    monkeypatch.setattr(automate_spreadsheet, "get_sheet", lambda url, aba=None: planilha)
+    automate_spreadsheet.write_to_spreadsheet([linha(1, topico="Eventos")], "planilha")
+    assert planilha.linhas == [SHEET_HEADER, linha(1, topico="Eventos")]
+    assert "'Resposta']) foi substituída" in capsys.readouterr().out
+
+
+def test_cria_o_cabecalho_na_planilha_vazia(monkeypatch, capsys):
+    planilha = PlanilhaFalsa([])
+    monkeypatch.setattr(automate_spreadsheet, "get_sheet", lambda url, aba=None: planilha)
+    automate_spreadsheet.write_to_spreadsheet([linha(1)], "planilha")
+    assert planilha.linhas == [SHEET_HEADER, linha(1)]
+    assert "foi substituída" not in capsys.readouterr().out